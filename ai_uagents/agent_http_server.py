@@ -0,0 +1,105 @@
+"""
+Side HTTP server for AI Company uAgents
+Serves responses the uAgents REST handlers cannot express, such as
+Server-Sent Event streams, on port (agent port + AGENT_HTTP_PORT_OFFSET)
+"""
+
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from agent_logger import AgentLogger
+
+# Handler yielding (event_name, data) pairs for one SSE stream
+StreamHandler = Callable[[Dict[str, Any]], AsyncIterator[Tuple[str, Any]]]
+# Pre-stream check resolving to (status, error) to refuse a request, or None to accept it
+StreamCheck = Callable[[Dict[str, Any]], Awaitable[Optional[Tuple[int, str]]]]
+
+def format_sse(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event; data is always JSON so newlines are safe"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8')
+
+class AgentHTTPServer:
+    """aiohttp server started and stopped with the uAgent's lifecycle; logs
+    through the owning agent's buffered logger"""
+
+    def __init__(self, name: str, port: int, logger: AgentLogger, host: str = '0.0.0.0'):
+        self.name = name
+        self.port = port
+        self.logger = logger
+        self.host = host
+        self._routes: List[Tuple[str, str, Callable[..., Awaitable[Any]]]] = []
+        self._runner = None
+
+    @property
+    def has_routes(self) -> bool:
+        """Whether any route has been registered"""
+        return bool(self._routes)
+
+    def add_route(self, method: str, path: str, handler: Callable[..., Awaitable[Any]]):
+        """Register a raw aiohttp handler (request -> web.Response)"""
+        self._routes.append((method, path, handler))
+
+    def add_stream_route(self, path: str, handler: StreamHandler, check: Optional[StreamCheck] = None):
+        """Register a POST endpoint whose JSON body is streamed back as SSE; check
+        can refuse a request with an HTTP error before the stream starts"""
+        async def handle(request):
+            return await self._handle_stream(request, handler, check)
+        self.add_route('POST', path, handle)
+
+    async def _handle_stream(self, request, handler: StreamHandler, check: Optional[StreamCheck] = None):
+        """Run a stream handler and write each event as it is produced"""
+        from aiohttp import web
+
+        try:
+            payload = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return web.json_response({'error': 'Request body must be JSON'}, status=400)
+        refusal = await check(payload) if check is not None else None
+        if refusal is not None:
+            status, error = refusal
+            return web.json_response({'error': error}, status=status)
+
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        await response.prepare(request)
+
+        events = handler(payload)
+        try:
+            async for event, data in events:
+                await response.write(format_sse(event, data))
+        except ConnectionResetError:
+            self.logger.warning('http.stream_disconnected', "⚠️ Stream client disconnected", path=request.path)
+            return response
+        except Exception as e:
+            self.logger.error('http.stream_error', "❌ Stream error", path=request.path, error=str(e))
+            await response.write(format_sse('error', {'error': str(e)}))
+        finally:
+            # Stop upstream generation promptly if the client went away
+            await events.aclose()
+
+        await response.write_eof()
+        return response
+
+    async def start(self):
+        """Start listening if any routes are registered"""
+        if not self._routes or self._runner is not None:
+            return
+
+        from aiohttp import web
+
+        app = web.Application()
+        for method, path, handler in self._routes:
+            app.router.add_route(method, path, handler)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.logger.info('http.listening', "🌊 HTTP server listening", port=self.port)
+
+    async def stop(self):
+        """Stop the server and release the port"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,139 @@
+"""
+Buffered structured logging for AI Company agents
+Callers only put records on an in-memory queue; a background listener
+thread formats and writes them, so the LLM call path never blocks on
+stdout. Records carry the agent name, an event name and key/value fields,
+written as text lines or JSON lines (AGENT_LOG_FORMAT=json)
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import random
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
+
+class StructuredFormatter(logging.Formatter):
+    """Render agent/event/fields records as text or JSON lines"""
+
+    def __init__(self, as_json: bool = False):
+        super().__init__()
+        self.as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, 'fields', None) or {}
+        agent = getattr(record, 'agent', record.name)
+        event = getattr(record, 'event', '')
+        if self.as_json:
+            # Fields first so they cannot overwrite the record's own keys
+            return json.dumps(dict(
+                fields,
+                ts=round(record.created, 3),
+                level=record.levelname.lower(),
+                agent=agent,
+                event=event,
+                message=record.getMessage()
+            ), default=str, ensure_ascii=False)
+
+        timestamp = time.strftime('%H:%M:%S', time.localtime(record.created))
+        line = f"{timestamp} {record.levelname:<7} [{agent}] {record.getMessage()}"
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+class BufferedQueueHandler(QueueHandler):
+    """Queue handler that defers formatting to the listener and drops when full"""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread, not the caller's
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_handler: Optional[BufferedQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+def _shared_handler() -> BufferedQueueHandler:
+    """Process-wide queue handler and listener, started on first use"""
+    global _handler, _listener
+    if _handler is None:
+        log_queue = queue.Queue(maxsize=int(os.getenv('AGENT_LOG_QUEUE_SIZE', '10000')))
+        log_file = os.getenv('AGENT_LOG_FILE')
+        target = logging.FileHandler(log_file) if log_file else logging.StreamHandler(sys.stdout)
+        target.setFormatter(StructuredFormatter(as_json=os.getenv('AGENT_LOG_FORMAT', 'text') == 'json'))
+        _handler = BufferedQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, target)
+        _listener.start()
+        # Flush whatever is still queued when the process exits
+        atexit.register(_listener.stop)
+    return _handler
+
+class AgentLogger:
+    """Leveled, sampled, structured logger for one agent
+
+    Records below AGENT_LOG_LEVEL are discarded before any formatting.
+    Calls made with sample=True (high-volume hot-path events) are kept
+    with probability AGENT_LOG_SAMPLE_RATE.
+    """
+
+    def __init__(self, agent_name: str, level: Optional[str] = None, sample_rate: Optional[float] = None):
+        self.agent_name = agent_name
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv('AGENT_LOG_SAMPLE_RATE', '1.0'))
+        self.sampled_out = 0
+        self._handler = _shared_handler()
+        self._logger = logging.getLogger(f"ai_company.{agent_name}")
+        self._logger.setLevel((level or os.getenv('AGENT_LOG_LEVEL', 'INFO')).upper())
+        self._logger.propagate = False
+        if self._handler not in self._logger.handlers:
+            self._logger.addHandler(self._handler)
+
+    def is_enabled(self, level: int) -> bool:
+        """Whether records at this level would be emitted"""
+        return self._logger.isEnabledFor(level)
+
+    def log(self, level: int, event: str, message: str, fields: Optional[Dict[str, Any]] = None,
+            sample: bool = False):
+        """Queue one record; returns immediately"""
+        if not self._logger.isEnabledFor(level):
+            return
+        if sample and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        self._logger.log(level, message, extra={'agent': self.agent_name, 'event': event, 'fields': fields or {}})
+
+    def debug(self, event: str, message: str, sample: bool = False, **fields):
+        """Log a DEBUG record"""
+        self.log(logging.DEBUG, event, message, fields, sample)
+
+    def info(self, event: str, message: str, sample: bool = False, **fields):
+        """Log an INFO record"""
+        self.log(logging.INFO, event, message, fields, sample)
+
+    def warning(self, event: str, message: str, sample: bool = False, **fields):
+        """Log a WARNING record"""
+        self.log(logging.WARNING, event, message, fields, sample)
+
+    def error(self, event: str, message: str, **fields):
+        """Log an ERROR record (never sampled)"""
+        self.log(logging.ERROR, event, message, fields)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Logger configuration and loss counters"""
+        return {
+            'level': logging.getLevelName(self._logger.level),
+            'sample_rate': self.sample_rate,
+            'sampled_out': self.sampled_out,
+            'dropped': self._handler.dropped
+        }
@@ -0,0 +1,166 @@
+"""
+Metrics for AI Company agents
+Minimal counters, gauges and histograms with labels, rendered in the
+Prometheus text exposition format so any agent's /metrics endpoint can
+be scraped without extra dependencies
+"""
+
+import bisect
+import threading
+from typing import Dict, Any, Callable, List, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets (seconds) spanning cache-fast to slow fallback calls
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+def _escape(value: Any) -> str:
+    """Escape a label value for the exposition format"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = '') -> str:
+    """Render {name="value",...}, or '' when there are no labels"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_number(value: float) -> str:
+    """Integers without a trailing .0, everything else as repr"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metric:
+    """Base for a named metric family with fixed label names"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 const_labels: Dict[str, str] = None):
+        self.name = name
+        self.documentation = documentation
+        self.const_labels = dict(const_labels or {})
+        self.label_names = tuple(self.const_labels) + tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        """Label values in declared order, constant labels first"""
+        merged = dict(self.const_labels, **labels)
+        return tuple(str(merged.get(name, '')) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        """HELP/TYPE header followed by sample lines"""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 const_labels: Dict[str, str] = None):
+        super().__init__(name, documentation, labels, const_labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Add amount to the labelled series"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, total: float, **labels):
+        """Mirror a running total kept elsewhere (e.g. a component's stats) from a collector"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = total
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}"
+                    for key, value in sorted(self._values.items())]
+
+class Gauge(Counter):
+    """Value that can be set to anything per label set"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        """Set the labelled series"""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 const_labels: Dict[str, str] = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels, const_labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation in the labelled series"""
+        key = self._key(labels)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            totals[0] += value
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, totals) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = _format_labels(self.label_names, key, f'le="{_format_number(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                cumulative += counts[-1]
+                inf = _format_labels(self.label_names, key, 'le="+Inf"')
+                plain = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}_bucket{inf} {cumulative}")
+                lines.append(f"{self.name}_sum{plain} {_format_number(totals[0])}")
+                lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Collection of metrics rendered together for one agent"""
+
+    def __init__(self, const_labels: Dict[str, str] = None):
+        self.const_labels = const_labels or {}
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter"""
+        return self._register(Counter(name, documentation, labels, self.const_labels))
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        """Create and register a gauge"""
+        return self._register(Gauge(name, documentation, labels, self.const_labels))
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Create and register a histogram"""
+        return self._register(Histogram(name, documentation, labels, self.const_labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Register a callback that refreshes gauges just before rendering"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -5,46 +5,197 @@ Provides common functionality for all agents including Cerebras integration
 
 import os
 import json
-import requests
-from typing import Dict, Any, Optional
+import time
+
+# Measured from here so the startup report includes this module's imports
+MODULE_LOAD_STARTED = time.perf_counter()
+
+import asyncio
+import functools
+import threading
+import logging
+import aiohttp
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional, Tuple
 from dotenv import load_dotenv
-from uagents import Agent, Context, Model
-from cerebras.cloud.sdk import Cerebras
-from huggingface_hub import InferenceClient
+from uagents import Agent, Context
+from response_cache import ResponseCache, PersistentResponseStore, SingleFlight
+from inference_fallback_manager import InferenceFallbackManager
+from rate_limiter import SharedTokenBucket
+from worker_pool import BoundedWorkerPool, WorkerPoolFull
+from prompt_compactor import PromptCompactor, estimate_tokens
+from completion_sizer import CompletionSizer
+from agent_http_server import AgentHTTPServer
+from agent_logger import AgentLogger
+from agent_metrics import MetricsRegistry
+from tracer import Tracer
+from llm_providers import LLMProvider, LiveProvider, StubProvider, Completion, LIVE_BACKEND, STUB_BACKEND
+from llm_cassette import Cassette, RecordingProvider, ReplayProvider, cassette_path, RECORD_MODE, REPLAY_MODE
+
+# Provider SDKs (cerebras.cloud.sdk, huggingface_hub) are imported when their
+# client is first used, so agents that never fall back never load them
+MODULE_IMPORT_SECONDS = time.perf_counter() - MODULE_LOAD_STARTED
 
 load_dotenv()
 
+# Local state shared by all agent processes (response cache, rate limits)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+# Provider tiers, in fallback order
+CEREBRAS = 'cerebras'
+META_LLAMA = 'meta_llama'
+ASI_ONE = 'asi_one'
+
+PROVIDER_LABELS = {
+    CEREBRAS: 'Cerebras',
+    META_LLAMA: 'Meta Llama',
+    ASI_ONE: 'ASI:One'
+}
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline leaves no time for another provider call"""
+    pass
+
+class ProviderUnavailable(Exception):
+    """Raised when a provider is skipped because its circuit is open"""
+
 class BaseUAgent:
     """Base class for all AI Company uAgents"""
     
-    def __init__(self, name: str, role: str, port: int):
+    def __init__(self, name: str, role: str, port: int, input_token_budget: Optional[int] = None):
+        init_started = time.perf_counter()
         self.name = name
         self.role = role
         self.port = port
         
+        # Buffered, leveled logger; hot-path events are sampled (AGENT_LOG_*)
+        self.logger = AgentLogger(name)
+        
+        # live: real provider APIs; stub: deterministic offline providers (no keys needed)
+        self.llm_backend = os.getenv('LLM_PROVIDER', LIVE_BACKEND).lower()
+        if self.llm_backend not in (LIVE_BACKEND, STUB_BACKEND):
+            raise ValueError(f"Unknown LLM_PROVIDER '{self.llm_backend}' for {name} (expected live or stub)")
+        
+        # record: log every provider call to a cassette; replay: serve calls from it
+        self.cassette_mode = os.getenv('LLM_CASSETTE_MODE', '').lower()
+        if self.cassette_mode not in ('', RECORD_MODE, REPLAY_MODE):
+            raise ValueError(f"Unknown LLM_CASSETTE_MODE '{self.cassette_mode}' for {name} (expected record or replay)")
+        self.cassette: Optional[Cassette] = None
+        
         # Initialize Cerebras client (Primary)
         self.cerebras_api_key = os.getenv('CEREBRAS_API_KEY')
-        if not self.cerebras_api_key:
+        if not self.cerebras_api_key and self.llm_backend == LIVE_BACKEND and self.cassette_mode != REPLAY_MODE:
             raise ValueError(f"CEREBRAS_API_KEY not found for {name}")
         
-        self.cerebras_client = Cerebras(api_key=self.cerebras_api_key)
+        self.cerebras_model = "llama-4-scout-17b-16e-instruct"
+        
+        # Async client so long generations don't block the agent's event loop;
+        # built on first use (see cerebras_client)
+        self.cerebras_timeout = float(os.getenv('CEREBRAS_TIMEOUT', '120'))
+        self._cerebras_client = None
+        
+        # Cerebras quota is per account, so every agent process draws from
+        # the same request/token buckets (burst = CEREBRAS_BURST_SECONDS of quota)
+        cerebras_rpm = float(os.getenv('CEREBRAS_RPM', '30'))
+        cerebras_tpm = float(os.getenv('CEREBRAS_TPM', '60000'))
+        burst_seconds = float(os.getenv('CEREBRAS_BURST_SECONDS', '10'))
+        self.cerebras_rate_limiter = SharedTokenBucket(
+            os.getenv('CEREBRAS_RATE_LIMIT_FILE', os.path.join(CACHE_DIR, 'cerebras_rate_limit.json')),
+            {
+                'requests': (cerebras_rpm / 60, max(1.0, cerebras_rpm / 60 * burst_seconds)),
+                'tokens': (cerebras_tpm / 60, cerebras_tpm / 60 * burst_seconds)
+            },
+            max_bypass_seconds=float(os.getenv('CEREBRAS_RATE_LIMIT_MAX_BYPASS_SECONDS', '10'))
+        )
         
         # Initialize Meta Llama client (Fallback)
         self.hf_api_key = os.getenv('HUGGINGFACE_API_KEY')
         self.hf_model = os.getenv('HUGGINGFACE_MODEL', 'meta-llama/Llama-2-7b-chat-hf')
         
-        if self.hf_api_key:
-            self.hf_client = InferenceClient(
-                model=self.hf_model,
-                token=self.hf_api_key
-            )
-        else:
-            self.hf_client = None
-            print(f"⚠️ [{self.name}] HUGGINGFACE_API_KEY not found - Meta Llama fallback disabled")
+        self._hf_client = None
+        self._hf_client_lock = threading.Lock()  # built on a worker thread (see hf_client)
+        if not self.hf_api_key and self.llm_backend == LIVE_BACKEND and self.cassette_mode != REPLAY_MODE:
+            self.logger.warning('provider.disabled', "⚠️ HUGGINGFACE_API_KEY not found - Meta Llama fallback disabled")
+        
+        # The Hugging Face client is synchronous: run it on a bounded worker
+        # pool so fallback bursts queue (or shed) instead of blocking the loop
+        self.hf_worker_pool = BoundedWorkerPool(
+            f"{name}-meta-llama",
+            max_workers=int(os.getenv('META_LLAMA_MAX_CONCURRENCY', '2')),
+            max_queue=int(os.getenv('META_LLAMA_MAX_QUEUE', '8'))
+        )
         
         # Legacy ASI:One fallback (Third tier)
         self.asi_one_api_key = os.getenv('ASI_ONE_API_KEY')
         self.asi_one_base_url = 'https://api.asi1.ai/v1'
+        self.asi_one_model = 'asi1-mini'
+        self.asi_one_timeout = float(os.getenv('ASI_ONE_TIMEOUT', '120'))
+        
+        # Backend serving each fallback tier
+        self.providers: Dict[str, LLMProvider] = self._build_providers()
+        
+        # Long-lived pooled HTTP session (keep-alive), created on first use and
+        # closed on agent shutdown
+        self.http_pool_size = int(os.getenv('AGENT_HTTP_POOL_SIZE', '20'))
+        self.http_pool_per_host = int(os.getenv('AGENT_HTTP_POOL_PER_HOST', '0'))  # 0 = no per-host cap
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
+        # Prompt-level response cache shared by all provider tiers, backed by
+        # an on-disk store that every agent process reads and writes. Off while
+        # recording or replaying a cassette, so every call reaches the cassette
+        cache_db_path = os.getenv('LLM_CACHE_DB', os.path.join(CACHE_DIR, 'llm_responses.db'))
+        if self.cassette_mode:
+            cache_db_path = ''
+        self.response_cache = ResponseCache(
+            max_entries=0 if self.cassette_mode else int(os.getenv('LLM_CACHE_SIZE', '256')),
+            ttl_seconds=float(os.getenv('LLM_CACHE_TTL', '3600')),
+            store=PersistentResponseStore(cache_db_path) if cache_db_path else None
+        )
+        
+        # Cache key of each endpoint's latest reply, evicted if that reply fails to parse
+        self.last_cache_keys: Dict[str, str] = {}
+        
+        # Identical concurrent prompts share one provider call
+        self.inflight_requests = SingleFlight()
+        
+        # Prompts are normalised and trimmed to this agent's input budget before any provider call
+        self.prompt_compactor = PromptCompactor(
+            max_input_tokens=input_token_budget or int(os.getenv('LLM_INPUT_TOKEN_BUDGET', '6000'))
+        )
+        
+        # Routes calls across provider tiers using rolling health statistics
+        # and a circuit breaker per provider
+        self.fallback_manager = InferenceFallbackManager(
+            [CEREBRAS, META_LLAMA, ASI_ONE],
+            window_size=int(os.getenv('LLM_ROUTER_WINDOW', '50')),
+            min_health=float(os.getenv('LLM_ROUTER_MIN_HEALTH', '0.3')),
+            failure_threshold=int(os.getenv('LLM_BREAKER_FAILURES', '3')),
+            reset_timeout=float(os.getenv('LLM_BREAKER_RESET_SECONDS', '30'))
+        )
+        
+        # Hedged requests (opt-in per call via hedge=True)
+        self.hedging_enabled = os.getenv('LLM_HEDGE_ENABLED', 'true').lower() == 'true'
+        self.hedge_percentile = float(os.getenv('LLM_HEDGE_PERCENTILE', '95'))
+        
+        # Deadline-aware generation: conservative output rate used to shrink
+        # max_tokens when little of the caller's deadline remains
+        self.deadline_tokens_per_second = float(os.getenv('LLM_DEADLINE_TOKENS_PER_SECOND', '100'))
+        self.deadline_min_tokens = int(os.getenv('LLM_DEADLINE_MIN_TOKENS', '256'))
+        # Coalesced calls must share a deadline to within this many seconds
+        self.flight_deadline_bucket = float(os.getenv('LLM_FLIGHT_DEADLINE_BUCKET', '1'))
+        
+        # Adaptive max_tokens per endpoint from observed completion lengths
+        self.completion_sizer = CompletionSizer(
+            percentile=float(os.getenv('LLM_SIZING_PERCENTILE', '95')),
+            headroom=float(os.getenv('LLM_SIZING_HEADROOM', '1.25')),
+            min_samples=int(os.getenv('LLM_SIZING_MIN_SAMPLES', '10'))
+        )
+        
+        # Prometheus-style metrics, served at GET /metrics on the side server
+        self.metrics = MetricsRegistry({'agent': name})
+        self._init_metrics()
+        
+        # Spans for this agent's share of each traced workflow, served at GET /traces
+        self.tracer = Tracer(name)
         
         # Initialize the agent
         self.agent = Agent(
@@ -54,111 +205,746 @@ class BaseUAgent:
             publish_agent_details=True  # Register on Agentverse
         )
         
-        print(f"🚀 [{self.name}] Initialized with Cerebras API")
-        print(f"🔑 [{self.name}] Cerebras API Key configured: {bool(self.cerebras_api_key)}")
-        print(f"🦙 [{self.name}] Meta Llama fallback available: {bool(self.hf_client)}")
-        print(f"🔑 [{self.name}] ASI:One legacy fallback available: {bool(self.asi_one_api_key)}")
+        # Side server for streaming and /metrics, started with the agent
+        self.http_port = port + int(os.getenv('AGENT_HTTP_PORT_OFFSET', '100'))
+        self.http_server = AgentHTTPServer(name, self.http_port, self.logger)
+        self.http_server.add_route('GET', '/metrics', self.handle_metrics)
+        self.http_server.add_route('GET', '/traces', self.handle_recent_traces)
+        self.http_server.add_route('GET', '/traces/{trace_id}', self.handle_trace)
+        
+        @self.agent.on_event("startup")
+        async def start_http_server(ctx: Context):
+            await self.http_server.start()
+            self.startup_timings['ready_seconds'] = round(time.perf_counter() - MODULE_LOAD_STARTED, 3)
+            self.logger.info('agent.startup', "⏱️ Startup complete", **self.startup_timings)
+        
+        @self.agent.on_event("shutdown")
+        async def stop_http_server(ctx: Context):
+            await self.http_server.stop()
+            await self.close_http_session()
+            if self._cerebras_client is not None:
+                await self._cerebras_client.close()
+            self.hf_worker_pool.shutdown()
+            if self.cassette is not None:
+                self.cassette.close()
+        
+        if self.cassette_mode == REPLAY_MODE:
+            init_message = "📼 Initialized replaying recorded LLM traffic"
+        elif self.llm_backend == STUB_BACKEND:
+            init_message = "🧪 Initialized with offline stub LLM providers"
+        else:
+            init_message = "🚀 Initialized with Cerebras API"
+        self.logger.info('agent.init', init_message,
+                         backend=self.llm_backend,
+                         cassette=self.cassette_mode or None,
+                         cerebras=self.is_provider_configured(CEREBRAS),
+                         meta_llama=self.is_provider_configured(META_LLAMA),
+                         asi_one=self.is_provider_configured(ASI_ONE))
+        
+        self.startup_timings = {
+            'imports_seconds': round(MODULE_IMPORT_SECONDS, 3),
+            'init_seconds': round(time.perf_counter() - init_started, 3)
+        }
+    
+    def _build_providers(self) -> Dict[str, LLMProvider]:
+        """Backends for each tier, wrapped for recording or replaced for replay"""
+        tiers = (CEREBRAS, META_LLAMA, ASI_ONE)
+        if self.cassette_mode:
+            self.cassette = Cassette(cassette_path(os.getenv('LLM_CASSETTE_DIR', os.path.join(CACHE_DIR, 'cassettes')),
+                                                   self.name))
+        if self.cassette_mode == REPLAY_MODE:
+            self.cassette.load()
+            speed = float(os.getenv('LLM_REPLAY_SPEED', '1'))
+            return {provider: ReplayProvider(provider, self.cassette, speed) for provider in tiers}
+        
+        providers = self._build_backends(tiers)
+        if self.cassette_mode == RECORD_MODE:
+            return {provider: RecordingProvider(backend, self.cassette) for provider, backend in providers.items()}
+        return providers
+    
+    def _build_backends(self, tiers: Tuple[str, ...]) -> Dict[str, LLMProvider]:
+        """Live API providers, or offline stubs when LLM_PROVIDER=stub"""
+        if self.llm_backend == STUB_BACKEND:
+            return {provider: StubProvider.from_env(provider) for provider in tiers}
+        return {
+            CEREBRAS: LiveProvider(CEREBRAS, self.cerebras_model, self._generate_cerebras,
+                                   bool(self.cerebras_api_key)),
+            META_LLAMA: LiveProvider(META_LLAMA, self.hf_model, self._generate_meta_llama,
+                                     bool(self.hf_api_key)),
+            ASI_ONE: LiveProvider(ASI_ONE, self.asi_one_model, self._generate_asi_one,
+                                  bool(self.asi_one_api_key))
+        }
+    
+    def _init_metrics(self):
+        """Register the LLM call path's metric families"""
+        self.llm_latency = self.metrics.histogram(
+            'llm_request_duration_seconds', 'Latency of provider calls',
+            ('provider', 'endpoint', 'outcome'))
+        self.llm_tokens = self.metrics.counter(
+            'llm_tokens_total', 'Estimated tokens sent to and received from providers',
+            ('provider', 'endpoint', 'direction'))
+        self.llm_fallbacks = self.metrics.counter(
+            'llm_fallbacks_total', 'Failed provider calls that fell through to the next tier',
+            ('provider', 'endpoint'))
+        self.llm_cache_lookups = self.metrics.counter(
+            'llm_cache_lookups_total', 'Response cache lookups by result',
+            ('endpoint', 'result'))
+        self.llm_truncations = self.metrics.counter(
+            'llm_truncations_total', 'Completions that hit max_tokens', ('endpoint',))
+        self.llm_parse_failures = self.metrics.counter(
+            'llm_parse_failures_total', 'LLM outputs that could not be parsed', ('endpoint',))
+        circuit_state = self.metrics.gauge(
+            'llm_circuit_state', 'Provider circuit breaker state (0 closed, 1 half-open, 2 open)',
+            ('provider',))
+        state_values = {'closed': 0, 'half_open': 1, 'open': 2}
+        
+        def collect_circuit_state():
+            for provider, breaker in self.fallback_manager.breakers.items():
+                circuit_state.set(state_values.get(breaker.current_state(), 0), provider=provider)
+        self.metrics.add_collector(collect_circuit_state)
+        
+        # Components that keep their own counters are mirrored into the registry at scrape time
+        cache_entries = self.metrics.gauge('llm_response_cache_entries', 'Entries in the in-memory response cache')
+        cache_hit_ratio = self.metrics.gauge('llm_response_cache_hit_ratio', 'Response cache hits per lookup')
+        cache_evictions = self.metrics.counter('llm_response_cache_evictions_total', 'LRU evictions from the response cache')
+        
+        def collect_response_cache():
+            stats = self.response_cache.get_stats()
+            cache_entries.set(stats['entries'])
+            cache_hit_ratio.set(stats['hit_rate'])
+            cache_evictions.set_total(stats['evictions'])
+        self.metrics.add_collector(collect_response_cache)
+        
+        pool_running = self.metrics.gauge('llm_worker_pool_running', 'Calls running on a worker pool', ('pool',))
+        pool_queued = self.metrics.gauge('llm_worker_pool_queued', 'Calls waiting for a worker pool slot', ('pool',))
+        pool_rejected = self.metrics.counter('llm_worker_pool_rejected_total',
+                                             'Calls shed because the worker pool queue was full', ('pool',))
+        pool_abandoned = self.metrics.counter('llm_worker_pool_abandoned_total',
+                                              'Calls whose caller gave up while the thread kept running', ('pool',))
+        pool_wait = self.metrics.counter('llm_worker_pool_wait_seconds_total',
+                                         'Time callers spent waiting for a worker pool slot', ('pool',))
+        
+        def collect_worker_pool():
+            stats = self.hf_worker_pool.get_stats()
+            pool_running.set(stats['running'], pool=META_LLAMA)
+            pool_queued.set(stats['queued'], pool=META_LLAMA)
+            pool_rejected.set_total(stats['rejected'], pool=META_LLAMA)
+            pool_abandoned.set_total(stats['abandoned'], pool=META_LLAMA)
+            pool_wait.set_total(stats['total_wait_seconds'], pool=META_LLAMA)
+        self.metrics.add_collector(collect_worker_pool)
+        
+        rate_limit_acquired = self.metrics.counter('llm_rate_limit_acquired_total',
+                                                   'Requests admitted by the shared rate limiter', ('provider',))
+        rate_limit_waits = self.metrics.counter('llm_rate_limit_waits_total',
+                                                'Requests that had to wait for rate limit quota', ('provider',))
+        rate_limit_wait = self.metrics.counter('llm_rate_limit_wait_seconds_total',
+                                               'Time spent waiting for rate limit quota', ('provider',))
+        rate_limit_claims = self.metrics.counter('llm_rate_limit_claims_total',
+                                                 'Waiters passed over long enough to claim the buckets', ('provider',))
+        
+        def collect_rate_limit():
+            stats = self.cerebras_rate_limiter.get_stats()
+            rate_limit_acquired.set_total(stats['acquired'], provider=CEREBRAS)
+            rate_limit_waits.set_total(stats['waits'], provider=CEREBRAS)
+            rate_limit_wait.set_total(stats['total_wait_seconds'], provider=CEREBRAS)
+            rate_limit_claims.set_total(stats['claims'], provider=CEREBRAS)
+        self.metrics.add_collector(collect_rate_limit)
+    
+    async def handle_metrics(self, request):
+        """GET /metrics in the Prometheus text exposition format"""
+        from aiohttp import web
+        
+        return web.Response(text=self.metrics.render(), content_type='text/plain',
+                            headers={'X-Content-Type-Options': 'nosniff'})
     
-    async def call_cerebras(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Call Cerebras API to generate response"""
+    async def handle_recent_traces(self, request):
+        """GET /traces: summaries of recent traces (?limit=N)"""
+        from aiohttp import web
+        
         try:
-            print(f"🚀 [{self.name}] Calling Cerebras API...")
-            print(f"🔑 [{self.name}] Using model: llama-4-scout-17b-16e-instruct")
-            
-            chat_completion = self.cerebras_client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="llama-4-scout-17b-16e-instruct",
-                max_tokens=max_tokens
+            limit = int(request.query.get('limit', '20'))
+        except ValueError:
+            return web.json_response({'error': 'limit must be an integer'}, status=400)
+        return web.json_response({'agent': self.name, 'traces': self.tracer.recent_traces(limit)})
+    
+    async def handle_trace(self, request):
+        """GET /traces/{trace_id}: this agent's spans for one trace"""
+        from aiohttp import web
+        
+        trace_id = request.match_info['trace_id']
+        spans = self.tracer.get_trace(trace_id)
+        if not spans:
+            return web.json_response({'error': f'No spans buffered for trace {trace_id}'}, status=404)
+        return web.json_response({'agent': self.name, 'trace_id': trace_id, 'spans': spans})
+    
+    def traced(self, name: str):
+        """Decorator running a message/REST handler in a span that continues
+        the caller's trace (the request model's trace field)"""
+        def decorator(handler):
+            @functools.wraps(handler)
+            async def wrapper(*args, **kwargs):
+                request = args[-1] if args else None
+                with self.tracer.span(name, parent=getattr(request, 'trace', None)):
+                    return await handler(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def parse_llm_json(self, text: str, endpoint: str) -> Any:
+        """json.loads an LLM completion inside a parse span"""
+        with self.tracer.span('parse', endpoint=endpoint, chars=len(text)):
+            return json.loads(text)
+    
+    def _observe_call(self, provider: str, endpoint: Optional[str], outcome: str, started: float):
+        """Record one provider call's latency"""
+        self.llm_latency.observe(time.perf_counter() - started, provider=provider,
+                                 endpoint=endpoint or 'default', outcome=outcome)
+    
+    @property
+    def cerebras_client(self):
+        """AsyncCerebras client, created (and its SDK imported) on first use"""
+        if self._cerebras_client is None:
+            from cerebras.cloud.sdk import AsyncCerebras
+            self._cerebras_client = AsyncCerebras(
+                api_key=self.cerebras_api_key,
+                timeout=self.cerebras_timeout
             )
+        return self._cerebras_client
+    
+    @property
+    def hf_client(self):
+        """Hugging Face InferenceClient, created on first use; None without an API key
+        
+        The first access imports huggingface_hub, which takes seconds: only
+        touch it from the Meta Llama worker pool, never on the event loop.
+        """
+        with self._hf_client_lock:
+            if self._hf_client is None and self.hf_api_key:
+                from huggingface_hub import InferenceClient
+                self._hf_client = InferenceClient(
+                    model=self.hf_model,
+                    token=self.hf_api_key
+                )
+        return self._hf_client
+    
+    async def call_cerebras(self, prompt: str, max_tokens: int = 1000, hedge: bool = False,
+                            deadline: Optional[float] = None, endpoint: Optional[str] = None) -> str:
+        """Call Cerebras API to generate response, falling back to Meta Llama and ASI:One
+        
+        Concurrent callers with the same prompt, max_tokens, deadline and hedge
+        setting await a single shared call through the fallback chain. With hedge=True a
+        slow primary call is raced against the next provider tier.
+        deadline is an absolute time.time() by which the caller needs an
+        answer; DeadlineExceeded is raised rather than overrunning it.
+        Passing an endpoint name lets max_tokens adapt to that endpoint's
+        observed completion lengths (max_tokens stays the upper bound).
+        """
+        # Only identical requests share a flight: a deadline can trim the limit or cut the
+        # call off, so the deadline's bucket and the effective limit are part of the key
+        # and callers without a deadline never inherit a deadline-bound outcome; the
+        # hedge flag is too, so no caller silently inherits another's hedging
+        limit, deadline_bucket = max_tokens, 'none'
+        if deadline is not None:
+            limit = min(limit, self._deadline_token_budget(deadline))
+            deadline_bucket = int(deadline // self.flight_deadline_bucket)
+        limit = self.completion_sizer.limit(endpoint, limit)
+        flight_key = self.response_cache.make_key(f"call_cerebras:{max_tokens}:{deadline_bucket}:{int(hedge)}",
+                                                 prompt, limit)
+        return await self.inflight_requests.do(
+            flight_key, lambda: self.generate_with_fallback(
+                prompt, max_tokens, start=CEREBRAS, hedge=hedge, deadline=deadline, endpoint=endpoint
+            )
+        )
+    
+    async def call_meta_llama(self, prompt: str, max_tokens: int = 1000, deadline: Optional[float] = None) -> str:
+        """Call Meta Llama API via Hugging Face, falling back to ASI:One"""
+        return await self.generate_with_fallback(prompt, max_tokens, start=META_LLAMA, deadline=deadline)
+    
+    async def call_asi_one_fallback(self, prompt: str, max_tokens: int = 1000, deadline: Optional[float] = None) -> str:
+        """Call the ASI:One legacy fallback API directly"""
+        return await self.generate_with_fallback(prompt, max_tokens, start=ASI_ONE, deadline=deadline)
+    
+    async def generate_with_fallback(self, prompt: str, max_tokens: int, start: str = CEREBRAS,
+                                     hedge: bool = False, deadline: Optional[float] = None,
+                                     endpoint: Optional[str] = None) -> str:
+        """Try providers in the order chosen by the fallback manager"""
+        with self.tracer.span('llm.generate', endpoint=endpoint or 'default', max_tokens=max_tokens) as span:
+            prompt = self.prompt_compactor.compact(prompt)
+            route = [p for p in self.fallback_manager.route(start) if self.is_provider_configured(p)]
             
-            content = chat_completion.choices[0].message.content
-            print(f"✅ [{self.name}] Cerebras response received ({len(content)} chars)")
-            return content
+            # One lookup keyed on the requested tier: whichever tier answered an
+            # earlier call for this prompt stored its reply under that key
+            cache_key = self.response_cache.make_key(self.get_provider_model(start), prompt, max_tokens)
+            if endpoint:
+                self.last_cache_keys[endpoint] = cache_key
+            cached = await self.response_cache.get_async(cache_key)
+            if cached is not None:
+                self.logger.info('llm.cache_hit', "⚡ Cache hit", sample=True,
+                                 provider=start, chars=len(cached))
+                self.llm_cache_lookups.inc(endpoint=endpoint or 'default', result='hit')
+                span['attributes']['cache'] = 'hit'
+                return cached
+            self.llm_cache_lookups.inc(endpoint=endpoint or 'default', result='miss')
             
-        except Exception as e:
-            print(f"❌ [{self.name}] Error calling Cerebras: {str(e)}")
-            print(f"🔄 [{self.name}] Falling back to Meta Llama...")
-            return await self.call_meta_llama(prompt, max_tokens)
-    
-    async def call_meta_llama(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Call Meta Llama API via Hugging Face to generate response"""
-        if not self.hf_client:
-            print(f"❌ [{self.name}] Meta Llama client not available")
-            print(f"🔄 [{self.name}] Falling back to ASI:One...")
-            return await self.call_asi_one_fallback(prompt, max_tokens)
+            if deadline is not None:
+                route, max_tokens = self._plan_for_deadline(route, max_tokens, deadline)
             
-        try:
-            print(f"🦙 [{self.name}] Calling Meta Llama API...")
-            print(f"🔑 [{self.name}] Using model: {self.hf_model}")
+            if hedge and self.hedging_enabled and len(route) > 1:
+                return await self._generate_hedged(route, prompt, max_tokens, deadline, endpoint, cache_key)
+            return await self._try_providers(route, prompt, max_tokens, deadline, endpoint, cache_key)
+    
+    def _plan_for_deadline(self, route: List[str], max_tokens: int, deadline: float) -> Tuple[List[str], int]:
+        """Drop providers too slow for the remaining time and shrink max_tokens to fit"""
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline passed {-remaining:.1f}s ago")
+        
+        # Providers whose median latency already exceeds the budget would only burn it
+        fast_enough = []
+        for provider in route:
+            typical = self.fallback_manager.stats[provider].latency_percentile(50)
+            if typical is None or typical <= remaining:
+                fast_enough.append(provider)
+            else:
+                self.logger.warning('llm.deadline_skip', "⏱️ Skipping provider too slow for deadline",
+                                    provider=provider, p50_seconds=round(typical, 2),
+                                    remaining_seconds=round(remaining, 2))
+        if route and not fast_enough:
+            raise DeadlineExceeded(f"No provider can answer within the remaining {remaining:.1f}s")
+        
+        budget_tokens = self._deadline_token_budget(deadline)
+        if budget_tokens < max_tokens:
+            self.logger.info('llm.deadline_trim', "⏱️ Reducing max_tokens to fit deadline",
+                             remaining_seconds=round(remaining, 2), requested=max_tokens, max_tokens=budget_tokens)
+            max_tokens = budget_tokens
+        return fast_enough, max_tokens
+    
+    def _deadline_token_budget(self, deadline: float) -> int:
+        """Most tokens a provider can be expected to produce before the deadline"""
+        remaining = deadline - time.time()
+        return max(self.deadline_min_tokens, int(remaining * self.deadline_tokens_per_second))
+    
+    async def _try_providers(self, route: List[str], prompt: str, max_tokens: int,
+                             deadline: Optional[float] = None, endpoint: Optional[str] = None,
+                             cache_key: Optional[str] = None) -> str:
+        """Call each provider in turn until one succeeds"""
+        last_error = None
+        for provider in route:
+            try:
+                return await self._attempt_provider(provider, prompt, max_tokens, deadline, endpoint, cache_key)
+            except ProviderUnavailable:
+                continue
+            except DeadlineExceeded:
+                # No time left for another tier; let the caller degrade
+                raise
+            except Exception as e:
+                self.logger.warning('llm.fallback', "🔄 Falling back to next provider", provider=provider)
+                self.llm_fallbacks.inc(provider=provider, endpoint=endpoint or 'default')
+                self.tracer.event('llm.fallback', provider=provider, error=str(e))
+                last_error = e
+        
+        if last_error is None:
+            raise Exception("All APIs unavailable - no configured provider is accepting requests")
+        raise Exception(f"All APIs failed - Cerebras, Meta Llama, and ASI:One unavailable (last error: {last_error})")
+    
+    async def _attempt_provider(self, provider: str, prompt: str, max_tokens: int,
+                                deadline: Optional[float] = None, endpoint: Optional[str] = None,
+                                cache_key: Optional[str] = None) -> str:
+        """One breaker-guarded, timed provider call that records its outcome
+        (and caches the reply under cache_key, if given)"""
+        with self.tracer.span('llm.call', provider=provider, endpoint=endpoint or 'default') as span:
+            remaining = deadline - time.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Deadline passed before calling {PROVIDER_LABELS[provider]}")
             
-            # Format prompt for Llama chat
-            formatted_prompt = f"<s>[INST] {prompt} [/INST]"
+            if not self.fallback_manager.acquire(provider):
+                self.logger.warning('llm.circuit_open', "⛔ Circuit open, skipping", sample=True, provider=provider)
+                raise ProviderUnavailable(provider)
             
-            response = self.hf_client.text_generation(
-                formatted_prompt,
-                max_new_tokens=max_tokens,
-                temperature=0.7,
-                do_sample=True,
-                return_full_text=False
-            )
+            limit = self.completion_sizer.limit(endpoint, max_tokens)
+            span['attributes']['max_tokens'] = limit
+            rate_limiter = self._rate_limiter_for(provider)
+            if rate_limiter is not None:
+                # Waiting on local quota is not provider latency: reserve it before the timer starts
+                try:
+                    await asyncio.wait_for(rate_limiter.acquire({'requests': 1, 'tokens': estimate_tokens(prompt) + limit}),
+                                           timeout=remaining)
+                except asyncio.TimeoutError:
+                    self.fallback_manager.release(provider)
+                    raise DeadlineExceeded(f"Deadline passed waiting for {PROVIDER_LABELS[provider]} rate limit")
+                except BaseException:
+                    self.fallback_manager.release(provider)
+                    raise
+                if deadline is not None:
+                    remaining = deadline - time.time()
+            started = time.perf_counter()
+            try:
+                self.llm_tokens.inc(estimate_tokens(prompt), provider=provider,
+                                    endpoint=endpoint or 'default', direction='input')
+                content = await asyncio.wait_for(self.call_provider(provider, prompt, limit), timeout=remaining)
+            except asyncio.CancelledError:
+                self.fallback_manager.release(provider)
+                self._observe_call(provider, endpoint, 'cancelled', started)
+                raise
+            except asyncio.TimeoutError as e:
+                if deadline is None or time.time() < deadline:
+                    # The provider's own timeout fired: an ordinary failure
+                    self.fallback_manager.record_failure(provider, time.perf_counter() - started, e)
+                    self._observe_call(provider, endpoint, 'timeout', started)
+                    self.logger.error('llm.error', "❌ Provider call failed", provider=provider, error='timed out')
+                    raise
+                # Our budget ran out, which says nothing about the provider's health
+                self.fallback_manager.release(provider)
+                self._observe_call(provider, endpoint, 'deadline', started)
+                self.logger.warning('llm.deadline_cutoff', "⏱️ Provider cut off at deadline",
+                                    provider=provider, waited_seconds=round(remaining, 2))
+                raise DeadlineExceeded(f"{PROVIDER_LABELS[provider]} did not answer before the deadline")
+            except WorkerPoolFull as e:
+                # Local saturation, not a provider fault: shed to the next tier
+                self.fallback_manager.release(provider)
+                self._observe_call(provider, endpoint, 'rejected', started)
+                self.logger.warning('llm.pool_saturated', "🚦 Worker pool saturated, skipping", sample=True,
+                                    provider=provider, error=str(e))
+                raise ProviderUnavailable(provider)
+            except Exception as e:
+                self.fallback_manager.record_failure(provider, time.perf_counter() - started, e)
+                self._observe_call(provider, endpoint, 'error', started)
+                self.logger.error('llm.error', "❌ Provider call failed", provider=provider, error=str(e))
+                raise
             
-            content = response[0]['generated_text'] if isinstance(response, list) else response
-            print(f"✅ [{self.name}] Meta Llama response received ({len(content)} chars)")
+            self.fallback_manager.record_success(provider, time.perf_counter() - started)
+            self._observe_call(provider, endpoint, 'success', started)
+            completion_tokens = self._completion_tokens(content)
+            self.llm_tokens.inc(completion_tokens, provider=provider,
+                                endpoint=endpoint or 'default', direction='output')
+            span['attributes']['completion_tokens'] = completion_tokens
+            if not self._record_completion(endpoint, content, limit, max_tokens) and cache_key is not None:
+                await self.response_cache.put_async(cache_key, content)
             return content
-            
-        except Exception as e:
-            print(f"❌ [{self.name}] Error calling Meta Llama: {str(e)}")
-            print(f"🔄 [{self.name}] Falling back to ASI:One...")
-            return await self.call_asi_one_fallback(prompt, max_tokens)
-    
-    async def call_asi_one_fallback(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Fallback to ASI:One API if Cerebras and Meta Llama fail"""
-        if not self.asi_one_api_key:
-            raise Exception("All APIs failed - Cerebras, Meta Llama, and ASI:One unavailable")
-            
+    
+    def _rate_limiter_for(self, provider: str) -> Optional[SharedTokenBucket]:
+        """Shared quota guarding a provider's live API (None for stubs, replay and unlimited tiers)"""
+        if provider == CEREBRAS and self.llm_backend == LIVE_BACKEND and self.cassette_mode != REPLAY_MODE:
+            return self.cerebras_rate_limiter
+        return None
+    
+    @staticmethod
+    def _completion_tokens(content: str) -> int:
+        """Completion length as reported by the provider, estimated if it did not say"""
+        reported = getattr(content, 'completion_tokens', None)
+        return reported if reported is not None else estimate_tokens(content)
+    
+    def _record_completion(self, endpoint: Optional[str], content: str, limit: int, max_tokens: int) -> bool:
+        """Feed the completion length to the sizer; True if it was cut off at the limit
+        (such output is never cached)"""
+        truncated = self.completion_sizer.record(endpoint, self._completion_tokens(content), limit,
+                                                 getattr(content, 'finish_reason', None))
+        if truncated:
+            self.llm_truncations.inc(endpoint=endpoint or 'default')
+            self.logger.warning('llm.truncated', "✂️ Completion hit max_tokens",
+                                endpoint=endpoint, max_tokens=limit, requested=max_tokens)
+        return truncated
+    
+    def record_parse_failure(self, endpoint: str):
+        """Report that an endpoint's LLM output could not be parsed (and stop serving it from cache)"""
+        self.llm_parse_failures.inc(endpoint=endpoint)
+        cache_key = self.last_cache_keys.pop(endpoint, None)
+        if cache_key is not None:
+            self.response_cache.delete(cache_key)
+        if self.completion_sizer.record_parse_failure(endpoint):
+            self.logger.warning('llm.truncated_parse_failure',
+                                "✂️ Parse failure followed a truncated completion - widening max_tokens",
+                                endpoint=endpoint)
+    
+    async def _generate_hedged(self, route: List[str], prompt: str, max_tokens: int,
+                               deadline: Optional[float] = None, endpoint: Optional[str] = None,
+                               cache_key: Optional[str] = None) -> str:
+        """Race the primary provider against the rest of the chain after a latency deadline
+        
+        The deadline is the primary's observed latency at LLM_HEDGE_PERCENTILE.
+        Until enough samples exist no hedge is fired. The losing call is cancelled.
+        """
+        primary, secondary = route[0], route[1:]
+        delay = self.fallback_manager.hedge_delay(primary, self.hedge_percentile)
+        if delay is None:
+            return await self._try_providers(route, prompt, max_tokens, deadline, endpoint, cache_key)
+        
+        primary_started = time.perf_counter()
+        primary_task = asyncio.ensure_future(
+            self._attempt_provider(primary, prompt, max_tokens, deadline, endpoint, cache_key))
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done:
+            if not primary_task.exception():
+                return primary_task.result()
+            if isinstance(primary_task.exception(), DeadlineExceeded):
+                raise primary_task.exception()
+            if isinstance(primary_task.exception(), ProviderUnavailable):
+                # Skipped without a call (open circuit, saturated pool): the breaker already
+                # counted it, and it is neither a fallback nor a hedge outcome
+                return await self._try_providers(secondary, prompt, max_tokens, deadline, endpoint, cache_key)
+            self.logger.warning('llm.fallback', "🔄 Falling back to next provider", provider=primary)
+            self.llm_fallbacks.inc(provider=primary, endpoint=endpoint or 'default')
+            self.tracer.event('llm.fallback', provider=primary, error=str(primary_task.exception()))
+            return await self._try_providers(secondary, prompt, max_tokens, deadline, endpoint, cache_key)
+        
+        self.logger.info('llm.hedge', "🏁 Hedge deadline exceeded, racing next provider",
+                         provider=primary, hedge_provider=secondary[0], delay_seconds=round(delay, 2))
+        self.fallback_manager.record_hedge(primary)
+        secondary_task = asyncio.ensure_future(
+            self._try_providers(secondary, prompt, max_tokens, deadline, endpoint, cache_key))
+        pending = {primary_task, secondary_task}
+        hedge_won = False
         try:
-            print(f"🔑 [{self.name}] Calling ASI:One legacy fallback API...")
-            
-            response = requests.post(
-                f"{self.asi_one_base_url}/chat/completions",
-                headers={
-                    'Authorization': f'Bearer {self.asi_one_api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': 'asi1-mini',
-                    'max_tokens': max_tokens,
-                    'messages': [
-                        {
-                            'role': 'user',
-                            'content': prompt
-                        }
-                    ]
-                },
-                timeout=120
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.exception():
+                        if task is secondary_task:
+                            hedge_won = True
+                            self.fallback_manager.record_hedge_win(primary)
+                        return task.result()
+            # Both failed: surface the fallback chain's error
+            raise secondary_task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            if hedge_won and primary_task in pending:
+                # The primary lost the race: its latency is at least this long. Leaving it
+                # out would keep only fast calls in the window and drag the hedge delay down.
+                # Cancellations by the caller or the deadline say nothing about its latency
+                self.fallback_manager.record_cancelled(primary, time.perf_counter() - primary_started)
+    
+    async def stream_cerebras(self, prompt: str, max_tokens: int = 1000,
+                              endpoint: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream a Cerebras completion chunk by chunk
+        
+        Cached responses are yielded whole. If Cerebras is unavailable or
+        fails before the first chunk, the buffered fallback chain is used
+        and its full response is yielded as a single chunk.
+        """
+        prompt = self.prompt_compactor.compact(prompt)
+        route = [p for p in self.fallback_manager.route(CEREBRAS) if self.is_provider_configured(p)]
+        cache_key = self.response_cache.make_key(self.get_provider_model(CEREBRAS), prompt, max_tokens)
+        if endpoint:
+            self.last_cache_keys[endpoint] = cache_key
+        cached = await self.response_cache.get_async(cache_key)
+        if cached is not None:
+            self.logger.info('llm.cache_hit', "⚡ Cache hit", sample=True,
+                             provider=CEREBRAS, chars=len(cached))
+            self.llm_cache_lookups.inc(endpoint=endpoint or 'default', result='hit')
+            yield cached
+            return
+        self.llm_cache_lookups.inc(endpoint=endpoint or 'default', result='miss')
+        
+        if self.llm_backend == STUB_BACKEND or self.cassette_mode:
+            # Stub, recorded and replayed completions are returned whole
+            yield await self._try_providers(route, prompt, max_tokens, endpoint=endpoint, cache_key=cache_key)
+            return
+        
+        if not route or route[0] != CEREBRAS or not self.fallback_manager.acquire(CEREBRAS):
+            yield await self._try_providers([p for p in route if p != CEREBRAS], prompt, max_tokens,
+                                            endpoint=endpoint, cache_key=cache_key)
+            return
+        
+        self.logger.debug('llm.stream_start', "🌊 Streaming from Cerebras API", model=self.cerebras_model)
+        limit = self.completion_sizer.limit(endpoint, max_tokens)
+        reserved_tokens = estimate_tokens(prompt) + limit
+        parts = []
+        completion_tokens = finish_reason = None
+        try:
+            await self.cerebras_rate_limiter.acquire({'requests': 1, 'tokens': reserved_tokens})
+        except BaseException:
+            self.fallback_manager.release(CEREBRAS)
+            raise
+        # Timed from here so waiting on local quota is not counted as Cerebras latency
+        started = time.perf_counter()
+        self.llm_tokens.inc(estimate_tokens(prompt), provider=CEREBRAS,
+                            endpoint=endpoint or 'default', direction='input')
+        try:
+            stream = await self.cerebras_client.chat.completions.create(
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                model=self.cerebras_model,
+                max_tokens=limit,
+                stream=True
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result['choices'][0]['message']['content']
-                print(f"✅ [{self.name}] ASI:One legacy fallback response received ({len(content)} chars)")
-                return content
-            else:
-                print(f"❌ [{self.name}] ASI:One legacy fallback API error: {response.status_code}")
-                raise Exception(f"ASI:One legacy fallback API error: {response.status_code}")
-                
+            async for chunk in stream:
+                usage = getattr(chunk, 'usage', None)
+                if usage is not None and getattr(usage, 'total_tokens', None):
+                    await self.cerebras_rate_limiter.refund({'tokens': reserved_tokens - usage.total_tokens})
+                    completion_tokens = getattr(usage, 'completion_tokens', None)
+                if chunk.choices and chunk.choices[0].finish_reason:
+                    finish_reason = chunk.choices[0].finish_reason
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except (asyncio.CancelledError, GeneratorExit):
+            self.fallback_manager.release(CEREBRAS)
+            self._observe_call(CEREBRAS, endpoint, 'cancelled', started)
+            raise
         except Exception as e:
-            print(f"❌ [{self.name}] Error calling ASI:One legacy fallback: {str(e)}")
-            raise e
+            self.fallback_manager.record_failure(CEREBRAS, time.perf_counter() - started, e)
+            self._observe_call(CEREBRAS, endpoint, 'error', started)
+            self.logger.error('llm.stream_error', "❌ Cerebras stream failed", provider=CEREBRAS,
+                              error=str(e), chunks_sent=len(parts))
+            if parts:
+                raise
+            self.logger.warning('llm.fallback', "🔄 Falling back to next provider", provider=CEREBRAS)
+            self.llm_fallbacks.inc(provider=CEREBRAS, endpoint=endpoint or 'default')
+            self.tracer.event('llm.fallback', provider=CEREBRAS, error=str(e))
+            yield await self._try_providers(route[1:], prompt, max_tokens, endpoint=endpoint, cache_key=cache_key)
+            return
+        
+        content = Completion(''.join(parts), completion_tokens, finish_reason)
+        self.fallback_manager.record_success(CEREBRAS, time.perf_counter() - started)
+        self._observe_call(CEREBRAS, endpoint, 'success', started)
+        self.llm_tokens.inc(self._completion_tokens(content), provider=CEREBRAS,
+                            endpoint=endpoint or 'default', direction='output')
+        if not self._record_completion(endpoint, content, limit, max_tokens):
+            await self.response_cache.put_async(cache_key, content)
+        self.logger.info('llm.response', "✅ Cerebras stream complete", sample=True,
+                         provider=CEREBRAS, chars=len(content), streamed=True)
+    
+    async def stream_generation(self, prompt: str, max_tokens: int, build_result: Callable[[str], Any],
+                                endpoint: Optional[str] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """SSE events for a generation: 'token' chunks, then the parsed 'result'"""
+        parts = []
+        async for chunk in self.stream_cerebras(prompt, max_tokens, endpoint):
+            parts.append(chunk)
+            yield 'token', chunk
+        yield 'result', build_result(''.join(parts)).dict()
+    
+    def is_provider_configured(self, provider: str) -> bool:
+        """Whether credentials/client exist for a provider"""
+        return self.providers[provider].is_configured()
+    
+    def get_provider_model(self, provider: str) -> str:
+        """Model name used for a provider"""
+        return self.providers[provider].model
+    
+    async def call_provider(self, provider: str, prompt: str, max_tokens: int) -> str:
+        """Dispatch a single call to one provider (no fallback)"""
+        return await self.providers[provider].generate(prompt, max_tokens)
+    
+    async def _generate_cerebras(self, prompt: str, max_tokens: int) -> str:
+        """Single Cerebras completion"""
+        self.logger.debug('llm.call', "🚀 Calling Cerebras API", model=self.cerebras_model, max_tokens=max_tokens)
+        
+        # _attempt_provider reserved quota for the prompt (~4 chars/token) plus the
+        # full completion budget; whatever the reply did not use is returned below
+        reserved_tokens = estimate_tokens(prompt) + max_tokens
+        
+        chat_completion = await self.cerebras_client.chat.completions.create(
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=self.cerebras_model,
+            max_tokens=max_tokens
+        )
+        
+        usage = getattr(chat_completion, 'usage', None)
+        if usage is not None and getattr(usage, 'total_tokens', None):
+            await self.cerebras_rate_limiter.refund({'tokens': reserved_tokens - usage.total_tokens})
+        
+        choice = chat_completion.choices[0]
+        content = choice.message.content
+        self.logger.info('llm.response', "✅ Cerebras response received", sample=True,
+                         provider=CEREBRAS, chars=len(content))
+        return Completion(content, getattr(usage, 'completion_tokens', None), getattr(choice, 'finish_reason', None))
+    
+    async def _generate_meta_llama(self, prompt: str, max_tokens: int) -> str:
+        """Single Meta Llama completion via Hugging Face"""
+        self.logger.debug('llm.call', "🦙 Calling Meta Llama API", model=self.hf_model, max_tokens=max_tokens)
+        
+        # Format prompt for Llama chat
+        formatted_prompt = f"<s>[INST] {prompt} [/INST]"
+        
+        response = await self.hf_worker_pool.run(
+            self._meta_llama_text_generation,
+            formatted_prompt,
+            max_new_tokens=max_tokens,
+            temperature=0.7,
+            do_sample=True,
+            return_full_text=False,
+            details=True
+        )
+        
+        # details=True also reports the generated token count and finish reason
+        details = getattr(response, 'details', None)
+        if details is not None:
+            content = response.generated_text
+        else:
+            content = response[0]['generated_text'] if isinstance(response, list) else response
+        self.logger.info('llm.response', "✅ Meta Llama response received", sample=True,
+                         provider=META_LLAMA, chars=len(content))
+        return Completion(content, getattr(details, 'generated_tokens', None), getattr(details, 'finish_reason', None))
+    
+    def _meta_llama_text_generation(self, *args, **kwargs):
+        """hf_client.text_generation, run on the worker pool so that building the
+        client on the first fallback does not stall the event loop"""
+        return self.hf_client.text_generation(*args, **kwargs)
+    
+    async def _generate_asi_one(self, prompt: str, max_tokens: int) -> str:
+        """Single ASI:One legacy fallback completion"""
+        self.logger.debug('llm.call', "🔑 Calling ASI:One legacy fallback API", model=self.asi_one_model, max_tokens=max_tokens)
+        
+        session = await self.get_http_session()
+        async with session.post(
+            f"{self.asi_one_base_url}/chat/completions",
+            headers={
+                'Authorization': f'Bearer {self.asi_one_api_key}',
+                'Content-Type': 'application/json'
+            },
+            json={
+                'model': self.asi_one_model,
+                'max_tokens': max_tokens,
+                'messages': [
+                    {
+                        'role': 'user',
+                        'content': prompt
+                    }
+                ]
+            },
+            timeout=aiohttp.ClientTimeout(total=self.asi_one_timeout)
+        ) as response:
+            if response.status != 200:
+                raise Exception(f"ASI:One legacy fallback API error: {response.status}")
+            result = await response.json()
+        
+        choice = result['choices'][0]
+        content = choice['message']['content']
+        self.logger.info('llm.response', "✅ ASI:One legacy fallback response received", sample=True,
+                         provider=ASI_ONE, chars=len(content))
+        return Completion(content, (result.get('usage') or {}).get('completion_tokens'), choice.get('finish_reason'))
+    
+    async def get_http_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive HTTP session with a bounded connection pool"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.http_pool_size,
+                    limit_per_host=self.http_pool_per_host,
+                    keepalive_timeout=float(os.getenv('AGENT_HTTP_KEEPALIVE', '30'))
+                )
+            )
+        return self._http_session
+    
+    async def close_http_session(self):
+        """Close the pooled HTTP session"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
     
     def log_activity(self, activity: str, data: Dict[str, Any] = None):
         """Log agent activity"""
-        print(f"[{self.name}] {activity}: {data or 'No data'}")
+        self.logger.log(logging.INFO, 'activity', activity, fields=data)
     
     def get_agent_address(self) -> str:
         """Get the agent's address for communication"""
@@ -171,5 +957,16 @@ class BaseUAgent:
             'role': self.role,
             'port': self.port,
             'address': self.get_agent_address(),
-            'status': 'active'
+            'status': 'active',
+            'response_cache': self.response_cache.get_stats(),
+            'inflight_requests': self.inflight_requests.get_stats(),
+            'providers': self.fallback_manager.get_stats(),
+            'llm_backends': {provider: backend.get_stats() for provider, backend in self.providers.items()},
+            'cerebras_rate_limit': self.cerebras_rate_limiter.get_stats(),
+            'meta_llama_pool': self.hf_worker_pool.get_stats(),
+            'prompt_compaction': self.prompt_compactor.get_stats(),
+            'completion_sizing': self.completion_sizer.get_stats(),
+            'startup': self.startup_timings,
+            'logging': self.logger.get_stats(),
+            'tracing': self.tracer.get_stats()
         }
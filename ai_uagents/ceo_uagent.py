@@ -4,13 +4,14 @@ Generates business ideas and evaluates product concepts
 """
 
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uagents import Context, Model
 from base_uagent import BaseUAgent
 
 class GenerateIdeas(Model):
     """Model for generating business ideas"""
     count: int = 3
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class BusinessIdea(Model):
     """Model for business idea structure"""
@@ -29,6 +30,7 @@ class EvaluateProduct(Model):
     product_description: str
     features: List[str]
     target_market: Dict[str, str]
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class ProductEvaluation(Model):
     """Model for product evaluation response"""
@@ -52,6 +54,7 @@ class CEOuAgent(BaseUAgent):
         """Setup message handlers for the agent"""
         
         @self.agent.on_message(model=GenerateIdeas)
+        @self.traced('message.GenerateIdeas')
         async def handle_generate_ideas(ctx: Context, sender: str, msg: GenerateIdeas):
             """Generate business ideas"""
             try:
@@ -77,18 +80,19 @@ Format your response as JSON with this structure:
   ]
 }}"""
 
-                response = await ceo_agent.call_cerebras(prompt, 2000)
+                response = await ceo_agent.call_cerebras(prompt, 2000, endpoint='generate-ideas')
                 
                 # Parse JSON response
                 try:
-                    ideas_data = json.loads(response)
+                    ideas_data = ceo_agent.parse_llm_json(response, 'generate-ideas')
                 except json.JSONDecodeError:
                     # Try to extract JSON from response
                     import re
                     json_match = re.search(r'\{[\s\S]*\}', response)
                     if json_match:
-                        ideas_data = json.loads(json_match.group())
+                        ideas_data = ceo_agent.parse_llm_json(json_match.group(), 'generate-ideas')
                     else:
+                        ceo_agent.record_parse_failure('generate-ideas')
                         raise ValueError("Could not parse JSON from response")
                 
                 ideas = [BusinessIdea(**idea) for idea in ideas_data.get('ideas', [])]
@@ -107,6 +111,7 @@ Format your response as JSON with this structure:
                 await ctx.send(sender, IdeasResponse(ideas=[]))
         
         @self.agent.on_message(model=EvaluateProduct)
+        @self.traced('message.EvaluateProduct')
         async def handle_evaluate_product(ctx: Context, sender: str, msg: EvaluateProduct):
             """Evaluate product concept for market viability"""
             try:
@@ -127,18 +132,19 @@ Provide your assessment in JSON format:
   "go_decision": true/false
 }}"""
 
-                response = await ceo_agent.call_cerebras(prompt, 1000)
+                response = await ceo_agent.call_cerebras(prompt, 1000, endpoint='evaluate-product')
                 
                 # Parse JSON response
                 try:
-                    evaluation_data = json.loads(response)
+                    evaluation_data = ceo_agent.parse_llm_json(response, 'evaluate-product')
                 except json.JSONDecodeError:
                     # Try to extract JSON from response
                     import re
                     json_match = re.search(r'\{[\s\S]*\}', response)
                     if json_match:
-                        evaluation_data = json.loads(json_match.group())
+                        evaluation_data = ceo_agent.parse_llm_json(json_match.group(), 'evaluate-product')
                     else:
+                        ceo_agent.record_parse_failure('evaluate-product')
                         raise ValueError("Could not parse JSON from response")
                 
                 evaluation = ProductEvaluation(**evaluation_data)
@@ -166,6 +172,7 @@ Provide your assessment in JSON format:
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/wait-for-user", GenerateIdeas, IdeasResponse)
+        @self.traced('wait-for-user')
         async def handle_wait_for_user_rest(ctx: Context, req: GenerateIdeas) -> IdeasResponse:
             """REST endpoint - CEO agent waits for user to build AI agents"""
             try:
@@ -182,18 +189,19 @@ Provide your assessment in JSON format:
                   "next_steps": "What happens next"
                 }}"""
 
-                response = await self.call_cerebras(prompt, 500)
+                response = await self.call_cerebras(prompt, 500, endpoint='wait-for-user')
                 
                 # Parse JSON response
                 try:
-                    welcome_data = json.loads(response)
+                    welcome_data = self.parse_llm_json(response, 'wait-for-user')
                 except json.JSONDecodeError:
                     # Try to extract JSON from response
                     import re
                     json_match = re.search(r'\{[\s\S]*\}', response)
                     if json_match:
-                        welcome_data = json.loads(json_match.group())
+                        welcome_data = self.parse_llm_json(json_match.group(), 'wait-for-user')
                     else:
+                        self.record_parse_failure('wait-for-user')
                         welcome_data = {
                             "message": "Welcome! I'm ready to coordinate the AI agent workflow once you build the agents.",
                             "status": "ready_for_workflow",
@@ -226,6 +234,7 @@ Provide your assessment in JSON format:
                 return IdeasResponse(ideas=[default_idea])
         
         @self.agent.on_rest_post("/evaluate-product", EvaluateProduct, ProductEvaluation)
+        @self.traced('evaluate-product')
         async def handle_evaluate_product_rest(ctx: Context, req: EvaluateProduct) -> ProductEvaluation:
             """REST endpoint for product evaluation"""
             try:
@@ -246,18 +255,19 @@ Provide your assessment in JSON format:
   "go_decision": true/false
 }}"""
 
-                response = await self.call_cerebras(prompt, 1000)
+                response = await self.call_cerebras(prompt, 1000, endpoint='evaluate-product')
                 
                 # Parse JSON response
                 try:
-                    evaluation_data = json.loads(response)
+                    evaluation_data = self.parse_llm_json(response, 'evaluate-product')
                 except json.JSONDecodeError:
                     # Try to extract JSON from response
                     import re
                     json_match = re.search(r'\{[\s\S]*\}', response)
                     if json_match:
-                        evaluation_data = json.loads(json_match.group())
+                        evaluation_data = self.parse_llm_json(json_match.group(), 'evaluate-product')
                     else:
+                        self.record_parse_failure('evaluate-product')
                         raise ValueError("Could not parse JSON from response")
                 
                 evaluation = ProductEvaluation(**evaluation_data)
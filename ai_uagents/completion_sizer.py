@@ -0,0 +1,119 @@
+"""
+Adaptive completion sizing for AI Company agents
+Records how long each endpoint's completions actually are and sizes
+max_tokens to a high percentile of that, instead of a fixed worst case,
+while tracking completions that hit the limit and the JSON parse
+failures they cause. Provider-reported token counts and finish reasons
+are used where available, the chars/4 estimate only as a fallback
+"""
+
+from collections import deque
+from typing import Dict, Any, Optional
+from llm_providers import FINISH_LENGTH
+
+class EndpointUsage:
+    """Rolling completion lengths and truncation counts for one endpoint"""
+
+    def __init__(self, window_size: int = 100):
+        self.completions = deque(maxlen=window_size)  # completion tokens
+        self.calls = 0
+        self.truncations = 0
+        self.parse_failures = 0
+        self.truncated_parse_failures = 0
+        self.last_truncated = False
+        self.headroom_boost = 1.0
+
+    def percentile(self, percentile: float) -> Optional[int]:
+        """Completion length at the given percentile (0-100), or None without samples"""
+        if not self.completions:
+            return None
+        ordered = sorted(self.completions)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+class CompletionSizer:
+    """Per-endpoint max_tokens from observed completion lengths
+
+    Once an endpoint has min_samples completions, its limit is the
+    percentile length times headroom, never above what the caller asked
+    for and never below floor. A parse failure right after a truncated
+    completion widens that endpoint's headroom so the limit self-corrects.
+    """
+
+    TRUNCATION_RATIO = 0.98
+    MAX_BOOST = 8.0
+
+    def __init__(self, percentile: float = 95, headroom: float = 1.25,
+                 min_samples: int = 10, floor: int = 256, window_size: int = 100):
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.floor = floor
+        self.window_size = window_size
+        self.endpoints: Dict[str, EndpointUsage] = {}
+
+    def _usage(self, endpoint: str) -> EndpointUsage:
+        """Stats for an endpoint, created on first use"""
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointUsage(self.window_size)
+        return self.endpoints[endpoint]
+
+    def limit(self, endpoint: Optional[str], requested: int) -> int:
+        """max_tokens to send for this endpoint's next call"""
+        if not endpoint:
+            return requested
+        usage = self._usage(endpoint)
+        if len(usage.completions) < self.min_samples:
+            return requested
+        observed = usage.percentile(self.percentile)
+        adaptive = int(observed * self.headroom * usage.headroom_boost)
+        return max(min(self.floor, requested), min(requested, adaptive))
+
+    def is_truncated(self, completion_tokens: int, limit: int, finish_reason: Optional[str] = None) -> bool:
+        """Whether a completion was cut off at the limit: the provider's finish
+        reason when it gave one, else a length within 2% of the limit"""
+        if finish_reason is not None:
+            return finish_reason == FINISH_LENGTH
+        return completion_tokens >= limit * self.TRUNCATION_RATIO
+
+    def record(self, endpoint: Optional[str], completion_tokens: int, limit: int,
+               finish_reason: Optional[str] = None) -> bool:
+        """Record a completion; returns True if it was cut off at the limit"""
+        truncated = self.is_truncated(completion_tokens, limit, finish_reason)
+        if not endpoint:
+            return truncated
+        usage = self._usage(endpoint)
+        usage.calls += 1
+        usage.completions.append(completion_tokens)
+        usage.last_truncated = truncated
+        if truncated:
+            usage.truncations += 1
+        return truncated
+
+    def record_parse_failure(self, endpoint: str) -> bool:
+        """Record that an endpoint's output could not be parsed; returns True if
+        the preceding completion was truncated (and headroom was widened)"""
+        usage = self._usage(endpoint)
+        usage.parse_failures += 1
+        if not usage.last_truncated:
+            return False
+        usage.truncated_parse_failures += 1
+        usage.headroom_boost = min(self.MAX_BOOST, usage.headroom_boost * 2)
+        usage.last_truncated = False
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint sizing statistics"""
+        return {
+            endpoint: {
+                'calls': usage.calls,
+                'samples': len(usage.completions),
+                'p50_completion_tokens': usage.percentile(50),
+                'p95_completion_tokens': usage.percentile(95),
+                'truncations': usage.truncations,
+                'parse_failures': usage.parse_failures,
+                'truncated_parse_failures': usage.truncated_parse_failures,
+                'headroom_boost': round(usage.headroom_boost, 2)
+            }
+            for endpoint, usage in self.endpoints.items()
+        }
@@ -5,7 +5,7 @@ Develops technical architecture and development strategy
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uagents import Context, Model
 from base_uagent import BaseUAgent
 
@@ -14,6 +14,8 @@ class TechnicalRequest(Model):
     idea: Dict[str, str]
     product: Dict[str, Any]
     research: Dict[str, Any]
+    deadline: Optional[float] = None  # absolute time.time() the caller needs a reply by
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class TechnologyStack(Model):
     """Model for technology stack"""
@@ -117,157 +119,16 @@ class CTOuAgent(BaseUAgent):
         """Setup message handlers for the agent"""
         
         @self.agent.on_message(model=TechnicalRequest)
+        @self.traced('message.TechnicalRequest')
         async def handle_technical_request(ctx: Context, sender: str, msg: TechnicalRequest):
             """Develop technical strategy for a product"""
             try:
                 print(f"⚙️ [{self.name}] Developing technical strategy for: {msg.product.get('product_name', 'Unknown')}")
                 
-                prompt = f"""As a Chief Technology Officer, develop a comprehensive technical strategy for this product:
-
-Product Details:
-Name: {msg.product.get('product_name', 'Unknown')}
-Description: {msg.product.get('product_description', 'No description')}
-Features: {json.dumps(msg.product.get('core_features', []))}
-Target Market: {json.dumps(msg.product.get('target_market', {}))}
-
-Research Data:
-Market Size: {msg.research.get('market_analysis', {}).get('market_size', 'Not available')}
-Competitors: {json.dumps(msg.research.get('competitors', []))}
-Key Challenges: {json.dumps(msg.research.get('market_analysis', {}).get('key_challenges', []))}
-
-Create a comprehensive technical strategy including:
-
-1. Technology stack recommendations
-2. System architecture design
-3. Development methodology
-4. Security and compliance requirements
-5. Scalability and performance planning
-6. Integration requirements
-7. Development timeline and milestones
-8. Team structure and hiring needs
-9. Infrastructure requirements
-10. Quality assurance strategy
-
-Format your response as JSON:
-{{
-  "technology_stack": {{
-    "frontend": ["Technology 1", "Technology 2"],
-    "backend": ["Technology 1", "Technology 2"],
-    "database": "Database technology",
-    "cloud_platform": "Cloud provider",
-    "ai_ml": ["AI/ML technology 1", "AI/ML technology 2"]
-  }},
-  "architecture": {{
-    "overview": "High-level system architecture",
-    "components": ["Component 1", "Component 2", "Component 3"],
-    "data_flow": "How data flows through the system",
-    "api_design": "API strategy and design"
-  }},
-  "development_methodology": {{
-    "approach": "Agile/Waterfall/Other",
-    "sprints": "Sprint duration and planning",
-    "tools": ["Tool 1", "Tool 2", "Tool 3"],
-    "version_control": "Git strategy"
-  }},
-  "security_compliance": {{
-    "security_measures": ["Measure 1", "Measure 2"],
-    "compliance_requirements": ["Requirement 1", "Requirement 2"],
-    "data_protection": "Data protection strategy",
-    "authentication": "Authentication approach"
-  }},
-  "scalability": {{
-    "performance_targets": "Performance goals",
-    "scaling_strategy": "How to scale the system",
-    "monitoring": "Monitoring and alerting strategy",
-    "load_balancing": "Load balancing approach"
-  }},
-  "integrations": {{
-    "third_party": ["Integration 1", "Integration 2"],
-    "apis": "API integration strategy",
-    "data_sources": "External data sources"
-  }},
-  "timeline": {{
-    "phases": [
-      {{
-        "phase": "Phase 1",
-        "duration": "Duration",
-        "deliverables": ["Deliverable 1", "Deliverable 2"]
-      }}
-    ],
-    "total_duration": "Total development time",
-    "milestones": ["Milestone 1", "Milestone 2"]
-  }},
-  "team_structure": {{
-    "roles_needed": ["Role 1", "Role 2", "Role 3"],
-    "team_size": "Recommended team size",
-    "hiring_priority": ["Priority 1", "Priority 2"]
-  }},
-  "infrastructure": {{
-    "hosting": "Hosting requirements",
-    "cdn": "CDN strategy",
-    "backup": "Backup and disaster recovery",
-    "monitoring": "Infrastructure monitoring"
-  }},
-  "quality_assurance": {{
-    "testing_strategy": "Testing approach",
-    "automation": "Test automation strategy",
-    "performance_testing": "Performance testing plan",
-    "security_testing": "Security testing approach"
-  }}
-}}"""
-
-                response = await self.call_cerebras(prompt, 3000)
-                
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    strategy_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                    print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
-                    strategy_data = self.get_fallback_strategy_data()
-                
-                # Convert to response models with validation
-                tech_stack_data = strategy_data.get('technology_stack', {})
-                # Ensure database is a string
-                if 'database' in tech_stack_data and not isinstance(tech_stack_data['database'], str):
-                    tech_stack_data['database'] = str(tech_stack_data['database'])
-                technology_stack = TechnologyStack(**tech_stack_data)
-                architecture = Architecture(**strategy_data.get('architecture', {}))
-                development_methodology = DevelopmentMethodology(**strategy_data.get('development_methodology', {}))
-                security_compliance = SecurityCompliance(**strategy_data.get('security_compliance', {}))
-                scalability = Scalability(**strategy_data.get('scalability', {}))
-                integrations = Integrations(**strategy_data.get('integrations', {}))
-                timeline_phases = [TimelinePhase(**phase) for phase in strategy_data.get('timeline', {}).get('phases', [])]
-                timeline = Timeline(
-                    phases=timeline_phases,
-                    total_duration=strategy_data.get('timeline', {}).get('total_duration', ''),
-                    milestones=strategy_data.get('timeline', {}).get('milestones', [])
-                )
-                team_structure = TeamStructure(**strategy_data.get('team_structure', {}))
-                infrastructure = Infrastructure(**strategy_data.get('infrastructure', {}))
-                quality_assurance = QualityAssurance(**strategy_data.get('quality_assurance', {}))
-                
-                technical_response = TechnicalResponse(
-                    technology_stack=technology_stack,
-                    architecture=architecture,
-                    development_methodology=development_methodology,
-                    security_compliance=security_compliance,
-                    scalability=scalability,
-                    integrations=integrations,
-                    timeline=timeline,
-                    team_structure=team_structure,
-                    infrastructure=infrastructure,
-                    quality_assurance=quality_assurance
-                )
+                prompt = self.create_technical_prompt(msg.product, msg.research)
+                response = await self.call_cerebras(prompt, 3000, deadline=msg.deadline, endpoint='develop-technical')
+                technical_response = self.build_technical_response(response)
+                technology_stack = technical_response.technology_stack
                 
                 self.log_activity('Developed technical strategy', {
                     'product_name': msg.product.get('product_name', 'Unknown'),
@@ -286,23 +147,53 @@ Format your response as JSON:
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/develop-technical", TechnicalRequest, TechnicalResponse)
+        @self.traced('develop-technical')
         async def handle_develop_technical_rest(ctx: Context, req: TechnicalRequest) -> TechnicalResponse:
             """REST endpoint for developing technical strategies"""
             try:
                 print(f"⚙️ [{self.name}] REST: Developing technical strategy for: {req.product.get('product_name', 'Unknown')}")
                 
-                prompt = f"""As a Chief Technology Officer, develop a comprehensive technical strategy for this product:
+                prompt = self.create_technical_prompt(req.product, req.research)
+                response = await self.call_cerebras(prompt, 3000, deadline=req.deadline, endpoint='develop-technical')
+                technical_response = self.build_technical_response(response)
+                technology_stack = technical_response.technology_stack
+                
+                self.log_activity('REST: Developed technical strategy', {
+                    'product_name': req.product.get('product_name', 'Unknown'),
+                    'tech_stack_count': len(technology_stack.frontend) + len(technology_stack.backend)
+                })
+                
+                return technical_response
+                
+            except Exception as e:
+                print(f"❌ [{self.name}] REST: Error developing technical strategy: {str(e)}")
+                return self.get_fallback_technical_response()
+        
+        async def stream_develop_technical(payload: Dict[str, Any]):
+            """SSE endpoint: technical strategy token chunks, then the parsed result"""
+            req = TechnicalRequest(**payload)
+            self.logger.info('stream.start', "⚙️ STREAM: Developing technical strategy",
+                             product=req.product.get('product_name', 'Unknown'))
+            prompt = self.create_technical_prompt(req.product, req.research)
+            async for event in self.stream_generation(prompt, 3000, self.build_technical_response, 'develop-technical'):
+                yield event
+        
+        self.http_server.add_stream_route("/develop-technical/stream", stream_develop_technical)
+    
+    def create_technical_prompt(self, product: Dict[str, Any], research: Dict[str, Any]) -> str:
+        """Build the technical strategy prompt"""
+        prompt = f"""As a Chief Technology Officer, develop a comprehensive technical strategy for this product:
 
 Product Details:
-Name: {req.product.get('product_name', 'Unknown')}
-Description: {req.product.get('product_description', 'No description')}
-Features: {json.dumps(req.product.get('core_features', []))}
-Target Market: {json.dumps(req.product.get('target_market', {}))}
+Name: {product.get('product_name', 'Unknown')}
+Description: {product.get('product_description', 'No description')}
+Features: {json.dumps(product.get('core_features', []))}
+Target Market: {json.dumps(product.get('target_market', {}))}
 
 Research Data:
-Market Size: {req.research.get('market_analysis', {}).get('market_size', 'Not available')}
-Competitors: {json.dumps(req.research.get('competitors', []))}
-Key Challenges: {json.dumps(req.research.get('market_analysis', {}).get('key_challenges', []))}
+Market Size: {research.get('market_analysis', {}).get('market_size', 'Not available')}
+Competitors: {json.dumps(research.get('competitors', []))}
+Key Challenges: {json.dumps(research.get('market_analysis', {}).get('key_challenges', []))}
 
 Create a comprehensive technical strategy including:
 
@@ -384,70 +275,62 @@ Format your response as JSON:
     "security_testing": "Security testing approach"
   }}
 }}"""
-
-                response = await self.call_cerebras(prompt, 3000)
-                
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    strategy_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                    print(f"❌ [{self.name}] REST: JSON parsing failed, using fallback data")
-                    strategy_data = self.get_fallback_strategy_data()
-                
-                # Convert to response models with validation
-                tech_stack_data = strategy_data.get('technology_stack', {})
-                # Ensure database is a string
-                if 'database' in tech_stack_data and not isinstance(tech_stack_data['database'], str):
-                    tech_stack_data['database'] = str(tech_stack_data['database'])
-                technology_stack = TechnologyStack(**tech_stack_data)
-                architecture = Architecture(**strategy_data.get('architecture', {}))
-                development_methodology = DevelopmentMethodology(**strategy_data.get('development_methodology', {}))
-                security_compliance = SecurityCompliance(**strategy_data.get('security_compliance', {}))
-                scalability = Scalability(**strategy_data.get('scalability', {}))
-                integrations = Integrations(**strategy_data.get('integrations', {}))
-                timeline_phases = [TimelinePhase(**phase) for phase in strategy_data.get('timeline', {}).get('phases', [])]
-                timeline = Timeline(
-                    phases=timeline_phases,
-                    total_duration=strategy_data.get('timeline', {}).get('total_duration', ''),
-                    milestones=strategy_data.get('timeline', {}).get('milestones', [])
-                )
-                team_structure = TeamStructure(**strategy_data.get('team_structure', {}))
-                infrastructure = Infrastructure(**strategy_data.get('infrastructure', {}))
-                quality_assurance = QualityAssurance(**strategy_data.get('quality_assurance', {}))
-                
-                technical_response = TechnicalResponse(
-                    technology_stack=technology_stack,
-                    architecture=architecture,
-                    development_methodology=development_methodology,
-                    security_compliance=security_compliance,
-                    scalability=scalability,
-                    integrations=integrations,
-                    timeline=timeline,
-                    team_structure=team_structure,
-                    infrastructure=infrastructure,
-                    quality_assurance=quality_assurance
-                )
-                
-                self.log_activity('REST: Developed technical strategy', {
-                    'product_name': req.product.get('product_name', 'Unknown'),
-                    'tech_stack_count': len(technology_stack.frontend) + len(technology_stack.backend)
-                })
-                
-                return technical_response
-                
-            except Exception as e:
-                print(f"❌ [{self.name}] REST: Error developing technical strategy: {str(e)}")
-                return self.get_fallback_technical_response()
+        
+        return prompt
+    
+    def build_technical_response(self, response: str) -> TechnicalResponse:
+        """Parse an LLM response into a TechnicalResponse, using fallback data if unparseable"""
+        # Clean the response to handle JSON parsing issues
+        cleaned_response = response
+        cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
+        cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+        
+        # Try to extract JSON from the response if it's wrapped in markdown
+        json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
+        if json_match:
+            cleaned_response = json_match.group(0)
+        
+        # Parse JSON response
+        try:
+            strategy_data = self.parse_llm_json(cleaned_response, 'develop-technical')
+        except json.JSONDecodeError:
+            print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
+            self.record_parse_failure('develop-technical')
+            strategy_data = self.get_fallback_strategy_data()
+        
+        # Convert to response models with validation
+        tech_stack_data = strategy_data.get('technology_stack', {})
+        # Ensure database is a string
+        if 'database' in tech_stack_data and not isinstance(tech_stack_data['database'], str):
+            tech_stack_data['database'] = str(tech_stack_data['database'])
+        technology_stack = TechnologyStack(**tech_stack_data)
+        architecture = Architecture(**strategy_data.get('architecture', {}))
+        development_methodology = DevelopmentMethodology(**strategy_data.get('development_methodology', {}))
+        security_compliance = SecurityCompliance(**strategy_data.get('security_compliance', {}))
+        scalability = Scalability(**strategy_data.get('scalability', {}))
+        integrations = Integrations(**strategy_data.get('integrations', {}))
+        timeline_phases = [TimelinePhase(**phase) for phase in strategy_data.get('timeline', {}).get('phases', [])]
+        timeline = Timeline(
+            phases=timeline_phases,
+            total_duration=strategy_data.get('timeline', {}).get('total_duration', ''),
+            milestones=strategy_data.get('timeline', {}).get('milestones', [])
+        )
+        team_structure = TeamStructure(**strategy_data.get('team_structure', {}))
+        infrastructure = Infrastructure(**strategy_data.get('infrastructure', {}))
+        quality_assurance = QualityAssurance(**strategy_data.get('quality_assurance', {}))
+        
+        return TechnicalResponse(
+            technology_stack=technology_stack,
+            architecture=architecture,
+            development_methodology=development_methodology,
+            security_compliance=security_compliance,
+            scalability=scalability,
+            integrations=integrations,
+            timeline=timeline,
+            team_structure=team_structure,
+            infrastructure=infrastructure,
+            quality_assurance=quality_assurance
+        )
     
     def get_fallback_strategy_data(self) -> Dict[str, Any]:
         """Get fallback strategy data when API fails"""
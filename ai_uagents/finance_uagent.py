@@ -5,14 +5,17 @@ Handles financial analysis and revenue distribution
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uagents import Context, Model
 from base_uagent import BaseUAgent
+from prompt_compactor import compact_json
 
 class RevenueAnalysisRequest(Model):
     """Model for revenue analysis request"""
     idea_data: Dict[str, Any]
     product_data: Dict[str, Any] = None
+    deadline: Optional[float] = None  # absolute time.time() the caller needs a reply by
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class RevenueProjection(Model):
     """Model for revenue projection"""
@@ -35,6 +38,7 @@ class FinancialReportRequest(Model):
     revenue_data: Dict[str, Any] = None
     token_holder_data: Dict[str, Any] = None
     contract_info: Dict[str, Any] = None
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class FinancialReportResponse(Model):
     """Model for financial report response"""
@@ -48,7 +52,8 @@ class FinanceuAgent(BaseUAgent):
         super().__init__(
             name="Finance Agent",
             role="Financial analysis and revenue distribution",
-            port=8007
+            port=8007,
+            input_token_budget=2000
         )
         self.setup_handlers()
     
@@ -56,6 +61,7 @@ class FinanceuAgent(BaseUAgent):
         """Setup message handlers for the agent"""
         
         @self.agent.on_message(model=RevenueAnalysisRequest)
+        @self.traced('message.RevenueAnalysisRequest')
         async def handle_revenue_analysis(ctx: Context, sender: str, msg: RevenueAnalysisRequest):
             """Analyze revenue potential for a project"""
             try:
@@ -63,8 +69,8 @@ class FinanceuAgent(BaseUAgent):
                 
                 prompt = f"""As the Finance Agent for an AI company, analyze the revenue potential for this project:
         
-IDEA: {json.dumps(msg.idea_data, indent=2)}
-{json.dumps(msg.product_data, indent=2) if msg.product_data else ''}
+IDEA: {compact_json(msg.idea_data)}
+{compact_json(msg.product_data) if msg.product_data else ''}
 
 Please provide:
 1. Estimated revenue range (minimum, maximum, most likely)
@@ -88,7 +94,7 @@ Format your response as JSON with these fields:
   "confidence_level": "high/medium/low"
 }}"""
 
-                response = await self.call_cerebras(prompt, 2000)
+                response = await self.call_cerebras(prompt, 2000, deadline=msg.deadline, endpoint='analyze-revenue')
                 
                 # Clean the response to handle JSON parsing issues
                 cleaned_response = response
@@ -102,9 +108,10 @@ Format your response as JSON with these fields:
                 
                 # Parse JSON response
                 try:
-                    analysis_data = json.loads(cleaned_response)
+                    analysis_data = self.parse_llm_json(cleaned_response, 'analyze-revenue')
                 except json.JSONDecodeError:
                     print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
+                    self.record_parse_failure('analyze-revenue')
                     analysis_data = self.get_fallback_analysis_data()
                 
                 # Convert to response models
@@ -136,6 +143,7 @@ Format your response as JSON with these fields:
                 await ctx.send(sender, fallback_response)
         
         @self.agent.on_message(model=FinancialReportRequest)
+        @self.traced('message.FinancialReportRequest')
         async def handle_financial_report(ctx: Context, sender: str, msg: FinancialReportRequest):
             """Generate financial report"""
             try:
@@ -143,9 +151,9 @@ Format your response as JSON with these fields:
                 
                 prompt = f"""As the Finance Agent, create a comprehensive financial report based on this data:
         
-REVENUE HISTORY: {json.dumps(msg.revenue_data or {}, indent=2)}
-TOKEN HOLDERS: {json.dumps(msg.token_holder_data or {}, indent=2)}
-CONTRACT INFO: {json.dumps(msg.contract_info or {}, indent=2)}
+REVENUE HISTORY: {compact_json(msg.revenue_data or {})}
+TOKEN HOLDERS: {compact_json(msg.token_holder_data or {})}
+CONTRACT INFO: {compact_json(msg.contract_info or {})}
 
 Generate a professional financial report including:
 1. Total revenue generated
@@ -156,7 +164,7 @@ Generate a professional financial report including:
 
 Format as a markdown report."""
 
-                response = await self.call_cerebras(prompt, 3000)
+                response = await self.call_cerebras(prompt, 3000, endpoint='generate-report')
                 
                 # Create summary from the data
                 summary = {
@@ -193,6 +201,7 @@ Format as a markdown report."""
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/analyze-revenue", RevenueAnalysisRequest, RevenueAnalysisResponse)
+        @self.traced('analyze-revenue')
         async def handle_analyze_revenue_rest(ctx: Context, req: RevenueAnalysisRequest) -> RevenueAnalysisResponse:
             """REST endpoint for revenue analysis"""
             try:
@@ -200,8 +209,8 @@ Format as a markdown report."""
                 
                 prompt = f"""As the Finance Agent for an AI company, analyze the revenue potential for this project:
         
-IDEA: {json.dumps(req.idea_data, indent=2)}
-{json.dumps(req.product_data, indent=2) if req.product_data else ''}
+IDEA: {compact_json(req.idea_data)}
+{compact_json(req.product_data) if req.product_data else ''}
 
 Please provide:
 1. Estimated revenue range (minimum, maximum, most likely)
@@ -225,7 +234,7 @@ Format your response as JSON with these fields:
   "confidence_level": "high/medium/low"
 }}"""
 
-                response = await self.call_cerebras(prompt, 2000)
+                response = await self.call_cerebras(prompt, 2000, deadline=req.deadline, endpoint='analyze-revenue')
                 
                 # Clean the response to handle JSON parsing issues
                 cleaned_response = response
@@ -239,9 +248,10 @@ Format your response as JSON with these fields:
                 
                 # Parse JSON response
                 try:
-                    analysis_data = json.loads(cleaned_response)
+                    analysis_data = self.parse_llm_json(cleaned_response, 'analyze-revenue')
                 except json.JSONDecodeError:
                     print(f"❌ [{self.name}] REST: JSON parsing failed, using fallback data")
+                    self.record_parse_failure('analyze-revenue')
                     analysis_data = self.get_fallback_analysis_data()
                 
                 # Convert to response models
@@ -269,6 +279,7 @@ Format your response as JSON with these fields:
                 return self.get_fallback_analysis_response()
         
         @self.agent.on_rest_post("/generate-report", FinancialReportRequest, FinancialReportResponse)
+        @self.traced('generate-report')
         async def handle_generate_report_rest(ctx: Context, req: FinancialReportRequest) -> FinancialReportResponse:
             """REST endpoint for financial report generation"""
             try:
@@ -276,9 +287,9 @@ Format your response as JSON with these fields:
                 
                 prompt = f"""As the Finance Agent, create a comprehensive financial report based on this data:
         
-REVENUE HISTORY: {json.dumps(req.revenue_data or {}, indent=2)}
-TOKEN HOLDERS: {json.dumps(req.token_holder_data or {}, indent=2)}
-CONTRACT INFO: {json.dumps(req.contract_info or {}, indent=2)}
+REVENUE HISTORY: {compact_json(req.revenue_data or {})}
+TOKEN HOLDERS: {compact_json(req.token_holder_data or {})}
+CONTRACT INFO: {compact_json(req.contract_info or {})}
 
 Generate a professional financial report including:
 1. Total revenue generated
@@ -289,7 +300,7 @@ Generate a professional financial report including:
 
 Format as a markdown report."""
 
-                response = await self.call_cerebras(prompt, 3000)
+                response = await self.call_cerebras(prompt, 3000, endpoint='generate-report')
                 
                 # Create summary from the data
                 summary = {
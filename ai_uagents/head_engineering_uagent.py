@@ -5,9 +5,11 @@ Creates technical implementation and website development strategy
 
 import json
 import re
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Optional
 from uagents import Context, Model
 from base_uagent import BaseUAgent
+from prompt_compactor import compact_json
 
 class BoltPromptRequest(Model):
     """Model for Bolt prompt request"""
@@ -16,6 +18,8 @@ class BoltPromptRequest(Model):
     research: Dict[str, Any]
     marketing_strategy: Dict[str, Any]
     technical_strategy: Dict[str, Any]
+    deadline: Optional[float] = None  # absolute time.time() the caller needs a reply by
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class DesignSpecifications(Model):
     """Model for design specifications"""
@@ -58,7 +62,8 @@ class HeadOfEngineeringuAgent(BaseUAgent):
         super().__init__(
             name="Head of Engineering Agent",
             role="Technical implementation and website development strategy",
-            port=8006
+            port=8006,
+            input_token_budget=3000
         )
         self.setup_handlers()
     
@@ -66,123 +71,16 @@ class HeadOfEngineeringuAgent(BaseUAgent):
         """Setup message handlers for the agent"""
         
         @self.agent.on_message(model=BoltPromptRequest)
+        @self.traced('message.BoltPromptRequest')
         async def handle_bolt_prompt_request(ctx: Context, sender: str, msg: BoltPromptRequest):
             """Create Bolt prompt for website development"""
             try:
                 print(f"🔧 [{self.name}] Creating Bolt prompt for: {msg.product.get('product_name', 'Unknown')}")
                 
-                prompt = f"""As a Head of Engineering, create a comprehensive Bolt prompt for building a website based on the following project:
-
-Product Idea:
-Title: {msg.idea.get('title', 'Unknown')}
-Description: {msg.idea.get('description', 'No description')}
-
-Product Concept:
-Name: {msg.product.get('product_name', 'Unknown')}
-Description: {msg.product.get('product_description', 'No description')}
-Core Features: {json.dumps(msg.product.get('core_features', []))}
-Target Market: {json.dumps(msg.product.get('target_market', {}))}
-Value Proposition: {msg.product.get('value_proposition', 'Not specified')}
-Revenue Model: {msg.product.get('revenue_model', 'Not specified')}
-
-Market Research Summary:
-Market Size: {msg.research.get('market_analysis', {}).get('market_size', 'N/A')}
-Growth Potential: {msg.research.get('market_analysis', {}).get('growth_potential', 'N/A')}
-Competitors: {json.dumps(msg.research.get('competitors', []))}
-Target Audience: {msg.research.get('recommendations', {}).get('target_audience', 'N/A')}
-
-Marketing Strategy:
-Brand Positioning: {msg.marketing_strategy.get('brand_positioning', 'N/A')}
-Key Messages: {json.dumps(msg.marketing_strategy.get('key_messages', []))}
-Target Segments: {json.dumps(msg.marketing_strategy.get('target_segments', []))}
-Marketing Channels: {json.dumps(msg.marketing_strategy.get('marketing_channels', []))}
-
-Technical Strategy:
-Technology Stack: {json.dumps(msg.technical_strategy.get('technology_stack', {}))}
-Architecture: {msg.technical_strategy.get('architecture', {}).get('overview', 'N/A')}
-Development Timeline: {json.dumps(msg.technical_strategy.get('timeline', {}))}
-
-Create a detailed Bolt prompt that includes:
-1. Website structure and pages needed
-2. Design requirements and UI/UX specifications
-3. Functional requirements and features
-4. Content strategy and messaging
-5. Technical specifications
-6. Integration requirements
-7. Performance and scalability needs
-8. SEO and marketing considerations
-
-Format your response as JSON:
-{{
-  "website_title": "Website Title",
-  "website_description": "Brief description of the website",
-  "pages_required": ["Page 1", "Page 2", "Page 3"],
-  "design_specifications": {{
-    "color_scheme": "Primary and secondary colors",
-    "typography": "Font specifications",
-    "layout_style": "Layout approach",
-    "responsive_design": "Mobile-first requirements"
-  }},
-  "functional_requirements": [
-    "Feature 1",
-    "Feature 2",
-    "Feature 3"
-  ],
-  "content_strategy": {{
-    "homepage_content": "Homepage content requirements",
-    "about_page": "About page content",
-    "features_page": "Features page content",
-    "pricing_page": "Pricing page content",
-    "contact_page": "Contact page content"
-  }},
-  "technical_specifications": {{
-    "performance_requirements": "Performance targets",
-    "seo_requirements": "SEO specifications",
-    "analytics_setup": "Analytics requirements",
-    "security_requirements": "Security measures"
-  }},
-  "integration_requirements": [
-    "Integration 1",
-    "Integration 2"
-  ],
-  "bolt_prompt": "Complete Bolt prompt for website generation"
-}}"""
-
-                response = await self.call_cerebras(prompt, 4000)
-                
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    bolt_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                    print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
-                    bolt_data = self.get_fallback_bolt_data(msg.product)
-                
-                # Convert to response models
-                design_specifications = DesignSpecifications(**bolt_data.get('design_specifications', {}))
-                content_strategy = ContentStrategy(**bolt_data.get('content_strategy', {}))
-                technical_specifications = TechnicalSpecifications(**bolt_data.get('technical_specifications', {}))
-                
-                bolt_response = BoltPromptResponse(
-                    website_title=bolt_data.get('website_title', f"{msg.product.get('product_name', 'Product')} Website"),
-                    website_description=bolt_data.get('website_description', msg.product.get('product_description', 'Website description')),
-                    pages_required=bolt_data.get('pages_required', []),
-                    design_specifications=design_specifications,
-                    functional_requirements=bolt_data.get('functional_requirements', []),
-                    content_strategy=content_strategy,
-                    technical_specifications=technical_specifications,
-                    integration_requirements=bolt_data.get('integration_requirements', []),
-                    bolt_prompt=bolt_data.get('bolt_prompt', '')
-                )
+                prompt = self.create_bolt_prompt(msg.idea, msg.product, msg.research,
+                                                 msg.marketing_strategy, msg.technical_strategy)
+                response = await self.call_cerebras(prompt, 4000, hedge=True, deadline=msg.deadline, endpoint='create-bolt-prompt')
+                bolt_response = self.build_bolt_response(response, msg.product)
                 
                 self.log_activity('Created Bolt prompt for website development', {
                     'product_name': msg.product.get('product_name', 'Unknown'),
@@ -202,41 +100,78 @@ Format your response as JSON:
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/create-bolt-prompt", BoltPromptRequest, BoltPromptResponse)
+        @self.traced('create-bolt-prompt')
         async def handle_create_bolt_prompt_rest(ctx: Context, req: BoltPromptRequest) -> BoltPromptResponse:
             """REST endpoint for creating Bolt prompts"""
             try:
                 print(f"🔧 [{self.name}] REST: Creating Bolt prompt for: {req.product.get('product_name', 'Unknown')}")
                 
-                prompt = f"""As a Head of Engineering, create a comprehensive Bolt prompt for building a website based on the following project:
+                prompt = self.create_bolt_prompt(req.idea, req.product, req.research,
+                                                 req.marketing_strategy, req.technical_strategy)
+                response = await self.call_cerebras(prompt, 4000, hedge=True, deadline=req.deadline, endpoint='create-bolt-prompt')
+                bolt_response = self.build_bolt_response(response, req.product)
+                
+                self.log_activity('REST: Created Bolt prompt for website development', {
+                    'product_name': req.product.get('product_name', 'Unknown'),
+                    'pages_count': len(bolt_response.pages_required),
+                    'features_count': len(bolt_response.functional_requirements)
+                })
+                
+                return bolt_response
+                
+            except Exception as e:
+                print(f"❌ [{self.name}] REST: Error creating Bolt prompt: {str(e)}")
+                return self.get_fallback_bolt_response(req.product)
+        
+        async def stream_create_bolt_prompt(payload: Dict[str, Any]):
+            """SSE endpoint: Bolt prompt token chunks, then the parsed result"""
+            req = BoltPromptRequest(**payload)
+            self.logger.info('stream.start', "🔧 STREAM: Creating Bolt prompt",
+                             product=req.product.get('product_name', 'Unknown'))
+            prompt = self.create_bolt_prompt(req.idea, req.product, req.research,
+                                             req.marketing_strategy, req.technical_strategy)
+            async for event in self.stream_generation(
+                prompt, 4000, lambda response: self.build_bolt_response(response, req.product), 'create-bolt-prompt'
+            ):
+                yield event
+        
+        self.http_server.add_stream_route("/create-bolt-prompt/stream", stream_create_bolt_prompt)
+    
+    def create_bolt_prompt(self, idea: Dict[str, str], product: Dict[str, Any], research: Dict[str, Any],
+                           marketing_strategy: Dict[str, Any], technical_strategy: Dict[str, Any]) -> str:
+        """Build the Bolt website prompt"""
+        # Upstream outputs are embedded minified, with long lists and strings capped
+        brief = partial(compact_json, max_items=6, max_string=400)
+        prompt = f"""As a Head of Engineering, create a comprehensive Bolt prompt for building a website based on the following project:
 
 Product Idea:
-Title: {req.idea.get('title', 'Unknown')}
-Description: {req.idea.get('description', 'No description')}
+Title: {idea.get('title', 'Unknown')}
+Description: {idea.get('description', 'No description')}
 
 Product Concept:
-Name: {req.product.get('product_name', 'Unknown')}
-Description: {req.product.get('product_description', 'No description')}
-Core Features: {json.dumps(req.product.get('core_features', []))}
-Target Market: {json.dumps(req.product.get('target_market', {}))}
-Value Proposition: {req.product.get('value_proposition', 'Not specified')}
-Revenue Model: {req.product.get('revenue_model', 'Not specified')}
+Name: {product.get('product_name', 'Unknown')}
+Description: {product.get('product_description', 'No description')}
+Core Features: {brief(product.get('core_features', []))}
+Target Market: {brief(product.get('target_market', {}))}
+Value Proposition: {product.get('value_proposition', 'Not specified')}
+Revenue Model: {product.get('revenue_model', 'Not specified')}
 
 Market Research Summary:
-Market Size: {req.research.get('market_analysis', {}).get('market_size', 'N/A')}
-Growth Potential: {req.research.get('market_analysis', {}).get('growth_potential', 'N/A')}
-Competitors: {json.dumps(req.research.get('competitors', []))}
-Target Audience: {req.research.get('recommendations', {}).get('target_audience', 'N/A')}
+Market Size: {research.get('market_analysis', {}).get('market_size', 'N/A')}
+Growth Potential: {research.get('market_analysis', {}).get('growth_potential', 'N/A')}
+Competitors: {brief(research.get('competitors', []))}
+Target Audience: {research.get('recommendations', {}).get('target_audience', 'N/A')}
 
 Marketing Strategy:
-Brand Positioning: {req.marketing_strategy.get('brand_positioning', 'N/A')}
-Key Messages: {json.dumps(req.marketing_strategy.get('key_messages', []))}
-Target Segments: {json.dumps(req.marketing_strategy.get('target_segments', []))}
-Marketing Channels: {json.dumps(req.marketing_strategy.get('marketing_channels', []))}
+Brand Positioning: {marketing_strategy.get('brand_positioning', 'N/A')}
+Key Messages: {brief(marketing_strategy.get('key_messages', []))}
+Target Segments: {brief(marketing_strategy.get('target_segments', []))}
+Marketing Channels: {brief(marketing_strategy.get('marketing_channels', []))}
 
 Technical Strategy:
-Technology Stack: {json.dumps(req.technical_strategy.get('technology_stack', {}))}
-Architecture: {req.technical_strategy.get('architecture', {}).get('overview', 'N/A')}
-Development Timeline: {json.dumps(req.technical_strategy.get('timeline', {}))}
+Technology Stack: {brief(technical_strategy.get('technology_stack', {}))}
+Architecture: {technical_strategy.get('architecture', {}).get('overview', 'N/A')}
+Development Timeline: {brief(technical_strategy.get('timeline', {}))}
 
 Create a detailed Bolt prompt that includes:
 1. Website structure and pages needed
@@ -283,54 +218,45 @@ Format your response as JSON:
   ],
   "bolt_prompt": "Complete Bolt prompt for website generation"
 }}"""
-
-                response = await self.call_cerebras(prompt, 4000)
-                
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    bolt_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                    print(f"❌ [{self.name}] REST: JSON parsing failed, using fallback data")
-                    bolt_data = self.get_fallback_bolt_data(req.product)
-                
-                # Convert to response models
-                design_specifications = DesignSpecifications(**bolt_data.get('design_specifications', {}))
-                content_strategy = ContentStrategy(**bolt_data.get('content_strategy', {}))
-                technical_specifications = TechnicalSpecifications(**bolt_data.get('technical_specifications', {}))
-                
-                bolt_response = BoltPromptResponse(
-                    website_title=bolt_data.get('website_title', f"{req.product.get('product_name', 'Product')} Website"),
-                    website_description=bolt_data.get('website_description', req.product.get('product_description', 'Website description')),
-                    pages_required=bolt_data.get('pages_required', []),
-                    design_specifications=design_specifications,
-                    functional_requirements=bolt_data.get('functional_requirements', []),
-                    content_strategy=content_strategy,
-                    technical_specifications=technical_specifications,
-                    integration_requirements=bolt_data.get('integration_requirements', []),
-                    bolt_prompt=bolt_data.get('bolt_prompt', '')
-                )
-                
-                self.log_activity('REST: Created Bolt prompt for website development', {
-                    'product_name': req.product.get('product_name', 'Unknown'),
-                    'pages_count': len(bolt_response.pages_required),
-                    'features_count': len(bolt_response.functional_requirements)
-                })
-                
-                return bolt_response
-                
-            except Exception as e:
-                print(f"❌ [{self.name}] REST: Error creating Bolt prompt: {str(e)}")
-                return self.get_fallback_bolt_response(req.product)
+        
+        return prompt
+    
+    def build_bolt_response(self, response: str, product: Dict[str, Any]) -> BoltPromptResponse:
+        """Parse an LLM response into a BoltPromptResponse, using fallback data if unparseable"""
+        # Clean the response to handle JSON parsing issues
+        cleaned_response = response
+        cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
+        cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+        
+        # Try to extract JSON from the response if it's wrapped in markdown
+        json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
+        if json_match:
+            cleaned_response = json_match.group(0)
+        
+        # Parse JSON response
+        try:
+            bolt_data = self.parse_llm_json(cleaned_response, 'create-bolt-prompt')
+        except json.JSONDecodeError:
+            print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
+            self.record_parse_failure('create-bolt-prompt')
+            bolt_data = self.get_fallback_bolt_data(product)
+        
+        # Convert to response models
+        design_specifications = DesignSpecifications(**bolt_data.get('design_specifications', {}))
+        content_strategy = ContentStrategy(**bolt_data.get('content_strategy', {}))
+        technical_specifications = TechnicalSpecifications(**bolt_data.get('technical_specifications', {}))
+        
+        return BoltPromptResponse(
+            website_title=bolt_data.get('website_title', f"{product.get('product_name', 'Product')} Website"),
+            website_description=bolt_data.get('website_description', product.get('product_description', 'Website description')),
+            pages_required=bolt_data.get('pages_required', []),
+            design_specifications=design_specifications,
+            functional_requirements=bolt_data.get('functional_requirements', []),
+            content_strategy=content_strategy,
+            technical_specifications=technical_specifications,
+            integration_requirements=bolt_data.get('integration_requirements', []),
+            bolt_prompt=bolt_data.get('bolt_prompt', '')
+        )
     
     def get_fallback_bolt_data(self, product: Dict[str, Any]) -> Dict[str, Any]:
         """Get fallback Bolt data when API fails"""
@@ -0,0 +1,256 @@
+"""
+Inference Fallback Manager for AI Company agents
+Tracks rolling per-provider latency/error statistics and routes LLM calls
+through the Cerebras -> Meta Llama -> ASI:One chain, with a circuit
+breaker per provider so failing providers are skipped without paying
+their timeout on every request
+"""
+
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+class ProviderStats:
+    """Rolling window of call outcomes for a single provider"""
+
+    def __init__(self, name: str, window_size: int = 50):
+        self.name = name
+        self.window = deque(maxlen=window_size)  # (timestamp, latency_seconds, success; None if censored)
+        self.total_calls = 0
+        self.censored = 0
+        self.total_failures = 0
+        self.consecutive_failures = 0
+        self.last_failure_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def record(self, latency: float, success: bool, error: Optional[str] = None):
+        """Record the outcome of one call"""
+        now = time.time()
+        self.window.append((now, latency, success))
+        self.total_calls += 1
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self.last_failure_at = now
+            self.last_error = error
+
+    def record_censored(self, latency: float):
+        """Record a call cancelled after latency seconds (e.g. it lost a hedge race);
+        its true latency is at least that, so it still counts towards percentiles"""
+        self.window.append((time.time(), latency, None))
+        self.censored += 1
+
+    @property
+    def sample_count(self) -> int:
+        """Number of completed (not censored) calls in the rolling window"""
+        return sum(1 for _, _, ok in self.window if ok is not None)
+
+    def error_rate(self) -> float:
+        """Fraction of failed calls among the window's completed calls"""
+        outcomes = [ok for _, _, ok in self.window if ok is not None]
+        if not outcomes:
+            return 0.0
+        return sum(1 for ok in outcomes if not ok) / len(outcomes)
+
+    def latency_percentile(self, percentile: float, successful_only: bool = True) -> Optional[float]:
+        """Latency at the given percentile (0-100), or None without samples
+
+        Censored samples count as their lower bound alongside successes, so
+        slow calls that were cancelled still pull the tail up.
+        """
+        latencies = sorted(lat for _, lat, ok in self.window if ok is not False or not successful_only)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(percentile / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def health_score(self) -> float:
+        """Health in [0, 1]: success rate, discounted by consecutive failures"""
+        if not self.window:
+            return 1.0
+        return (1.0 - self.error_rate()) / (1 + self.consecutive_failures)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of this provider's statistics"""
+        return {
+            'samples': self.sample_count,
+            'total_calls': self.total_calls,
+            'total_failures': self.total_failures,
+            'censored': self.censored,
+            'consecutive_failures': self.consecutive_failures,
+            'error_rate': round(self.error_rate(), 3),
+            'health_score': round(self.health_score(), 3),
+            'p50_latency': self.latency_percentile(50),
+            'p95_latency': self.latency_percentile(95),
+            'last_error': self.last_error
+        }
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one provider
+
+    While open, requests are rejected immediately. After reset_timeout
+    the breaker goes half-open and admits a limited number of probe
+    requests: a successful probe closes it, a failed one re-opens it.
+    """
+
+    def __init__(self, name: str, reset_timeout: float = 30, half_open_max_calls: int = 1):
+        self.name = name
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.half_open_in_flight = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def current_state(self) -> str:
+        """State after applying the open -> half-open timeout"""
+        if self.state == OPEN and time.time() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.half_open_in_flight = 0
+        return self.state
+
+    def allow_request(self) -> bool:
+        """Claim permission to call the provider; claims a probe slot when half-open"""
+        state = self.current_state()
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self.half_open_in_flight < self.half_open_max_calls:
+            self.half_open_in_flight += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """Give back a probe slot for a request that never completed"""
+        if self.state == HALF_OPEN and self.half_open_in_flight > 0:
+            self.half_open_in_flight -= 1
+
+    def record_success(self):
+        """A successful call (including a probe) closes the breaker"""
+        self.state = CLOSED
+        self.half_open_in_flight = 0
+
+    def record_failure(self, should_trip: bool):
+        """A failed probe re-opens the breaker; a closed breaker opens if should_trip"""
+        if self.state == HALF_OPEN or (self.state == CLOSED and should_trip):
+            self.trip()
+
+    def trip(self):
+        """Open the breaker"""
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.half_open_in_flight = 0
+        self.times_opened += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of breaker state"""
+        return {
+            'state': self.current_state(),
+            'times_opened': self.times_opened,
+            'rejected': self.rejected
+        }
+
+class InferenceFallbackManager:
+    """Adaptive router over an ordered list of LLM providers"""
+
+    def __init__(self, providers: List[str], window_size: int = 50,
+                 min_health: float = 0.3, failure_threshold: int = 3,
+                 min_samples: int = 5, reset_timeout: float = 30):
+        self.providers = list(providers)
+        self.min_health = min_health
+        self.failure_threshold = failure_threshold
+        self.min_samples = min_samples
+        self.stats: Dict[str, ProviderStats] = {
+            name: ProviderStats(name, window_size) for name in self.providers
+        }
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(name, reset_timeout) for name in self.providers
+        }
+        self.skipped: Dict[str, int] = {name: 0 for name in self.providers}
+        self.hedges_fired: Dict[str, int] = {name: 0 for name in self.providers}
+        self.hedges_won: Dict[str, int] = {name: 0 for name in self.providers}
+
+    def is_available(self, provider: str) -> bool:
+        """A provider is routable unless its breaker is open"""
+        return self.breakers[provider].current_state() != OPEN
+
+    def route(self, start: Optional[str] = None) -> List[str]:
+        """Providers to try in order, starting at `start`, skipping open breakers
+
+        Returns an empty list when every candidate's breaker is open, so
+        the caller fails fast instead of waiting on known-bad providers.
+        """
+        chain = self.providers[self.providers.index(start):] if start else list(self.providers)
+        routed = []
+        for name in chain:
+            if self.is_available(name):
+                routed.append(name)
+            else:
+                self.skipped[name] += 1
+        return routed
+
+    def acquire(self, provider: str) -> bool:
+        """Check the breaker immediately before calling a provider"""
+        return self.breakers[provider].allow_request()
+
+    def release(self, provider: str):
+        """Release an acquired call that was cancelled before completing"""
+        self.breakers[provider].release()
+
+    def record_success(self, provider: str, latency: float):
+        """Record a successful call"""
+        self.stats[provider].record(latency, True)
+        self.breakers[provider].record_success()
+
+    def record_cancelled(self, provider: str, latency: float):
+        """Record a call that lost a hedge race and was abandoned after latency seconds"""
+        self.stats[provider].record_censored(latency)
+
+    def record_failure(self, provider: str, latency: float, error: Exception):
+        """Record a failed call, tripping the breaker on repeated or widespread failure"""
+        stats = self.stats[provider]
+        stats.record(latency, False, str(error))
+        should_trip = (
+            stats.consecutive_failures >= self.failure_threshold
+            or (stats.sample_count >= self.min_samples and stats.health_score() < self.min_health)
+        )
+        self.breakers[provider].record_failure(should_trip)
+
+    def hedge_delay(self, provider: str, percentile: float) -> Optional[float]:
+        """Deadline before hedging a provider's call, from its latency distribution
+
+        None until the provider has min_samples successful calls recorded.
+        """
+        stats = self.stats[provider]
+        successes = sum(1 for _, _, ok in stats.window if ok)
+        if successes < self.min_samples:
+            return None
+        return stats.latency_percentile(percentile)
+
+    def record_hedge(self, provider: str):
+        """Record that a provider's call exceeded its hedge deadline"""
+        self.hedges_fired[provider] += 1
+
+    def record_hedge_win(self, provider: str):
+        """Record that the hedge beat the provider's original call"""
+        self.hedges_won[provider] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-provider routing statistics"""
+        return {
+            name: dict(
+                self.stats[name].get_stats(),
+                circuit=self.breakers[name].get_stats(),
+                skipped=self.skipped[name],
+                hedges_fired=self.hedges_fired[name],
+                hedges_won=self.hedges_won[name]
+            )
+            for name in self.providers
+        }
@@ -0,0 +1,189 @@
+"""
+Record/replay of LLM traffic for AI Company agents
+In record mode every provider call (prompt, response or error, provider,
+model and latency) is appended to a per-agent gzipped JSONL cassette. In
+replay mode the cassette serves those responses back, at the recorded
+latency scaled by LLM_REPLAY_SPEED, so full-workflow benchmarks are
+reproducible without network access
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import asyncio
+import hashlib
+from collections import defaultdict
+from typing import Dict, Any, List
+from llm_providers import LLMProvider, Completion
+from worker_pool import WorkerPoolFull
+
+RECORD_MODE = 'record'
+REPLAY_MODE = 'replay'
+
+class CassetteMiss(Exception):
+    """No recorded response for a prompt"""
+    pass
+
+class ReplayedProviderError(Exception):
+    """A provider failure reproduced from the cassette"""
+    pass
+
+def cassette_path(directory: str, agent_name: str) -> str:
+    """Per-agent cassette file, so agent processes never write the same file"""
+    slug = re.sub(r'[^a-z0-9]+', '-', agent_name.lower()).strip('-')
+    return os.path.join(directory, f"{slug}.jsonl.gz")
+
+def prompt_key(prompt: str) -> str:
+    """Stable lookup key for a prompt"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:32]
+
+class Cassette:
+    """Append-only gzipped JSONL of provider calls, indexed by prompt for replay
+
+    Repeated prompts are replayed in recorded order, the last recording
+    being reused once they run out.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._by_provider: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_prompt: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursors: Dict[tuple, int] = defaultdict(int)
+        self.recorded = 0
+        self.loaded = 0
+        self.hits = 0
+        self.cross_provider_hits = 0
+        self.misses = 0
+
+    def append(self, entry: Dict[str, Any]):
+        """Write one call; flushed immediately so a crash loses at most this line"""
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(self.path, 'at', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self.recorded += 1
+
+    def load(self) -> int:
+        """Index every recorded call; returns how many were read"""
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"No LLM cassette at {self.path} - record one with LLM_CASSETTE_MODE=record")
+        lines = []
+        with gzip.open(self.path, 'rt', encoding='utf-8') as cassette:
+            try:
+                for line in cassette:
+                    lines.append(line)
+            except EOFError:
+                # Recorder was killed before closing the stream; keep what was flushed
+                pass
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._by_provider[(entry['provider'], entry['key'])].append(entry)
+            self._by_prompt[entry['key']].append(entry)
+            self.loaded += 1
+        return self.loaded
+
+    def lookup(self, provider: str, prompt: str) -> Dict[str, Any]:
+        """Next recorded call for this provider and prompt (or, failing that,
+        this prompt on any provider)"""
+        key = prompt_key(prompt)
+        index = (provider, key)
+        entries = self._by_provider.get(index)
+        if not entries:
+            entries = self._by_prompt.get(key)
+            index = ('*', key)
+            if not entries:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded {provider} response for prompt {key}")
+            self.cross_provider_hits += 1
+        self.hits += 1
+        position = self._cursors[index]
+        self._cursors[index] += 1
+        return entries[min(position, len(entries) - 1)]
+
+    def close(self):
+        """Finish the gzip stream"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cassette location and counters"""
+        return {
+            'path': self.path,
+            'recorded': self.recorded,
+            'loaded': self.loaded,
+            'hits': self.hits,
+            'cross_provider_hits': self.cross_provider_hits,
+            'misses': self.misses
+        }
+
+class RecordingProvider(LLMProvider):
+    """Passes calls through to another provider and records each one"""
+
+    def __init__(self, inner: LLMProvider, cassette: Cassette):
+        super().__init__(inner.name, inner.model)
+        self.inner = inner
+        self.cassette = cassette
+
+    def is_configured(self) -> bool:
+        return self.inner.is_configured()
+
+    async def generate(self, prompt: str, max_tokens: int) -> str:
+        entry = {
+            'ts': round(time.time(), 3),
+            'provider': self.name,
+            'model': self.model,
+            'key': prompt_key(prompt),
+            'max_tokens': max_tokens,
+            'prompt': prompt
+        }
+        started = time.perf_counter()
+        try:
+            content = await self.inner.generate(prompt, max_tokens)
+        except (asyncio.CancelledError, WorkerPoolFull):
+            # Cut off by a hedge/deadline or shed locally: no provider answer to replay
+            raise
+        except Exception as e:
+            entry.update(latency=round(time.perf_counter() - started, 4), error=f"{type(e).__name__}: {e}")
+            self.cassette.append(entry)
+            raise
+        entry.update(latency=round(time.perf_counter() - started, 4), response=content,
+                     completion_tokens=getattr(content, 'completion_tokens', None),
+                     finish_reason=getattr(content, 'finish_reason', None))
+        self.cassette.append(entry)
+        return content
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.inner.get_stats(), cassette=self.cassette.get_stats())
+
+class ReplayProvider(LLMProvider):
+    """Serves recorded responses and failures at recorded latency / speed
+
+    speed 1 reproduces recorded timings, 10 replays ten times faster and
+    0 returns immediately.
+    """
+
+    def __init__(self, name: str, cassette: Cassette, speed: float = 1.0):
+        super().__init__(name, f"replay-{name}")
+        self.cassette = cassette
+        self.speed = speed
+
+    async def generate(self, prompt: str, max_tokens: int) -> str:
+        entry = self.cassette.lookup(self.name, prompt)
+        if self.speed > 0:
+            await asyncio.sleep(entry.get('latency', 0) / self.speed)
+        if 'error' in entry:
+            raise ReplayedProviderError(entry['error'])
+        return Completion(entry['response'], entry.get('completion_tokens'), entry.get('finish_reason'))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(super().get_stats(), speed=self.speed, cassette=self.cassette.get_stats())
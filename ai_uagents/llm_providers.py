@@ -0,0 +1,191 @@
+"""
+LLM provider backends for AI Company agents
+Each fallback tier (Cerebras, Meta Llama, ASI:One) is served by an
+LLMProvider. Live providers call the real APIs; with LLM_PROVIDER=stub
+every tier is a deterministic local stub, so agents and the orchestrator
+can be run and load-tested without API keys or network access
+"""
+
+import os
+import re
+import json
+import random
+import asyncio
+import hashlib
+from typing import Dict, Any, Awaitable, Callable, Optional
+from prompt_compactor import CHARS_PER_TOKEN, estimate_tokens
+
+LIVE_BACKEND = 'live'
+STUB_BACKEND = 'stub'
+
+# finish_reason of a completion cut off at max_tokens (OpenAI-style APIs and Hugging Face)
+FINISH_LENGTH = 'length'
+
+class Completion(str):
+    """A completion's text plus the token count and finish reason the provider
+    reported for it (None where the backend does not say)"""
+
+    def __new__(cls, text: str, completion_tokens: Optional[int] = None, finish_reason: Optional[str] = None):
+        completion = super().__new__(cls, text)
+        completion.completion_tokens = completion_tokens
+        completion.finish_reason = finish_reason
+        return completion
+
+class LLMProvider:
+    """One completion backend behind a fallback tier"""
+
+    def __init__(self, name: str, model: str):
+        self.name = name
+        self.model = model
+
+    def is_configured(self) -> bool:
+        """Whether the backend can take requests"""
+        return True
+
+    async def generate(self, prompt: str, max_tokens: int) -> str:
+        """Single completion (no retries or fallback)"""
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Backend description and counters"""
+        return {'backend': type(self).__name__, 'model': self.model}
+
+class LiveProvider(LLMProvider):
+    """A real API, called through the agent's own generate coroutine"""
+
+    def __init__(self, name: str, model: str, generate: Callable[[str, int], Awaitable[str]], configured: bool):
+        super().__init__(name, model)
+        self._generate = generate
+        self.configured = configured
+
+    def is_configured(self) -> bool:
+        return self.configured
+
+    async def generate(self, prompt: str, max_tokens: int) -> str:
+        return await self._generate(prompt, max_tokens)
+
+class StubProviderError(Exception):
+    """Injected stub failure"""
+    pass
+
+# Pseudo-JSON placeholders used in prompt templates, matched outside string literals
+_TEMPLATE_TOKENS = re.compile(r'("(?:[^"\\]|\\.)*")|(\d+)\s*-\s*(\d+)|true/false|\bnumber\b')
+
+def _balanced_object(text: str, start: int) -> Optional[str]:
+    """The {...} block opening at start, or None if it never closes"""
+    depth = 0
+    for index in range(start, len(text)):
+        if text[index] == '{':
+            depth += 1
+        elif text[index] == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return None
+
+def extract_json_template(prompt: str) -> Optional[str]:
+    """The example JSON object a prompt asks the model to follow, if any"""
+    upper = prompt.upper()
+    marker = upper.rfind('JSON')
+    while marker != -1:
+        start = prompt.find('{', marker)
+        template = _balanced_object(prompt, start) if start != -1 else None
+        if template is not None:
+            return template
+        # "JSON" mentioned after the template (e.g. "return only JSON"): look earlier
+        marker = upper.rfind('JSON', 0, marker)
+    return None
+
+def fill_template(template: str, rng: random.Random) -> Any:
+    """Parse a prompt's JSON template, replacing placeholders (1-10, true/false, number) with values"""
+    def replace(match):
+        if match.group(1):
+            return match.group(1)
+        if match.group(2):
+            low, high = sorted((int(match.group(2)), int(match.group(3))))
+            return str(rng.randint(low, high))
+        if match.group(0) == 'true/false':
+            return 'true'
+        return str(rng.randrange(10_000, 1_000_000, 1_000))
+    return json.loads(_TEMPLATE_TOKENS.sub(replace, template))
+
+class StubProvider(LLMProvider):
+    """Deterministic offline backend
+
+    Replies with the JSON template embedded in the prompt (so each agent
+    gets output matching its own schema), or a short markdown report when
+    the prompt asks for no JSON. The same prompt always yields the same
+    text. Latency is log-normal around latency_ms (plus optional
+    per-token generation time) and failures are injected at failure_rate.
+    Output longer than max_tokens is cut off, like a real model.
+    """
+
+    def __init__(self, name: str, latency_ms: float = 200, latency_sigma: float = 0.5,
+                 failure_rate: float = 0.0, tokens_per_second: float = 0.0, seed: int = 0):
+        super().__init__(name, f"stub-{name}")
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate
+        self.tokens_per_second = tokens_per_second
+        self.seed = seed
+        self._rng = random.Random(f"{seed}:{name}")
+        self.calls = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls, name: str) -> "StubProvider":
+        """Stub configured by LLM_STUB_* (a _<TIER> suffix overrides one tier)"""
+        def setting(key: str, default: str) -> float:
+            return float(os.getenv(f"LLM_STUB_{key}_{name.upper()}", os.getenv(f"LLM_STUB_{key}", default)))
+        return cls(
+            name,
+            latency_ms=setting('LATENCY_MS', '200'),
+            latency_sigma=setting('LATENCY_SIGMA', '0.5'),
+            failure_rate=setting('FAILURE_RATE', '0'),
+            tokens_per_second=setting('TOKENS_PER_SECOND', '0'),
+            seed=int(setting('SEED', '0'))
+        )
+
+    def completion(self, prompt: str) -> str:
+        """The full (untruncated) reply for a prompt"""
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode('utf-8')).hexdigest()
+        rng = random.Random(digest)
+        template = extract_json_template(prompt)
+        if template is not None:
+            try:
+                return json.dumps(fill_template(template, rng), indent=2)
+            except json.JSONDecodeError:
+                pass
+        return (f"# Stub report {digest[:8]}\n\n"
+                f"Generated offline by the {self.name} stub provider.\n\n"
+                f"- Prompt length: {len(prompt)} characters\n"
+                f"- Figure: {rng.randrange(10_000, 1_000_000, 1_000)}\n")
+
+    async def generate(self, prompt: str, max_tokens: int) -> str:
+        self.calls += 1
+        content = self.completion(prompt)
+        finish_reason = 'stop'
+        if estimate_tokens(content) > max_tokens:
+            content = content[:max_tokens * CHARS_PER_TOKEN]
+            finish_reason = FINISH_LENGTH
+
+        delay = self.latency_ms / 1000 * self._rng.lognormvariate(0, self.latency_sigma)
+        if self.tokens_per_second > 0:
+            delay += estimate_tokens(content) / self.tokens_per_second
+        failed = self._rng.random() < self.failure_rate
+        await asyncio.sleep(delay)
+        if failed:
+            self.failures += 1
+            raise StubProviderError(f"Injected {self.name} stub failure")
+        return Completion(content, estimate_tokens(content), finish_reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            super().get_stats(),
+            latency_ms=self.latency_ms,
+            latency_sigma=self.latency_sigma,
+            failure_rate=self.failure_rate,
+            tokens_per_second=self.tokens_per_second,
+            calls=self.calls,
+            failures=self.failures
+        )
@@ -3,17 +3,31 @@ Workflow Orchestrator uAgent for AI Company
 Coordinates the complete business workflow across all agents
 """
 
+import os
+import time
 import asyncio
 import json
-import requests
-from typing import Dict, Any, List
+import aiohttp
+from typing import Dict, Any, AsyncIterator, Optional, Set, Tuple
 from uagents import Context, Model
-from base_uagent import BaseUAgent
+from base_uagent import BaseUAgent, CACHE_DIR
+from workflow_dag import WorkflowDAG, Stage, StageFailed, StageListener, STAGE_COMPLETED, STAGE_FAILED
+from workflow_jobs import WorkflowJob, WorkflowJobQueue, JobQueueFull, JobAlreadyActive, JOB_COMPLETED
+from workflow_checkpoints import WorkflowCheckpointStore, CheckpointMismatch, WorkflowAlreadyRunning, new_workflow_id
 
 class WorkflowRequest(Model):
     """Model for workflow request"""
     user_input: str
     idea_count: int = 3
+    deadline: Optional[float] = None  # absolute time.time(); defaults to now + WORKFLOW_SLO_SECONDS
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
+    workflow_id: Optional[str] = None  # continue this workflow from its checkpointed stages
+
+class ResumeWorkflowRequest(Model):
+    """Model for resuming a failed workflow from its checkpoints"""
+    workflow_id: str
+    deadline: Optional[float] = None
+    trace: Optional[Dict[str, str]] = None
 
 class WorkflowResponse(Model):
     """Model for workflow response"""
@@ -21,6 +35,8 @@ class WorkflowResponse(Model):
     message: str
     data: Dict[str, Any] = None
     error: str = None
+    trace_id: str = None  # look up the timeline at GET /traces/<trace_id> on any agent
+    workflow_id: str = None  # pass to /resume-workflow to retry from the failed stage
 
 class OrchestratoruAgent(BaseUAgent):
     """Workflow Orchestrator uAgent for coordinating complete business workflow"""
@@ -40,24 +56,77 @@ class OrchestratoruAgent(BaseUAgent):
             'head_engineering': 8006,
             'finance': 8007
         }
+        # Global budget for one workflow; every step's timeout is clipped to what remains
+        self.workflow_slo_seconds = float(os.getenv('WORKFLOW_SLO_SECONDS', '300'))
+        # Agents are told to finish this much earlier so a degraded reply still arrives in time
+        self.reply_margin_seconds = float(os.getenv('WORKFLOW_REPLY_MARGIN_SECONDS', '3'))
+        # Keep-alive pool for agent hops, sized for many concurrent workflows
+        # (each holds up to three hops open during the parallel stages)
+        self.http_pool_size = int(os.getenv('ORCHESTRATOR_HTTP_POOL_SIZE', '200'))
+        self.http_pool_per_host = int(os.getenv('ORCHESTRATOR_HTTP_POOL_PER_HOST', '64'))
+        # Completed stage outputs, so a failed workflow resumes from the stage that failed
+        checkpoint_db = os.getenv('WORKFLOW_CHECKPOINT_DB', os.path.join(CACHE_DIR, 'workflow_checkpoints.db'))
+        self.checkpoints = WorkflowCheckpointStore(
+            checkpoint_db,
+            retention_seconds=float(os.getenv('WORKFLOW_CHECKPOINT_RETENTION_SECONDS', '604800'))
+        ) if checkpoint_db else None
+        # Workflow IDs with a run in progress in this orchestrator, whichever endpoint started it
+        self.active_workflows: Set[str] = set()
+        # Submitted workflows run in the background; callers poll for progress and the result
+        self.workflow_jobs = WorkflowJobQueue(
+            'workflow',
+            self.run_workflow_job,
+            max_workers=int(os.getenv('WORKFLOW_JOB_WORKERS', '4')),
+            max_queue=int(os.getenv('WORKFLOW_JOB_QUEUE_SIZE', '32')),
+            retention_seconds=float(os.getenv('WORKFLOW_JOB_RETENTION_SECONDS', '3600'))
+        )
+        jobs_running = self.metrics.gauge('workflow_jobs_running', 'Background workflow jobs running')
+        jobs_queued = self.metrics.gauge('workflow_jobs_queued', 'Background workflow jobs waiting for a worker')
+        jobs_total = self.metrics.counter('workflow_jobs_total', 'Background workflow jobs by outcome', ('outcome',))
+        
+        def collect_job_counts():
+            stats = self.workflow_jobs.get_stats()
+            jobs_running.set(stats['running'])
+            jobs_queued.set(stats['queued'])
+            for outcome in ('submitted', 'completed', 'failed', 'cancelled', 'rejected'):
+                jobs_total.set_total(stats[outcome], outcome=outcome)
+        self.metrics.add_collector(collect_job_counts)
+        self.http_server.add_route('POST', '/workflow-jobs', self.handle_submit_job)
+        self.http_server.add_route('GET', '/workflow-jobs/{job_id}', self.handle_job_status)
+        self.http_server.add_route('GET', '/workflow-jobs/{job_id}/result', self.handle_job_result)
+        self.http_server.add_route('POST', '/workflow-jobs/{job_id}/resume', self.handle_resume_job)
+        self.http_server.add_stream_route('/process-business-idea/stream', self.stream_business_idea,
+                                          check=self.check_stream_request)
         self.setup_handlers()
     
     def setup_handlers(self):
         """Setup message handlers for the agent"""
         
+        @self.agent.on_event("shutdown")
+        async def stop_workflow_jobs(ctx: Context):
+            await self.workflow_jobs.stop()
+            if self.checkpoints is not None:
+                self.checkpoints.close()
+        
         @self.agent.on_message(model=WorkflowRequest)
+        @self.traced('message.WorkflowRequest')
         async def handle_workflow_request(ctx: Context, sender: str, msg: WorkflowRequest):
             """Handle complete workflow request"""
+            workflow_id = msg.workflow_id or new_workflow_id()
             try:
-                print(f"🎯 [{self.name}] Starting complete workflow for: {msg.user_input}")
+                self.logger.info('workflow.request', "🎯 Starting complete workflow",
+                                 workflow_id=workflow_id, user_input=msg.user_input, sender=sender)
                 
                 # Run the complete workflow
-                workflow_result = await self.run_complete_workflow(msg.user_input, msg.idea_count)
+                workflow_result = await self.run_complete_workflow(msg.user_input, msg.idea_count, msg.deadline,
+                                                                   workflow_id=workflow_id)
                 
                 response = WorkflowResponse(
                     success=True,
                     message="Complete workflow executed successfully",
-                    data=workflow_result
+                    data=workflow_result,
+                    trace_id=self.tracer.current_trace_id(),
+                    workflow_id=workflow_id
                 )
                 
                 self.log_activity('Complete workflow executed', {
@@ -70,28 +139,36 @@ class OrchestratoruAgent(BaseUAgent):
                 await ctx.send(sender, response)
                 
             except Exception as e:
-                print(f"❌ [{self.name}] Error in workflow: {str(e)}")
+                self.logger.error('workflow.error', "❌ Error in workflow", workflow_id=workflow_id, error=str(e))
                 error_response = WorkflowResponse(
                     success=False,
                     message="Workflow execution failed",
-                    error=str(e)
+                    error=str(e),
+                    trace_id=self.tracer.current_trace_id(),
+                    workflow_id=workflow_id
                 )
                 await ctx.send(sender, error_response)
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/process-business-idea", WorkflowRequest, WorkflowResponse)
+        @self.traced('process-business-idea')
         async def handle_process_business_idea_rest(ctx: Context, req: WorkflowRequest) -> WorkflowResponse:
             """REST endpoint for processing business ideas through complete workflow"""
+            workflow_id = req.workflow_id or new_workflow_id()
             try:
-                print(f"🎯 [{self.name}] REST: Starting complete workflow for: {req.user_input}")
+                self.logger.info('workflow.request', "🎯 REST: Starting complete workflow",
+                                 workflow_id=workflow_id, user_input=req.user_input)
                 
                 # Run the complete workflow
-                workflow_result = await self.run_complete_workflow(req.user_input, req.idea_count)
+                workflow_result = await self.run_complete_workflow(req.user_input, req.idea_count, req.deadline,
+                                                                   workflow_id=workflow_id)
                 
                 response = WorkflowResponse(
                     success=True,
                     message="Complete workflow executed successfully",
-                    data=workflow_result
+                    data=workflow_result,
+                    trace_id=self.tracer.current_trace_id(),
+                    workflow_id=workflow_id
                 )
                 
                 self.log_activity('REST: Complete workflow executed', {
@@ -102,69 +179,328 @@ class OrchestratoruAgent(BaseUAgent):
                 return response
                 
             except Exception as e:
-                print(f"❌ [{self.name}] REST: Error in workflow: {str(e)}")
+                self.logger.error('workflow.error', "❌ REST: Error in workflow", workflow_id=workflow_id, error=str(e))
+                return WorkflowResponse(
+                    success=False,
+                    message="Workflow execution failed",
+                    error=str(e),
+                    trace_id=self.tracer.current_trace_id(),
+                    workflow_id=workflow_id
+                )
+        
+        @self.agent.on_rest_post("/resume-workflow", ResumeWorkflowRequest, WorkflowResponse)
+        @self.traced('resume-workflow')
+        async def handle_resume_workflow_rest(ctx: Context, req: ResumeWorkflowRequest) -> WorkflowResponse:
+            """REST endpoint re-running a failed workflow from its first unfinished stage"""
+            checkpoint = await self.load_checkpoint(req.workflow_id)
+            if checkpoint is None:
+                return WorkflowResponse(
+                    success=False,
+                    message="Workflow resume failed",
+                    error=f"No checkpoints for workflow {req.workflow_id}",
+                    trace_id=self.tracer.current_trace_id(),
+                    workflow_id=req.workflow_id
+                )
+            try:
+                self.logger.info('workflow.resume', "🔁 REST: Resuming workflow",
+                                 workflow_id=req.workflow_id, user_input=checkpoint['user_input'])
+                workflow_result = await self.run_complete_workflow(checkpoint['user_input'], checkpoint['idea_count'],
+                                                                   req.deadline, workflow_id=req.workflow_id)
+                self.log_activity('REST: Workflow resumed', {
+                    'workflow_id': req.workflow_id,
+                    'restored_stages': list(checkpoint['stages'])
+                })
+                return WorkflowResponse(
+                    success=True,
+                    message="Complete workflow executed successfully",
+                    data=workflow_result,
+                    trace_id=self.tracer.current_trace_id(),
+                    workflow_id=req.workflow_id
+                )
+            except Exception as e:
+                self.logger.error('workflow.resume_error', "❌ REST: Error resuming workflow",
+                                  workflow_id=req.workflow_id, error=str(e))
                 return WorkflowResponse(
                     success=False,
                     message="Workflow execution failed",
-                    error=str(e)
+                    error=str(e),
+                    trace_id=self.tracer.current_trace_id(),
+                    workflow_id=req.workflow_id
                 )
     
-    async def run_complete_workflow(self, user_input: str, idea_count: int = 3) -> Dict[str, Any]:
-        """Run the complete business workflow"""
-        print(f"🎯 [{self.name}] Starting complete workflow...")
+    async def handle_submit_job(self, request):
+        """POST /workflow-jobs: queue a workflow (WorkflowRequest body) and return its job ID,
+        which is also its workflow ID for checkpoints"""
+        from aiohttp import web
         
         try:
-            # Step 1: Use user input as business concept (no automatic idea generation)
-            print(f"🎯 [{self.name}] Step 1: Using user business concept...")
-            
-            # Create a business concept from user input
-            selected_idea = {
-                "title": f"User Business: {user_input}",
-                "description": f"Business concept provided by user: {user_input}",
-                "revenue_model": "To be determined by workflow",
-                "success_factors": "User-driven business development"
-            }
-            
-            print(f"🎯 [{self.name}] Using user business concept: {selected_idea.get('title', 'Unknown')}")
-            
-            # Step 2: Research analyzes the idea
-            print(f"🎯 [{self.name}] Step 2: Research analyzing market...")
-            research_response = await self.call_research_agent(selected_idea)
-            if not research_response:
-                raise Exception("Research agent failed to analyze market")
-            
-            # Step 3: Product develops the concept
-            print(f"🎯 [{self.name}] Step 3: Product developing concept...")
-            product_response = await self.call_product_agent(selected_idea, research_response)
-            if not product_response:
-                raise Exception("Product agent failed to develop concept")
-            
-            # Step 4: CMO creates marketing strategy
-            print(f"🎯 [{self.name}] Step 4: CMO creating marketing strategy...")
-            marketing_response = await self.call_cmo_agent(selected_idea, product_response, research_response)
-            if not marketing_response:
-                raise Exception("CMO agent failed to create marketing strategy")
-            
-            # Step 5: CTO creates technical strategy
-            print(f"🎯 [{self.name}] Step 5: CTO creating technical strategy...")
-            technical_response = await self.call_cto_agent(selected_idea, product_response, research_response)
-            if not technical_response:
-                raise Exception("CTO agent failed to create technical strategy")
-            
-            # Step 6: Head of Engineering creates Bolt prompt
-            print(f"🎯 [{self.name}] Step 6: Head of Engineering creating Bolt prompt...")
-            bolt_response = await self.call_head_engineering_agent(
-                selected_idea, product_response, research_response, 
-                marketing_response, technical_response
+            workflow_request = WorkflowRequest(**await request.json())
+        except Exception as e:
+            return web.json_response({'success': False, 'error': f'Invalid workflow request: {e}'}, status=400)
+        conflict = await self.checkpoint_conflict(workflow_request)
+        if conflict is not None:
+            return web.json_response({'success': False, 'error': conflict}, status=409)
+        return self.queue_workflow_job(workflow_request.dict(), workflow_request.workflow_id)
+    
+    async def handle_resume_job(self, request):
+        """POST /workflow-jobs/{job_id}/resume: requeue a failed job; stages it already
+        completed are restored from checkpoints instead of being run again. An optional
+        JSON body carries the caller's deadline and trace, as on /resume-workflow"""
+        from aiohttp import web
+        
+        job_id = request.match_info['job_id']
+        try:
+            body = await request.json() if request.can_read_body else {}
+            resume = ResumeWorkflowRequest(**dict(body or {}, workflow_id=job_id))
+        except Exception as e:
+            return web.json_response({'success': False, 'error': f'Invalid resume request: {e}'}, status=400)
+        checkpoint = await self.load_checkpoint(job_id)
+        if checkpoint is None:
+            return web.json_response({'success': False, 'error': f'No checkpoints for workflow {job_id}'}, status=404)
+        if job_id in self.active_workflows:
+            return web.json_response({'success': False, 'error': str(WorkflowAlreadyRunning(job_id))}, status=409)
+        return self.queue_workflow_job({
+            'user_input': checkpoint['user_input'],
+            'idea_count': checkpoint['idea_count'],
+            'deadline': resume.deadline,
+            'trace': resume.trace
+        }, job_id)
+    
+    async def load_checkpoint(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """A workflow's checkpoint (see WorkflowCheckpointStore.load), read off the event loop"""
+        if self.checkpoints is None:
+            return None
+        return await asyncio.to_thread(self.checkpoints.load, workflow_id)
+    
+    async def checkpoint_conflict(self, req: WorkflowRequest) -> Optional[str]:
+        """Why req's workflow_id cannot run req now (it is already running, or its
+        checkpoints are for another request), or None"""
+        if not req.workflow_id:
+            return None
+        if req.workflow_id in self.active_workflows:
+            return str(WorkflowAlreadyRunning(req.workflow_id))
+        checkpoint = await self.load_checkpoint(req.workflow_id)
+        if checkpoint is None or (checkpoint['user_input'], checkpoint['idea_count']) == (req.user_input, req.idea_count):
+            return None
+        return str(CheckpointMismatch(req.workflow_id))
+    
+    async def check_stream_request(self, payload: Dict[str, Any]) -> Optional[Tuple[int, str]]:
+        """Refuse invalid stream requests, running workflow IDs and workflow IDs
+        checkpointed for another request"""
+        try:
+            req = WorkflowRequest(**payload)
+        except Exception as e:
+            return 400, f'Invalid workflow request: {e}'
+        conflict = await self.checkpoint_conflict(req)
+        return (409, conflict) if conflict is not None else None
+    
+    def queue_workflow_job(self, workflow_request: Dict[str, Any], job_id: Optional[str]):
+        """Submit a job and describe it, or the HTTP error explaining why it was refused"""
+        from aiohttp import web
+        
+        try:
+            job = self.workflow_jobs.submit(workflow_request, self.build_workflow(None).order, job_id)
+        except JobQueueFull as e:
+            self.logger.warning('workflow_job.rejected', "⚠️ Rejected workflow job", error=str(e))
+            return web.json_response({'success': False, 'error': str(e)}, status=503,
+                                     headers={'Retry-After': '30'})
+        except JobAlreadyActive as e:
+            return web.json_response({'success': False, 'error': str(e)}, status=409)
+        
+        self.logger.info('workflow_job.queued', "📥 Queued workflow job",
+                         job_id=job.id, user_input=workflow_request['user_input'])
+        self.log_activity('Workflow job queued', {'job_id': job.id, 'user_input': workflow_request['user_input']})
+        return web.json_response({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f'/workflow-jobs/{job.id}',
+            'result_url': f'/workflow-jobs/{job.id}/result'
+        }, status=202)
+    
+    async def handle_job_status(self, request):
+        """GET /workflow-jobs/{job_id}: job state and per-stage progress"""
+        from aiohttp import web
+        
+        job = self.workflow_jobs.get(request.match_info['job_id'])
+        if job is None:
+            return web.json_response({'success': False, 'error': 'Unknown or expired job'}, status=404)
+        return web.json_response(dict(job.get_status(), success=True))
+    
+    async def handle_job_result(self, request):
+        """GET /workflow-jobs/{job_id}/result: the WorkflowResponse once the job has finished
+        (202 with the current status while it is still queued or running)"""
+        from aiohttp import web
+        
+        job = self.workflow_jobs.get(request.match_info['job_id'])
+        if job is None:
+            return web.json_response({'success': False, 'error': 'Unknown or expired job'}, status=404)
+        if not job.finished:
+            return web.json_response(dict(job.get_status(), success=True), status=202)
+        
+        if job.status == JOB_COMPLETED:
+            response = WorkflowResponse(
+                success=True,
+                message="Complete workflow executed successfully",
+                data=job.result,
+                trace_id=job.trace_id,
+                workflow_id=job.id
+            )
+        else:
+            response = WorkflowResponse(
+                success=False,
+                message="Workflow execution failed",
+                error=job.error,
+                trace_id=job.trace_id,
+                workflow_id=job.id
             )
-            if not bolt_response:
-                raise Exception("Head of Engineering agent failed to create Bolt prompt")
+        return web.json_response(response.dict())
+    
+    async def run_workflow_job(self, job: WorkflowJob) -> Dict[str, Any]:
+        """Run a queued job's workflow, recording stage progress on the job"""
+        request = job.request
+        with self.tracer.span('workflow-job', parent=request.get('trace'), job_id=job.id):
+            job.trace_id = self.tracer.current_trace_id()
+            self.logger.info('workflow_job.start', "🎯 Job starting complete workflow",
+                             job_id=job.id, user_input=request['user_input'])
+            result = await self.run_complete_workflow(request['user_input'], request['idea_count'],
+                                                      request.get('deadline'), on_stage=job.record_stage,
+                                                      workflow_id=job.id)
+            self.log_activity('Workflow job completed', {
+                'job_id': job.id,
+                'user_input': request['user_input'],
+                'idea_count': request['idea_count']
+            })
+            return result
+    
+    async def stream_business_idea(self, payload: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """SSE endpoint: a 'workflow' event with the concept and stage names, a 'stage'
+        event as each stage starts and finishes (with its output), then the 'result'"""
+        req = WorkflowRequest(**payload)
+        workflow_id = req.workflow_id or new_workflow_id()
+        self.logger.info('workflow.stream_start', "🎯 STREAM: Starting complete workflow",
+                         workflow_id=workflow_id, user_input=req.user_input)
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def on_stage(stage: str, status: str, value: Any):
+            event = {'stage': stage, 'status': status}
+            if status == STAGE_COMPLETED:
+                event['data'] = value
+            elif status == STAGE_FAILED:
+                event['error'] = str(value)
+            events.put_nowait(('stage', event))
+        
+        async def run() -> WorkflowResponse:
+            with self.tracer.span('process-business-idea/stream', parent=req.trace):
+                trace_id = self.tracer.current_trace_id()
+                events.put_nowait(('workflow', {
+                    'idea': self.business_concept(req.user_input),
+                    'stages': self.build_workflow(None).order,
+                    'trace_id': trace_id,
+                    'workflow_id': workflow_id
+                }))
+                try:
+                    workflow_result = await self.run_complete_workflow(req.user_input, req.idea_count, req.deadline,
+                                                                       on_stage=on_stage, workflow_id=workflow_id)
+                except Exception as e:
+                    self.logger.error('workflow.stream_error', "❌ STREAM: Error in workflow",
+                                      workflow_id=workflow_id, error=str(e))
+                    return WorkflowResponse(success=False, message="Workflow execution failed",
+                                            error=str(e), trace_id=trace_id, workflow_id=workflow_id)
+                self.log_activity('STREAM: Complete workflow executed', {
+                    'user_input': req.user_input,
+                    'idea_count': req.idea_count
+                })
+                return WorkflowResponse(success=True, message="Complete workflow executed successfully",
+                                        data=workflow_result, trace_id=trace_id, workflow_id=workflow_id)
+        
+        workflow = asyncio.ensure_future(run())
+        workflow.add_done_callback(lambda _: events.put_nowait(None))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            yield 'result', workflow.result().dict()
+        finally:
+            # Client went away: stop calling agents on its behalf
+            workflow.cancel()
+    
+    def get_agent_info(self) -> Dict[str, Any]:
+        """Agent information plus background job and checkpoint usage"""
+        return dict(super().get_agent_info(),
+                    workflow_jobs=self.workflow_jobs.get_stats(),
+                    workflow_checkpoints=self.checkpoints.get_stats() if self.checkpoints is not None else None)
+    
+    async def run_complete_workflow(self, user_input: str, idea_count: int = 3,
+                                    deadline: Optional[float] = None,
+                                    on_stage: Optional[StageListener] = None,
+                                    workflow_id: Optional[str] = None) -> Dict[str, Any]:
+        """Run the complete business workflow within a global deadline, checkpointing
+        each stage; a workflow_id with checkpoints for the same request resumes after
+        its completed stages (CheckpointMismatch if they are for another request,
+        WorkflowAlreadyRunning if another run of it has not finished)"""
+        workflow_id = workflow_id or new_workflow_id()
+        # Claimed before the first await so two concurrent runs can never both start
+        if workflow_id in self.active_workflows:
+            raise WorkflowAlreadyRunning(workflow_id)
+        self.active_workflows.add(workflow_id)
+        try:
+            return await self._run_workflow(user_input, idea_count, deadline, on_stage, workflow_id)
+        finally:
+            self.active_workflows.discard(workflow_id)
+    
+    async def _run_workflow(self, user_input: str, idea_count: int, deadline: Optional[float],
+                            on_stage: Optional[StageListener], workflow_id: str) -> Dict[str, Any]:
+        """run_complete_workflow for a workflow ID this run has claimed"""
+        if deadline is None:
+            deadline = time.time() + self.workflow_slo_seconds
+        notify = on_stage or (lambda stage, status, value: None)
+        self.logger.info('workflow.start', "🎯 Starting complete workflow",
+                         workflow_id=workflow_id, budget_seconds=round(deadline - time.time()))
+        
+        restored = {}
+        if self.checkpoints is not None:
+            checkpoint = await self.load_checkpoint(workflow_id)
+            if checkpoint is not None:
+                # Restored stages were computed for the checkpointed request only
+                if (checkpoint['user_input'], checkpoint['idea_count']) != (user_input, idea_count):
+                    raise CheckpointMismatch(workflow_id)
+                restored = checkpoint['stages']
+                self.logger.info('workflow.restored', "🔁 Resuming workflow from checkpoints",
+                                 workflow_id=workflow_id, restored_stages=','.join(restored) or 'none')
+            await asyncio.to_thread(self.checkpoints.start, workflow_id, user_input, idea_count)
+        
+        # Stage listeners are synchronous, so checkpoints are written by background
+        # tasks that are awaited before the run's outcome is recorded
+        saves: Set[asyncio.Task] = set()
+        
+        def checkpoint_stage(stage: str, status: str, value: Any):
+            if status == STAGE_COMPLETED and self.checkpoints is not None:
+                saves.add(asyncio.ensure_future(
+                    asyncio.to_thread(self.checkpoints.save_stage, workflow_id, stage, value)))
+            notify(stage, status, value)
+        
+        async def finish(status: str, failed_stage: Optional[str] = None, error: Optional[str] = None):
+            if self.checkpoints is None:
+                return
+            await asyncio.gather(*saves, return_exceptions=True)
+            await asyncio.to_thread(self.checkpoints.finish, workflow_id, status, failed_stage, error)
+        
+        try:
+            # Step 1: Use user input as business concept (no automatic idea generation)
+            selected_idea = self.business_concept(user_input)
+            self.logger.debug('workflow.concept', "🎯 Step 1: Using user business concept",
+                              workflow_id=workflow_id, title=selected_idea.get('title', 'Unknown'))
             
-            # Step 7: Finance analyzes revenue
-            print(f"🎯 [{self.name}] Step 7: Finance analyzing revenue...")
-            finance_response = await self.call_finance_agent(selected_idea, product_response)
-            if not finance_response:
-                raise Exception("Finance agent failed to analyze revenue")
+            # Remaining steps run as a dependency graph: CMO, CTO and Finance in parallel;
+            # stages restored from checkpoints are treated as already done
+            workflow = self.build_workflow(deadline)
+            restored = {stage: output for stage, output in restored.items() if stage in workflow.stages}
+            for stage, output in restored.items():
+                notify(stage, STAGE_COMPLETED, output)
+            results = await workflow.run(dict(restored, idea=selected_idea), on_stage=checkpoint_stage)
             
             # Compile complete business plan
             complete_business_plan = {
@@ -172,50 +508,147 @@ class OrchestratoruAgent(BaseUAgent):
                     "user_input": user_input,
                     "selected_idea": selected_idea.get('title', 'Unknown'),
                     "workflow_status": "completed",
+                    "workflow_id": workflow_id,
+                    "restored_stages": list(restored),
                     "timestamp": "2024-01-01T00:00:00Z"
                 },
                 "idea": selected_idea,
-                "research": research_response,
-                "product": product_response,
-                "marketing": marketing_response,
-                "technical": technical_response,
-                "bolt_prompt": bolt_response,
-                "finance": finance_response,
+                "research": results["research"],
+                "product": results["product"],
+                "marketing": results["marketing"],
+                "technical": results["technical"],
+                "bolt_prompt": results["bolt_prompt"],
+                "finance": results["finance"],
                 "all_ideas": [selected_idea]
             }
             
-            print(f"🎯 [{self.name}] Complete workflow finished successfully!")
+            await finish('completed')
+            self.logger.info('workflow.completed', "🎯 Complete workflow finished successfully",
+                             workflow_id=workflow_id, restored_stages=len(restored))
             return complete_business_plan
             
+        except asyncio.CancelledError:
+            self.logger.warning('workflow.cancelled', "⚠️ Workflow cancelled", workflow_id=workflow_id)
+            await asyncio.shield(finish('cancelled'))
+            raise
+        except StageFailed as e:
+            self.logger.error('workflow.failed', "❌ Workflow failed at step",
+                              workflow_id=workflow_id, stage=e.stage, error=str(e.error))
+            await finish('failed', e.stage, str(e.error))
+            raise e.error
         except Exception as e:
-            print(f"❌ [{self.name}] Workflow failed at step: {str(e)}")
+            self.logger.error('workflow.failed', "❌ Workflow failed at step",
+                              workflow_id=workflow_id, error=str(e))
+            await finish('failed', error=str(e))
             raise e
     
+    @staticmethod
+    def business_concept(user_input: str) -> Dict[str, Any]:
+        """Create a business concept from user input"""
+        return {
+            "title": f"User Business: {user_input}",
+            "description": f"Business concept provided by user: {user_input}",
+            "revenue_model": "To be determined by workflow",
+            "success_factors": "User-driven business development"
+        }
+    
+    def build_workflow(self, deadline: Optional[float]) -> WorkflowDAG:
+        """Workflow stages keyed by their business plan section, with their inputs"""
+        async def research(r):
+            self.logger.debug('workflow.stage', "🎯 Research analyzing market", stage='research')
+            return self.require(await self.call_research_agent(r["idea"], deadline),
+                                "Research agent failed to analyze market")
+        
+        async def product(r):
+            self.logger.debug('workflow.stage', "🎯 Product developing concept", stage='product')
+            return self.require(await self.call_product_agent(r["idea"], r["research"], deadline),
+                                "Product agent failed to develop concept")
+        
+        async def marketing(r):
+            self.logger.debug('workflow.stage', "🎯 CMO creating marketing strategy", stage='marketing')
+            return self.require(await self.call_cmo_agent(r["idea"], r["product"], r["research"], deadline),
+                                "CMO agent failed to create marketing strategy")
+        
+        async def technical(r):
+            self.logger.debug('workflow.stage', "🎯 CTO creating technical strategy", stage='technical')
+            return self.require(await self.call_cto_agent(r["idea"], r["product"], r["research"], deadline),
+                                "CTO agent failed to create technical strategy")
+        
+        async def finance(r):
+            self.logger.debug('workflow.stage', "🎯 Finance analyzing revenue", stage='finance')
+            return self.require(await self.call_finance_agent(r["idea"], r["product"], deadline),
+                                "Finance agent failed to analyze revenue")
+        
+        async def bolt_prompt(r):
+            self.logger.debug('workflow.stage', "🎯 Head of Engineering creating Bolt prompt", stage='bolt_prompt')
+            return self.require(await self.call_head_engineering_agent(
+                r["idea"], r["product"], r["research"], r["marketing"], r["technical"], deadline
+            ), "Head of Engineering agent failed to create Bolt prompt")
+        
+        return WorkflowDAG([
+            Stage("research", research, ["idea"]),
+            Stage("product", product, ["idea", "research"]),
+            Stage("marketing", marketing, ["idea", "product", "research"]),
+            Stage("technical", technical, ["idea", "product", "research"]),
+            Stage("finance", finance, ["idea", "product"]),
+            Stage("bolt_prompt", bolt_prompt, ["idea", "product", "research", "marketing", "technical"])
+        ])
+    
+    @staticmethod
+    def require(result: Optional[Dict[str, Any]], failure: str) -> Dict[str, Any]:
+        """A stage's agent response, or an error if the agent call failed"""
+        if not result:
+            raise Exception(failure)
+        return result
+    
+    def step_budget(self, step_timeout: float, deadline: Optional[float]) -> Tuple[float, float]:
+        """HTTP timeout for one step (its own limit clipped to the workflow's remaining
+        time) and the earlier deadline the called agent should answer by"""
+        timeout = step_timeout
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError(f"Workflow deadline exceeded {-remaining:.1f}s ago")
+            timeout = min(step_timeout, remaining)
+        return timeout, time.time() + max(0.0, timeout - self.reply_margin_seconds)
+    
+    async def post_to_agent(self, step: str, url: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """POST to a downstream agent inside a span, passing the trace context along"""
+        with self.tracer.span(f'call.{step}', url=url, timeout=round(timeout, 1)) as span:
+            session = await self.get_http_session()
+            async with session.post(
+                url,
+                json=dict(payload, trace=self.tracer.current_context()),
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                span['attributes']['status'] = response.status
+                response.raise_for_status()
+                return await response.json(content_type=None)
+    
     async def call_ceo_agent(self, idea_count: int) -> Dict[str, Any]:
         """Call CEO agent to generate business ideas"""
         try:
-            response = requests.post(
+            return await self.post_to_agent(
+                'ceo',
                 f"http://localhost:{self.agent_ports['ceo']}/generate-ideas",
-                json={"count": idea_count},
+                {"count": idea_count},
                 timeout=90
             )
-            response.raise_for_status()
-            return response.json()
         except Exception as e:
-            print(f"❌ [{self.name}] CEO agent call failed: {e}")
+            self.logger.error('agent_call.failed', "❌ CEO agent call failed", agent='ceo', error=str(e))
             return None
     
-    async def call_research_agent(self, idea: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_research_agent(self, idea: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
         """Call MeTTa-enhanced Research agent to analyze market"""
         try:
-            print(f"🧠 [{self.name}] Calling MeTTa-enhanced Research agent...")
-            response = requests.post(
+            self.logger.debug('agent_call.start', "🧠 Calling MeTTa-enhanced Research agent", agent='research')
+            timeout, step_deadline = self.step_budget(120, deadline)
+            metta_response = await self.post_to_agent(
+                'research',
                 "http://localhost:8009/research-idea-metta",
-                json={"idea": idea},
-                timeout=120
+                {"idea": idea, "deadline": step_deadline},
+                timeout=timeout
             )
-            response.raise_for_status()
-            metta_response = response.json()
             
             # Extract the core research data from MeTTa response
             research_data = {
@@ -231,88 +664,94 @@ class OrchestratoruAgent(BaseUAgent):
                 }
             }
             
-            print(f"🧠 [{self.name}] MeTTa Research completed with {len(metta_response.get('similar_research', []))} similar studies found")
+            self.logger.debug('agent_call.done', "🧠 MeTTa Research completed", agent='research',
+                              similar_studies=len(metta_response.get('similar_research', [])))
             return research_data
         except Exception as e:
-            print(f"❌ [{self.name}] MeTTa Research agent call failed: {e}")
+            self.logger.error('agent_call.failed', "❌ MeTTa Research agent call failed", agent='research', error=str(e))
             return None
     
-    async def call_product_agent(self, idea: Dict[str, Any], research: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_product_agent(self, idea: Dict[str, Any], research: Dict[str, Any],
+                                 deadline: Optional[float] = None) -> Dict[str, Any]:
         """Call Product agent to develop concept"""
         try:
-            response = requests.post(
+            timeout, step_deadline = self.step_budget(90, deadline)
+            return await self.post_to_agent(
+                'product',
                 f"http://localhost:{self.agent_ports['product']}/develop-product",
-                json={"idea": idea, "research": research},
-                timeout=90
+                {"idea": idea, "research": research, "deadline": step_deadline},
+                timeout=timeout
             )
-            response.raise_for_status()
-            return response.json()
         except Exception as e:
-            print(f"❌ [{self.name}] Product agent call failed: {e}")
+            self.logger.error('agent_call.failed', "❌ Product agent call failed", agent='product', error=str(e))
             return None
     
-    async def call_cmo_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_cmo_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any],
+                             deadline: Optional[float] = None) -> Dict[str, Any]:
         """Call CMO agent to create marketing strategy"""
         try:
-            response = requests.post(
+            timeout, step_deadline = self.step_budget(90, deadline)
+            return await self.post_to_agent(
+                'cmo',
                 f"http://localhost:{self.agent_ports['cmo']}/develop-marketing",
-                json={"idea": idea, "product": product, "research": research},
-                timeout=90
+                {"idea": idea, "product": product, "research": research, "deadline": step_deadline},
+                timeout=timeout
             )
-            response.raise_for_status()
-            return response.json()
         except Exception as e:
-            print(f"❌ [{self.name}] CMO agent call failed: {e}")
+            self.logger.error('agent_call.failed', "❌ CMO agent call failed", agent='cmo', error=str(e))
             return None
     
-    async def call_cto_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_cto_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any],
+                             deadline: Optional[float] = None) -> Dict[str, Any]:
         """Call CTO agent to create technical strategy"""
         try:
-            response = requests.post(
+            timeout, step_deadline = self.step_budget(120, deadline)
+            return await self.post_to_agent(
+                'cto',
                 f"http://localhost:{self.agent_ports['cto']}/develop-technical",
-                json={"idea": idea, "product": product, "research": research},
-                timeout=120
+                {"idea": idea, "product": product, "research": research, "deadline": step_deadline},
+                timeout=timeout
             )
-            response.raise_for_status()
-            return response.json()
         except Exception as e:
-            print(f"❌ [{self.name}] CTO agent call failed: {e}")
+            self.logger.error('agent_call.failed', "❌ CTO agent call failed", agent='cto', error=str(e))
             return None
     
     async def call_head_engineering_agent(self, idea: Dict[str, Any], product: Dict[str, Any], 
                                         research: Dict[str, Any], marketing: Dict[str, Any], 
-                                        technical: Dict[str, Any]) -> Dict[str, Any]:
+                                        technical: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
         """Call Head of Engineering agent to create Bolt prompt"""
         try:
-            response = requests.post(
+            timeout, step_deadline = self.step_budget(120, deadline)
+            return await self.post_to_agent(
+                'head_engineering',
                 f"http://localhost:{self.agent_ports['head_engineering']}/create-bolt-prompt",
-                json={
+                {
                     "idea": idea, 
                     "product": product, 
                     "research": research, 
                     "marketing_strategy": marketing, 
-                    "technical_strategy": technical
+                    "technical_strategy": technical,
+                    "deadline": step_deadline
                 },
-                timeout=120
+                timeout=timeout
             )
-            response.raise_for_status()
-            return response.json()
         except Exception as e:
-            print(f"❌ [{self.name}] Head of Engineering agent call failed: {e}")
+            self.logger.error('agent_call.failed', "❌ Head of Engineering agent call failed", agent='head_engineering', error=str(e))
             return None
     
-    async def call_finance_agent(self, idea: Dict[str, Any], product: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_finance_agent(self, idea: Dict[str, Any], product: Dict[str, Any],
+                                 deadline: Optional[float] = None) -> Dict[str, Any]:
         """Call Finance agent to analyze revenue"""
         try:
-            response = requests.post(
+            timeout, step_deadline = self.step_budget(90, deadline)
+            return await self.post_to_agent(
+                'finance',
                 f"http://localhost:{self.agent_ports['finance']}/analyze-revenue",
-                json={"idea_data": idea, "product_data": product},
-                timeout=90
+                {"idea_data": idea, "product_data": product, "deadline": step_deadline},
+                timeout=timeout
             )
-            response.raise_for_status()
-            return response.json()
         except Exception as e:
-            print(f"❌ [{self.name}] Finance agent call failed: {e}")
+            self.logger.error('agent_call.failed', "❌ Finance agent call failed", agent='finance', error=str(e))
             return None
 
 # Create the agent instance
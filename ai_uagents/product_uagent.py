@@ -5,7 +5,7 @@ Develops product strategy and concepts
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uagents import Context, Model
 from base_uagent import BaseUAgent
 
@@ -13,6 +13,8 @@ class ProductRequest(Model):
     """Model for product development request"""
     idea: Dict[str, str]
     research: Dict[str, Any]
+    deadline: Optional[float] = None  # absolute time.time() the caller needs a reply by
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class TargetMarket(Model):
     """Model for target market"""
@@ -51,6 +53,7 @@ class ProductuAgent(BaseUAgent):
         """Setup message handlers for the agent"""
         
         @self.agent.on_message(model=ProductRequest)
+        @self.traced('message.ProductRequest')
         async def handle_product_request(ctx: Context, sender: str, msg: ProductRequest):
             """Develop product concept based on idea and research"""
             try:
@@ -101,7 +104,7 @@ Format your response as JSON:
   "success_metrics": ["Metric 1", "Metric 2", "Metric 3"]
 }}"""
 
-                response = await self.call_cerebras(prompt, 3000)
+                response = await self.call_cerebras(prompt, 3000, deadline=msg.deadline, endpoint='develop-product')
                 
                 # Clean the response to handle JSON parsing issues
                 cleaned_response = response
@@ -115,9 +118,10 @@ Format your response as JSON:
                 
                 # Parse JSON response
                 try:
-                    product_data = json.loads(cleaned_response)
+                    product_data = self.parse_llm_json(cleaned_response, 'develop-product')
                 except json.JSONDecodeError:
                     print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
+                    self.record_parse_failure('develop-product')
                     product_data = self.get_fallback_product_data()
                 
                 # Convert to response models
@@ -152,6 +156,7 @@ Format your response as JSON:
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/develop-product", ProductRequest, ProductResponse)
+        @self.traced('develop-product')
         async def handle_develop_product_rest(ctx: Context, req: ProductRequest) -> ProductResponse:
             """REST endpoint for developing product concepts"""
             try:
@@ -202,7 +207,7 @@ Format your response as JSON:
   "success_metrics": ["Metric 1", "Metric 2", "Metric 3"]
 }}"""
 
-                response = await self.call_cerebras(prompt, 3000)
+                response = await self.call_cerebras(prompt, 3000, deadline=req.deadline, endpoint='develop-product')
                 
                 # Clean the response to handle JSON parsing issues
                 cleaned_response = response
@@ -216,9 +221,10 @@ Format your response as JSON:
                 
                 # Parse JSON response
                 try:
-                    product_data = json.loads(cleaned_response)
+                    product_data = self.parse_llm_json(cleaned_response, 'develop-product')
                 except json.JSONDecodeError:
                     print(f"❌ [{self.name}] REST: JSON parsing failed, using fallback data")
+                    self.record_parse_failure('develop-product')
                     product_data = self.get_fallback_product_data()
                 
                 # Convert to response models
@@ -0,0 +1,103 @@
+"""
+Prompt compaction for AI Company agents
+Estimates token counts and shrinks prompts before they reach a provider:
+compact JSON for embedded data, pruning of empty and low-value fields,
+whitespace normalisation and truncation to a per-agent input budget
+"""
+
+import re
+import json
+from typing import Dict, Any, Optional, Iterable
+
+CHARS_PER_TOKEN = 4
+
+# Bookkeeping fields that add tokens without informing downstream prompts
+LOW_VALUE_KEYS = frozenset({
+    'metta_insights',
+    'similar_research',
+    'historical_context',
+    'timestamp',
+    'workflow_summary'
+})
+
+TRUNCATION_MARKER = "\n[... context truncated to fit input budget ...]\n"
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English/JSON)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def prune(value: Any, max_items: Optional[int] = None, max_string: Optional[int] = None,
+          drop_keys: Iterable[str] = LOW_VALUE_KEYS) -> Any:
+    """Drop empty and low-value fields, optionally capping list lengths and string sizes"""
+    drop_keys = frozenset(drop_keys)
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            if key in drop_keys:
+                continue
+            item = prune(item, max_items, max_string, drop_keys)
+            if item is None or item == [] or item == {} or (isinstance(item, str) and not item.strip()):
+                continue
+            pruned[key] = item
+        return pruned
+    if isinstance(value, (list, tuple)):
+        items = list(value)[:max_items] if max_items is not None else list(value)
+        return [prune(item, max_items, max_string, drop_keys) for item in items]
+    if isinstance(value, str) and max_string is not None and len(value) > max_string:
+        return value[:max_string].rstrip() + '…'
+    return value
+
+def compact_json(value: Any, max_items: Optional[int] = None, max_string: Optional[int] = None,
+                 drop_keys: Iterable[str] = LOW_VALUE_KEYS) -> str:
+    """Minified JSON of the pruned value, for embedding data in prompts"""
+    return json.dumps(prune(value, max_items, max_string, drop_keys), separators=(',', ':'), ensure_ascii=False)
+
+def normalize_whitespace(text: str) -> str:
+    """Strip indentation and trailing spaces, collapse runs of spaces and blank lines"""
+    text = re.sub(r'[ \t]+\n', '\n', text)
+    text = re.sub(r'\n[ \t]+', '\n', text)
+    text = re.sub(r'[ \t]{2,}', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+class PromptCompactor:
+    """Normalises prompts and truncates them to an input token budget
+
+    When a prompt is over budget the middle is cut: the opening (role and
+    task) and the end (output format instructions) are what the model
+    needs most to return parseable JSON.
+    """
+
+    def __init__(self, max_input_tokens: int = 6000, tail_ratio: float = 0.4):
+        self.max_input_tokens = max_input_tokens
+        self.tail_ratio = tail_ratio
+        self.prompts = 0
+        self.truncated = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+    def compact(self, prompt: str) -> str:
+        """Return the prompt normalised and within max_input_tokens"""
+        compacted = normalize_whitespace(prompt)
+        if self.max_input_tokens > 0 and estimate_tokens(compacted) > self.max_input_tokens:
+            budget_chars = max(0, self.max_input_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+            tail_chars = int(budget_chars * self.tail_ratio)
+            head_chars = budget_chars - tail_chars
+            compacted = compacted[:head_chars] + TRUNCATION_MARKER + compacted[len(compacted) - tail_chars:]
+            self.truncated += 1
+
+        self.prompts += 1
+        self.tokens_in += estimate_tokens(prompt)
+        self.tokens_out += estimate_tokens(compacted)
+        return compacted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compaction statistics"""
+        return {
+            'max_input_tokens': self.max_input_tokens,
+            'prompts': self.prompts,
+            'truncated': self.truncated,
+            'estimated_tokens_in': self.tokens_in,
+            'estimated_tokens_out': self.tokens_out,
+            'estimated_tokens_saved': self.tokens_in - self.tokens_out
+        }
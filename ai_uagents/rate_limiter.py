@@ -0,0 +1,160 @@
+"""
+Cross-process token-bucket rate limiter for AI Company agents
+Every agent process shares one bucket state file guarded by an exclusive
+file lock, so together they stay within the provider account's quota
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+from typing import Dict, Any, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a process-local lock
+    fcntl = None
+
+class SharedTokenBucket:
+    """Set of named token buckets stored in a file shared by all agents
+
+    Each bucket refills continuously at `rate` units per second up to
+    `capacity`. Acquiring is all-or-nothing across buckets so a request
+    never holds request-quota while it waits for token-quota.
+
+    Waiters in one process are served in arrival order. A waiter that has
+    been passed over for `max_bypass_seconds` claims the buckets in the
+    shared state, so other processes' smaller requests stop draining them
+    until it has been served.
+    """
+
+    def __init__(self, state_path: str, limits: Dict[str, Tuple[float, float]],
+                 max_bypass_seconds: float = 10.0):
+        self.state_path = state_path
+        self.limits = {name: (rate, capacity) for name, (rate, capacity) in limits.items() if rate > 0}
+        self.max_bypass_seconds = max_bypass_seconds
+        self._thread_lock = threading.Lock()
+        self._waiters = asyncio.Lock()  # FIFO: only the head waiter polls the shared state
+        self.acquired = 0
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+        self.claims = 0
+
+        state_dir = os.path.dirname(state_path)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        """Limiter is a no-op when no bucket has a positive rate"""
+        return bool(self.limits)
+
+    def _locked_update(self, costs: Dict[str, float], refund: bool = False,
+                       claim_id: str = None, claim: bool = False) -> float:
+        """Refill, then deduct (or refund) costs atomically; returns seconds to wait
+
+        Blocks on the cross-process file lock, so call it off the event loop.
+        With claim=True a waiter that cannot be served yet reserves the
+        buckets for claim_id; while that claim is live other waiters are told
+        to wait.
+        """
+        with self._thread_lock, open(self.state_path, 'a+') as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    state = {}
+
+                now = time.time()
+                levels = {}
+                for name, (rate, capacity) in self.limits.items():
+                    tokens, updated_at = state.get(name, (capacity, now))
+                    levels[name] = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+                owner = state.get('_claim')
+                if owner and owner[1] <= now:
+                    owner = None  # expired: its holder stopped renewing it
+
+                wait = 0.0
+                if refund:
+                    for name, amount in costs.items():
+                        if name in levels:
+                            levels[name] = min(self.limits[name][1], levels[name] + amount)
+                elif owner and owner[0] != claim_id:
+                    # Another waiter was passed over too long: let the buckets fill for it
+                    wait = owner[1] - now
+                else:
+                    for name, amount in costs.items():
+                        if name not in levels:
+                            continue
+                        rate, capacity = self.limits[name]
+                        amount = min(amount, capacity)  # a single oversized request can still pass
+                        if levels[name] < amount:
+                            wait = max(wait, (amount - levels[name]) / rate)
+                    if wait == 0.0:
+                        for name, amount in costs.items():
+                            if name in levels:
+                                levels[name] -= min(amount, self.limits[name][1])
+                        owner = None
+                    elif claim:
+                        # Held until refilled, plus slack for the claimant's next poll
+                        owner = (claim_id, now + wait + 1.0)
+
+                new_state = {name: (level, now) for name, level in levels.items()}
+                if owner:
+                    new_state['_claim'] = owner
+                f.seek(0)
+                f.truncate()
+                json.dump(new_state, f)
+                f.flush()
+                return wait
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    async def acquire(self, costs: Dict[str, float]):
+        """Wait (queue) until every bucket can cover its cost, then deduct it"""
+        if not self.enabled:
+            return
+
+        claim_id = uuid.uuid4().hex
+        started = time.monotonic()
+        waited = False
+        async with self._waiters:
+            while True:
+                claim = time.monotonic() - started >= self.max_bypass_seconds
+                wait = await asyncio.to_thread(self._locked_update, costs, False, claim_id, claim)
+                if wait == 0.0:
+                    break
+                if claim and not waited:
+                    self.claims += 1
+                waited = True
+                await asyncio.sleep(min(wait, 5.0))
+
+        self.acquired += 1
+        if waited:
+            self.waits += 1
+            self.total_wait_seconds += time.monotonic() - started
+
+    async def refund(self, costs: Dict[str, float]):
+        """Return unused reservation (e.g. estimated minus actual tokens)"""
+        if self.enabled and any(amount > 0 for amount in costs.values()):
+            await asyncio.to_thread(self._locked_update,
+                                    {name: amount for name, amount in costs.items() if amount > 0}, True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limiter usage statistics for this process"""
+        return {
+            'limits': {name: {'rate_per_second': rate, 'capacity': capacity}
+                       for name, (rate, capacity) in self.limits.items()},
+            'acquired': self.acquired,
+            'waits': self.waits,
+            'claims': self.claims,
+            'total_wait_seconds': round(self.total_wait_seconds, 3)
+        }
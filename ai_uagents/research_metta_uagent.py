@@ -5,16 +5,16 @@ Conducts intelligent market research with structured reasoning
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from uagents import Context, Model
 from base_uagent import BaseUAgent
-from knowledge.business_knowledge import BusinessKnowledgeGraph
-from knowledge.research_memory import ResearchMemorySystem
 
 class ResearchRequest(Model):
     """Model for research request"""
     idea: Dict[str, str]
+    deadline: Optional[float] = None  # absolute time.time() the caller needs a reply by
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class Competitor(Model):
     """Model for competitor information"""
@@ -74,17 +74,34 @@ class ResearchMettauAgent(BaseUAgent):
             port=8009  # Different port to avoid conflict
         )
         
-        # Initialize MeTTa knowledge systems
-        self.business_knowledge = BusinessKnowledgeGraph()
-        self.research_memory = ResearchMemorySystem()
+        # MeTTa knowledge systems (and hyperon itself) are loaded on first use
+        self._business_knowledge = None
+        self._research_memory = None
         
         self.setup_handlers()
         print("🧠 [RESEARCH MeTTa] Enhanced Research Agent with MeTTa Knowledge Graphs initialized")
     
+    @property
+    def business_knowledge(self):
+        """Business knowledge graph, built on first use"""
+        if self._business_knowledge is None:
+            from knowledge.business_knowledge import BusinessKnowledgeGraph
+            self._business_knowledge = BusinessKnowledgeGraph()
+        return self._business_knowledge
+    
+    @property
+    def research_memory(self):
+        """Research memory system, built on first use"""
+        if self._research_memory is None:
+            from knowledge.research_memory import ResearchMemorySystem
+            self._research_memory = ResearchMemorySystem()
+        return self._research_memory
+    
     def setup_handlers(self):
         """Setup message handlers for the enhanced agent"""
         
         @self.agent.on_message(model=ResearchRequest)
+        @self.traced('message.ResearchRequest')
         async def handle_enhanced_research_request(ctx: Context, sender: str, msg: ResearchRequest):
             """Conduct enhanced market research with MeTTa knowledge"""
             try:
@@ -102,7 +119,7 @@ class ResearchMettauAgent(BaseUAgent):
                 enhanced_prompt = self.create_enhanced_prompt(msg.idea, industry_insights, historical_context)
                 
                 print(f"🧠 [{self.name}] Calling ASI:One with MeTTa context...")
-                response = await self.call_cerebras(enhanced_prompt, 3000)
+                response = await self.call_cerebras(enhanced_prompt, 3000, hedge=True, deadline=msg.deadline, endpoint='research-idea-metta')
                 
                 # Step 4: Parse and enhance response
                 research_data = self.parse_research_response(response)
@@ -142,6 +159,7 @@ class ResearchMettauAgent(BaseUAgent):
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/research-idea-metta", ResearchRequest, MettaResearchResponse)
+        @self.traced('research-idea-metta')
         async def handle_research_idea_metta_rest(ctx: Context, req: ResearchRequest) -> MettaResearchResponse:
             """REST endpoint for MeTTa-enhanced research"""
             try:
@@ -159,7 +177,7 @@ class ResearchMettauAgent(BaseUAgent):
                 enhanced_prompt = self.create_enhanced_prompt(req.idea, industry_insights, historical_context)
                 
                 print(f"🧠 [{self.name}] REST: Calling ASI:One with MeTTa context...")
-                response = await self.call_cerebras(enhanced_prompt, 3000)
+                response = await self.call_cerebras(enhanced_prompt, 3000, hedge=True, deadline=req.deadline, endpoint='research-idea-metta')
                 
                 # Parse and enhance response
                 research_data = self.parse_research_response(response)
@@ -193,6 +211,7 @@ class ResearchMettauAgent(BaseUAgent):
         
         # Additional MeTTa-specific endpoints
         @self.agent.on_rest_post("/find-similar-research", ResearchRequest, SimilarResearchResponse)
+        @self.traced('find-similar-research')
         async def handle_find_similar_research_rest(ctx: Context, req: ResearchRequest) -> SimilarResearchResponse:
             """Find similar research using MeTTa knowledge"""
             try:
@@ -214,6 +233,7 @@ class ResearchMettauAgent(BaseUAgent):
                 )
         
         @self.agent.on_rest_post("/market-trend-analysis", ResearchRequest, MarketTrendResponse)
+        @self.traced('market-trend-analysis')
         async def handle_market_trend_analysis_rest(ctx: Context, req: ResearchRequest) -> MarketTrendResponse:
             """Analyze market trends using MeTTa knowledge"""
             try:
@@ -224,7 +244,7 @@ class ResearchMettauAgent(BaseUAgent):
                 return MarketTrendResponse(
                     industry_insights=industry_insights,
                     market_patterns=market_patterns,
-                    trends=self.business_knowledge.get_market_trends(business_context.get('industry', 'Unknown'))
+                    trends=self.get_market_trends(business_context)
                 )
             except Exception as e:
                 print(f"❌ [{self.name}] Error analyzing market trends: {e}")
@@ -277,29 +297,40 @@ class ResearchMettauAgent(BaseUAgent):
     def get_industry_insights(self, business_context: Dict[str, str]) -> Dict[str, str]:
         """Get industry insights from MeTTa knowledge graph"""
         industry = business_context.get('industry', 'Unknown')
-        return self.business_knowledge.get_industry_insights(industry)
+        with self.tracer.span('metta.query', query='industry_insights', industry=industry):
+            return self.business_knowledge.get_industry_insights(industry)
     
     def get_historical_context(self, business_context: Dict[str, str]) -> str:
         """Get historical context from research memory"""
         industry = business_context.get('industry', 'Unknown')
         business_model = business_context.get('business_model', 'Unknown')
-        return self.research_memory.get_historical_context(industry, business_model)
+        with self.tracer.span('metta.query', query='historical_context', industry=industry):
+            return self.research_memory.get_historical_context(industry, business_model)
     
     def find_similar_research(self, business_context: Dict[str, str]) -> List[Dict[str, Any]]:
         """Find similar research using MeTTa memory system"""
         industry = business_context.get('industry', 'Unknown')
         business_model = business_context.get('business_model', 'Unknown')
-        return self.research_memory.find_similar_research(industry, business_model)
+        with self.tracer.span('metta.query', query='similar_research', industry=industry):
+            return self.research_memory.find_similar_research(industry, business_model)
     
     def analyze_market_patterns(self, business_context: Dict[str, str]) -> Dict[str, Any]:
         """Analyze market patterns using MeTTa knowledge"""
         industry = business_context.get('industry', 'Unknown')
-        return self.research_memory.analyze_market_patterns(industry)
+        with self.tracer.span('metta.query', query='market_patterns', industry=industry):
+            return self.research_memory.analyze_market_patterns(industry)
+    
+    def get_market_trends(self, business_context: Dict[str, str]) -> str:
+        """Get market trends from MeTTa knowledge"""
+        industry = business_context.get('industry', 'Unknown')
+        with self.tracer.span('metta.query', query='market_trends', industry=industry):
+            return self.business_knowledge.get_market_trends(industry)
     
     def get_success_factors(self, business_context: Dict[str, str]) -> List[str]:
         """Get success factors from MeTTa knowledge"""
         industry = business_context.get('industry', 'Unknown')
-        return self.business_knowledge.query_success_factors(f"{industry}_company")
+        with self.tracer.span('metta.query', query='success_factors', industry=industry):
+            return self.business_knowledge.query_success_factors(f"{industry}_company")
     
     def create_enhanced_prompt(self, idea: Dict[str, str], industry_insights: Dict[str, str], 
                              historical_context: str) -> str:
@@ -371,11 +402,12 @@ Based on the historical context and industry insights above, provide a comprehen
                 cleaned_response = json_match.group(0)
             
             # Parse JSON
-            research_data = json.loads(cleaned_response)
+            research_data = self.parse_llm_json(cleaned_response, 'research-idea-metta')
             return research_data
             
         except json.JSONDecodeError:
             print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
+            self.record_parse_failure('research-idea-metta')
             return self.get_fallback_research_data()
     
     def enhance_with_metta_insights(self, research_data: Dict[str, Any], business_context: Dict[str, str]) -> Dict[str, Any]:
@@ -420,19 +452,20 @@ Based on the historical context and industry insights above, provide a comprehen
             }
             
             # Store in MeTTa memory
-            self.research_memory.add_research_record(
-                idea_title=idea.get('title', 'Unknown'),
-                industry=business_context.get('industry', 'Unknown'),
-                business_model=business_context.get('business_model', 'Unknown'),
-                market_segment=business_context.get('market_segment', 'Unknown'),
-                competitors=[comp.get('name', 'Unknown') for comp in research_data.get('competitors', [])],
-                market_size=research_data.get('market_analysis', {}).get('market_size', 'Unknown'),
-                growth_potential=research_data.get('market_analysis', {}).get('growth_potential', 'Unknown'),
-                key_challenges=research_data.get('market_analysis', {}).get('key_challenges', []),
-                opportunities=research_data.get('market_analysis', {}).get('opportunities', []),
-                success_rate="High",  # Default for now
-                timestamp=findings['timestamp']
-            )
+            with self.tracer.span('metta.store', industry=findings['industry']):
+                self.research_memory.add_research_record(
+                    idea_title=idea.get('title', 'Unknown'),
+                    industry=business_context.get('industry', 'Unknown'),
+                    business_model=business_context.get('business_model', 'Unknown'),
+                    market_segment=business_context.get('market_segment', 'Unknown'),
+                    competitors=[comp.get('name', 'Unknown') for comp in research_data.get('competitors', [])],
+                    market_size=research_data.get('market_analysis', {}).get('market_size', 'Unknown'),
+                    growth_potential=research_data.get('market_analysis', {}).get('growth_potential', 'Unknown'),
+                    key_challenges=research_data.get('market_analysis', {}).get('key_challenges', []),
+                    opportunities=research_data.get('market_analysis', {}).get('opportunities', []),
+                    success_rate="High",  # Default for now
+                    timestamp=findings['timestamp']
+                )
             
             print(f"🧠 [{self.name}] Stored research findings in MeTTa memory")
             
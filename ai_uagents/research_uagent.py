@@ -5,13 +5,15 @@ Conducts market research and competitive analysis
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uagents import Context, Model
 from base_uagent import BaseUAgent
 
 class ResearchRequest(Model):
     """Model for research request"""
     idea: Dict[str, str]
+    deadline: Optional[float] = None  # absolute time.time() the caller needs a reply by
+    trace: Optional[Dict[str, str]] = None  # caller's {'trace_id', 'span_id'}
 
 class Competitor(Model):
     """Model for competitor information"""
@@ -54,6 +56,7 @@ class ResearchuAgent(BaseUAgent):
         """Setup message handlers for the agent"""
         
         @self.agent.on_message(model=ResearchRequest)
+        @self.traced('message.ResearchRequest')
         async def handle_research_request(ctx: Context, sender: str, msg: ResearchRequest):
             """Conduct market research for a business idea"""
             try:
@@ -96,7 +99,7 @@ Format your response as JSON:
   }}
 }}"""
 
-                response = await self.call_cerebras(prompt, 2500)
+                response = await self.call_cerebras(prompt, 2500, hedge=True, deadline=msg.deadline, endpoint='research-idea')
                 
                 # Clean the response to handle JSON parsing issues
                 cleaned_response = response
@@ -110,9 +113,10 @@ Format your response as JSON:
                 
                 # Parse JSON response
                 try:
-                    research_data = json.loads(cleaned_response)
+                    research_data = self.parse_llm_json(cleaned_response, 'research-idea')
                 except json.JSONDecodeError:
                     print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
+                    self.record_parse_failure('research-idea')
                     research_data = self.get_fallback_research_data()
                 
                 # Convert to response models
@@ -147,6 +151,7 @@ Format your response as JSON:
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/research-idea", ResearchRequest, ResearchResponse)
+        @self.traced('research-idea')
         async def handle_research_idea_rest(ctx: Context, req: ResearchRequest) -> ResearchResponse:
             """REST endpoint for researching business ideas"""
             try:
@@ -189,7 +194,7 @@ Format your response as JSON:
   }}
 }}"""
 
-                response = await self.call_cerebras(prompt, 2500)
+                response = await self.call_cerebras(prompt, 2500, hedge=True, deadline=req.deadline, endpoint='research-idea')
                 
                 # Clean the response to handle JSON parsing issues
                 cleaned_response = response
@@ -203,9 +208,10 @@ Format your response as JSON:
                 
                 # Parse JSON response
                 try:
-                    research_data = json.loads(cleaned_response)
+                    research_data = self.parse_llm_json(cleaned_response, 'research-idea')
                 except json.JSONDecodeError:
                     print(f"❌ [{self.name}] REST: JSON parsing failed, using fallback data")
+                    self.record_parse_failure('research-idea')
                     research_data = self.get_fallback_research_data()
                 
                 # Convert to response models
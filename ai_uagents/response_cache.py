@@ -0,0 +1,267 @@
+"""
+LLM response cache for AI Company agents
+In-memory TTL cache with LRU eviction keyed on (model, prompt, max_tokens),
+backed by an optional SQLite store shared by all agent processes, plus
+single-flight coalescing of identical in-flight requests
+"""
+
+import os
+import asyncio
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+class PersistentResponseStore:
+    """SQLite-backed response store shared across agent processes
+
+    Uses WAL journaling so several agents can read while one writes.
+    All errors are swallowed: the store is a best-effort cache tier.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = 1000):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_responses (
+                cache_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        """Return (expires_at, response) for a live entry, or None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT expires_at, response FROM llm_responses WHERE cache_key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            return (row[0], row[1]) if row else None
+        except sqlite3.Error:
+            return None
+
+    def put(self, key: str, value: str, ttl_seconds: float):
+        """Insert or replace an entry, pruning expired rows periodically"""
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (cache_key, response, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now + ttl_seconds)
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+        except sqlite3.Error:
+            pass
+
+    def delete(self, key: str):
+        """Remove an entry"""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        """Remove every entry"""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM llm_responses")
+        except sqlite3.Error:
+            pass
+
+    def count(self) -> int:
+        """Number of rows currently stored"""
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+class ResponseCache:
+    """Size-bounded LRU cache of LLM completions with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600,
+                 store: Optional[PersistentResponseStore] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Cache is disabled when size or TTL is zero"""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int) -> str:
+        """Build a cache key from model, prompt hash and max_tokens"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return f"{model}:{max_tokens}:{prompt_hash}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None on miss or expiry"""
+        if not self.enabled:
+            return None
+
+        entry = self._memory_entry(key)
+        if entry is None and self.store is not None:
+            entry = self._warm(key, self.store.get(key))
+        return self._count_lookup(key, entry)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """get() with the on-disk store read on a worker thread, so a miss never
+        blocks the event loop on SQLite"""
+        if not self.enabled:
+            return None
+
+        entry = self._memory_entry(key)
+        if entry is None and self.store is not None:
+            entry = self._warm(key, await asyncio.to_thread(self.store.get, key))
+        return self._count_lookup(key, entry)
+
+    def _memory_entry(self, key: str) -> Optional[Tuple[float, str]]:
+        """Live in-memory entry for key, dropping it if expired"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.time():
+            del self._entries[key]
+            entry = None
+        return entry
+
+    def _warm(self, key: str, entry: Optional[Tuple[float, str]]) -> Optional[Tuple[float, str]]:
+        """Copy an entry read from the shared on-disk store (written by this or a sibling agent) into memory"""
+        if entry is not None:
+            self.store_hits += 1
+            self._insert(key, entry)
+        return entry
+
+    def _count_lookup(self, key: str, entry: Optional[Tuple[float, str]]) -> Optional[str]:
+        """Record a hit or miss and return the cached response"""
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: str):
+        """Store a response, evicting the least recently used entries if full"""
+        if not self.enabled or not value:
+            return
+
+        self._insert(key, (time.time() + self.ttl_seconds, value))
+        if self.store is not None:
+            self.store.put(key, value, self.ttl_seconds)
+
+    async def put_async(self, key: str, value: str):
+        """put() with the on-disk store written on a worker thread, so a busy
+        sibling writer never blocks the event loop on SQLite"""
+        if not self.enabled or not value:
+            return
+
+        self._insert(key, (time.time() + self.ttl_seconds, value))
+        if self.store is not None:
+            await asyncio.to_thread(self.store.put, key, value, self.ttl_seconds)
+
+    def _insert(self, key: str, entry: Tuple[float, str]):
+        """Insert into the in-memory tier and enforce the size bound"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        """Drop one entry from both tiers (e.g. a reply that turned out to be unusable)"""
+        self._entries.pop(key, None)
+        if self.store is not None:
+            self.store.delete(key)
+
+    def clear(self):
+        """Drop all cached entries from both tiers"""
+        self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'store_hits': self.store_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'store_path': self.store.db_path if self.store else None
+        }
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one shared task
+
+    The shared work runs in its own task and callers await it through
+    asyncio.shield, so one caller being cancelled does not cancel the
+    call for everyone else waiting on the same key.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory() for key, or join the call already in flight"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        """Drop a completed task and mark its exception as retrieved"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            'in_flight': len(self._inflight),
+            'leaders': self.leaders,
+            'coalesced': self.coalesced
+        }
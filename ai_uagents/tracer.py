@@ -0,0 +1,164 @@
+"""
+Request tracing for AI Company agents
+Spans (parse, MeTTa query, LLM call, fallback, downstream agent call) are
+linked by a trace ID the orchestrator passes to every agent it calls, kept
+in a per-agent ring buffer and optionally appended to a shared JSONL file
+(TRACE_FILE) so a whole workflow's timeline can be rebuilt across agents
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import secrets
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueListener
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from agent_logger import BufferedQueueHandler
+
+# (trace_id, span_id) of the span currently running in this task
+_current_span: ContextVar[Optional[Tuple[str, str]]] = ContextVar('ai_company_span', default=None)
+
+_span_writer: Optional[logging.Logger] = None
+
+def new_trace_id() -> str:
+    """32 hex characters, as in W3C trace context"""
+    return secrets.token_hex(16)
+
+def new_span_id() -> str:
+    """16 hex characters, as in W3C trace context"""
+    return secrets.token_hex(8)
+
+def _shared_span_writer(path: str) -> logging.Logger:
+    """Process-wide queued writer appending one JSON span per line"""
+    global _span_writer
+    if _span_writer is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        target = logging.FileHandler(path)
+        target.setFormatter(logging.Formatter('%(message)s'))
+        span_queue = queue.Queue(maxsize=int(os.getenv('AGENT_LOG_QUEUE_SIZE', '10000')))
+        listener = QueueListener(span_queue, target)
+        listener.start()
+        atexit.register(listener.stop)
+        _span_writer = logging.getLogger('ai_company.traces')
+        _span_writer.setLevel(logging.INFO)
+        _span_writer.propagate = False
+        _span_writer.addHandler(BufferedQueueHandler(span_queue))
+    return _span_writer
+
+class Tracer:
+    """Records spans for one agent
+
+    A span continues the trace of an explicit parent context (as received
+    from a caller) or of the span already running in the current task;
+    with neither it starts a new trace.
+    """
+
+    def __init__(self, agent_name: str, buffer_size: Optional[int] = None, trace_file: Optional[str] = None):
+        self.agent_name = agent_name
+        self.spans = deque(maxlen=buffer_size or int(os.getenv('TRACE_BUFFER_SIZE', '2000')))
+        self.trace_file = trace_file if trace_file is not None else os.getenv('TRACE_FILE', '')
+        self._writer = _shared_span_writer(self.trace_file) if self.trace_file else None
+        self.recorded = 0
+
+    def current_context(self) -> Optional[Dict[str, str]]:
+        """Trace context to send with an outgoing call, or None outside any span"""
+        current = _current_span.get()
+        if current is None:
+            return None
+        return {'trace_id': current[0], 'span_id': current[1]}
+
+    def current_trace_id(self) -> Optional[str]:
+        """Trace ID of the running span, if any"""
+        current = _current_span.get()
+        return current[0] if current else None
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Dict[str, str]] = None, **attributes) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block as a span; yields the span so attributes can be added"""
+        if parent and parent.get('trace_id'):
+            trace_id, parent_id = parent['trace_id'], parent.get('span_id')
+        elif _current_span.get() is not None:
+            trace_id, parent_id = _current_span.get()
+        else:
+            trace_id, parent_id = new_trace_id(), None
+
+        span = {
+            'trace_id': trace_id,
+            'span_id': new_span_id(),
+            'parent_id': parent_id,
+            'name': name,
+            'agent': self.agent_name,
+            'start': time.time(),
+            'status': 'ok',
+            'attributes': attributes
+        }
+        token = _current_span.set((trace_id, span['span_id']))
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span['status'] = 'error'
+            span['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            _current_span.reset(token)
+            self._record(span)
+
+    def event(self, name: str, **attributes):
+        """Record a zero-length span (e.g. a fallback decision) under the current span"""
+        with self.span(name, **attributes):
+            pass
+
+    def _record(self, span: Dict[str, Any]):
+        self.spans.append(span)
+        self.recorded += 1
+        if self._writer is not None:
+            self._writer.info(json.dumps(span, default=str, ensure_ascii=False))
+
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """This agent's buffered spans for one trace, in start order"""
+        return sorted((span for span in self.spans if span['trace_id'] == trace_id), key=lambda span: span['start'])
+
+    def recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Summaries of the most recently active traces in the buffer"""
+        traces: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        for span in reversed(self.spans):
+            if span['trace_id'] not in traces:
+                if len(traces) >= limit:
+                    continue
+                traces[span['trace_id']] = []
+            traces[span['trace_id']].append(span)
+
+        summaries = []
+        for trace_id, spans in traces.items():
+            start = min(span['start'] for span in spans)
+            end = max(span['start'] + span['duration_ms'] / 1000 for span in spans)
+            # The local root's parent, if any, lives in the calling agent
+            span_ids = {span['span_id'] for span in spans}
+            root = min((span for span in spans if span['parent_id'] not in span_ids), key=lambda span: span['start'])
+            summaries.append({
+                'trace_id': trace_id,
+                'root': root['name'],
+                'start': start,
+                'duration_ms': round((end - start) * 1000, 2),
+                'spans': len(spans),
+                'errors': sum(1 for span in spans if span['status'] == 'error')
+            })
+        return summaries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tracing configuration and buffer usage"""
+        return {
+            'buffered_spans': len(self.spans),
+            'buffer_size': self.spans.maxlen,
+            'recorded': self.recorded,
+            'trace_file': self.trace_file or None
+        }
@@ -0,0 +1,104 @@
+"""
+Bounded worker pool for blocking provider SDK calls
+Runs synchronous clients (e.g. Hugging Face InferenceClient) in a small
+thread pool so they never block the agent's event loop, with a cap on
+concurrent calls and on how many callers may queue behind them
+"""
+
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+class WorkerPoolFull(Exception):
+    """Raised when the pool's wait queue is at capacity"""
+    pass
+
+class BoundedWorkerPool:
+    """Thread pool with a concurrency cap and a bounded wait queue
+
+    At most max_workers calls run at once. Up to max_queue further
+    callers wait for a slot; beyond that run() fails fast with
+    WorkerPoolFull so the caller can shed load instead of piling up.
+    A cancelled caller's call keeps its slot until its thread finishes.
+    """
+
+    def __init__(self, name: str, max_workers: int = 2, max_queue: int = 8):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.running = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.abandoned = 0
+        self.total_wait_seconds = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Create the semaphore on first use, inside the running loop"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on a worker thread once a slot is free"""
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise WorkerPoolFull(f"{self.name} worker pool saturated ({self.running} running, {self.queued} queued)")
+
+        started = time.monotonic()
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.total_wait_seconds += time.monotonic() - started
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self.running -= 1
+            semaphore.release()
+            raise
+
+        def finished(fut: asyncio.Future):
+            # The slot is held until the thread is done, even if the caller gave up
+            self.running -= 1
+            self.completed += 1
+            semaphore.release()
+            if not fut.cancelled():
+                fut.exception()  # retrieved so abandoned failures are not reported as unhandled
+
+        future.add_done_callback(finished)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.done():
+                self.abandoned += 1
+            raise
+
+    def shutdown(self):
+        """Stop accepting work; running calls finish in the background"""
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Concurrency and queue-depth statistics"""
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'running': self.running,
+            'queued': self.queued,
+            'peak_queued': self.peak_queued,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'abandoned': self.abandoned,
+            'total_wait_seconds': round(self.total_wait_seconds, 3)
+        }
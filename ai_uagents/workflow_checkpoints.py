@@ -0,0 +1,181 @@
+"""
+Workflow checkpoints for the AI Company orchestrator
+Every completed stage's output is saved to a local SQLite store keyed by
+workflow ID, so a workflow that failed part-way (or whose orchestrator
+was restarted) can be resumed from the stage that failed instead of
+re-running every earlier LLM stage
+"""
+
+import os
+import json
+import time
+import sqlite3
+import secrets
+import threading
+from typing import Dict, Any, Optional
+
+class CheckpointMismatch(Exception):
+    """Raised when a workflow ID's checkpoints belong to a different request"""
+
+    def __init__(self, workflow_id: str):
+        super().__init__(f"Workflow {workflow_id} was checkpointed for a different request; "
+                         f"resume it by ID or start a new workflow")
+
+class WorkflowAlreadyRunning(Exception):
+    """Raised when a workflow ID is started while a run of it is still in progress"""
+
+    def __init__(self, workflow_id: str):
+        super().__init__(f"Workflow {workflow_id} is already running; wait for it to finish before resuming it")
+
+def new_workflow_id() -> str:
+    """16 hex characters identifying one workflow run and its checkpoints"""
+    return secrets.token_hex(8)
+
+class WorkflowCheckpointStore:
+    """SQLite store of workflow requests and their completed stage outputs
+
+    Uses WAL journaling like the shared response store. Errors are
+    swallowed: a checkpoint that cannot be written only costs a rerun of
+    that stage on resume, never the workflow itself. Calls block on
+    SQLite, so async callers run them with asyncio.to_thread.
+    """
+
+    def __init__(self, db_path: str, retention_seconds: float = 7 * 24 * 3600, busy_timeout_ms: int = 1000):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self.saved = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS workflows (
+                workflow_id TEXT PRIMARY KEY,
+                user_input TEXT NOT NULL,
+                idea_count INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                failed_stage TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS workflow_stages (
+                workflow_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                output TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (workflow_id, stage)
+            )"""
+        )
+
+    def start(self, workflow_id: str, user_input: str, idea_count: int):
+        """Record a new workflow (or mark a resumed one running again); prunes expired workflows"""
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    """INSERT INTO workflows (workflow_id, user_input, idea_count, status, created_at, updated_at)
+                       VALUES (?, ?, ?, 'running', ?, ?)
+                       ON CONFLICT(workflow_id) DO UPDATE SET
+                           status = 'running', failed_stage = NULL, error = NULL, updated_at = excluded.updated_at""",
+                    (workflow_id, user_input, idea_count, now, now)
+                )
+                cutoff = now - self.retention_seconds
+                self._conn.execute(
+                    "DELETE FROM workflow_stages WHERE workflow_id IN (SELECT workflow_id FROM workflows WHERE updated_at < ?)",
+                    (cutoff,)
+                )
+                self._conn.execute("DELETE FROM workflows WHERE updated_at < ?", (cutoff,))
+        except sqlite3.Error:
+            pass
+
+    def save_stage(self, workflow_id: str, stage: str, output: Any):
+        """Checkpoint one completed stage's output"""
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO workflow_stages (workflow_id, stage, output, completed_at) VALUES (?, ?, ?, ?)",
+                    (workflow_id, stage, json.dumps(output), now)
+                )
+                self._conn.execute("UPDATE workflows SET updated_at = ? WHERE workflow_id = ?", (now, workflow_id))
+            self.saved += 1
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
+
+    def finish(self, workflow_id: str, status: str, failed_stage: Optional[str] = None, error: Optional[str] = None):
+        """Record how a run ended"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE workflows SET status = ?, failed_stage = ?, error = ?, updated_at = ? WHERE workflow_id = ?",
+                    (status, failed_stage, error, time.time(), workflow_id)
+                )
+        except sqlite3.Error:
+            pass
+
+    def load(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """A workflow's request, last status and checkpointed stage outputs, or None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    """SELECT user_input, idea_count, status, failed_stage, error, created_at, updated_at
+                       FROM workflows WHERE workflow_id = ?""",
+                    (workflow_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                stages = self._conn.execute(
+                    "SELECT stage, output FROM workflow_stages WHERE workflow_id = ? ORDER BY completed_at",
+                    (workflow_id,)
+                ).fetchall()
+        except sqlite3.Error:
+            return None
+
+        restored = {}
+        for stage, output in stages:
+            try:
+                restored[stage] = json.loads(output)
+            except json.JSONDecodeError:
+                continue
+        return {
+            'workflow_id': workflow_id,
+            'user_input': row[0],
+            'idea_count': row[1],
+            'status': row[2],
+            'failed_stage': row[3],
+            'error': row[4],
+            'created_at': row[5],
+            'updated_at': row[6],
+            'stages': restored
+        }
+
+    def count(self) -> int:
+        """Number of workflows currently stored"""
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM workflows").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store location and checkpoint counters"""
+        return {
+            'path': self.db_path,
+            'workflows': self.count(),
+            'retention_seconds': self.retention_seconds,
+            'stages_saved': self.saved
+        }
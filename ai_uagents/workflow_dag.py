@@ -0,0 +1,110 @@
+"""
+Dependency-graph execution for AI Company workflows
+Stages declare which earlier outputs they need; every stage starts as soon
+as those are available, so independent stages run concurrently
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+# A stage receives the outputs produced so far (plus the initial inputs)
+StageRunner = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Progress callback: (stage, status, value) where status is one of the STAGE_*
+# constants and value is the stage's output, its exception, or None when started
+StageListener = Callable[[str, str, Any], None]
+
+STAGE_STARTED = 'running'
+STAGE_COMPLETED = 'completed'
+STAGE_FAILED = 'failed'
+
+class Stage:
+    """One named unit of work and the outputs it depends on"""
+
+    def __init__(self, name: str, run: StageRunner, depends_on: Iterable[str] = ()):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+
+class StageFailed(Exception):
+    """A stage raised; carries the outputs that did complete"""
+
+    def __init__(self, stage: str, error: BaseException, results: Dict[str, Any]):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+        self.results = results
+
+class WorkflowDAG:
+    """Runs stages in dependency order with maximum concurrency
+
+    When a stage fails no new stages are started; stages already running
+    are allowed to finish so their outputs are not lost, then StageFailed
+    is raised for the first failure.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate stage names in workflow")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Stage names with every stage after the stages it depends on; rejects cycles"""
+        order, visiting, done = [], set(), set()
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if name in done or name not in self.stages:
+                return
+            if name in visiting:
+                raise ValueError(f"Workflow has a dependency cycle: {' -> '.join(path + (name,))}")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency, path + (name,))
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    async def run(self, inputs: Optional[Dict[str, Any]] = None,
+                  on_stage: Optional[StageListener] = None) -> Dict[str, Any]:
+        """Execute all stages; returns inputs plus every stage's output keyed by stage name"""
+        notify = on_stage or (lambda stage, status, value: None)
+        results = dict(inputs or {})
+        for name in self.order:
+            missing = [d for d in self.stages[name].depends_on if d not in self.stages and d not in results]
+            if missing:
+                raise ValueError(f"Stage '{name}' depends on unknown inputs: {', '.join(missing)}")
+
+        pending = [name for name in self.order if name not in results]
+        running: Dict[asyncio.Task, str] = {}
+        failure: Optional[StageFailed] = None
+        try:
+            while pending or running:
+                if failure is None:
+                    for name in [n for n in pending if all(d in results for d in self.stages[n].depends_on)]:
+                        pending.remove(name)
+                        running[asyncio.ensure_future(self.stages[name].run(results))] = name
+                        notify(name, STAGE_STARTED, None)
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        failure = failure or StageFailed(name, task.exception(), results)
+                        notify(name, STAGE_FAILED, task.exception())
+                    else:
+                        results[name] = task.result()
+                        notify(name, STAGE_COMPLETED, task.result())
+        finally:
+            for task in running:
+                task.cancel()
+
+        if failure is not None:
+            raise failure
+        return results
@@ -0,0 +1,200 @@
+"""
+Background workflow jobs for the AI Company orchestrator
+A submitted workflow gets a job ID straight away and runs on a small pool
+of background workers; callers poll its stage-by-stage progress and fetch
+the result when it finishes instead of holding a request open throughout
+"""
+
+import time
+import asyncio
+import secrets
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Iterable, List, Optional
+from workflow_dag import STAGE_STARTED, STAGE_COMPLETED, STAGE_FAILED
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+STAGE_PENDING = 'pending'
+
+class JobQueueFull(Exception):
+    """Raised when every worker is busy and the wait queue is at capacity"""
+    pass
+
+class JobAlreadyActive(Exception):
+    """Raised when resubmitting a job ID that is still queued or running"""
+    pass
+
+class WorkflowJob:
+    """One submitted workflow: its request, per-stage progress and outcome"""
+
+    def __init__(self, request: Dict[str, Any], stages: Iterable[str], job_id: Optional[str] = None):
+        self.id = job_id or secrets.token_hex(8)
+        self.request = request
+        self.status = JOB_QUEUED
+        self.stages: Dict[str, Dict[str, Any]] = {name: {'status': STAGE_PENDING} for name in stages}
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.trace_id: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+    def record_stage(self, stage: str, status: str, value: Any = None):
+        """WorkflowDAG stage listener: track when each stage starts and ends"""
+        entry = self.stages.setdefault(stage, {'status': STAGE_PENDING})
+        entry['status'] = status
+        if status == STAGE_STARTED:
+            entry['started_at'] = time.time()
+        elif status in (STAGE_COMPLETED, STAGE_FAILED):
+            entry['finished_at'] = time.time()
+            if 'started_at' in entry:
+                entry['duration_seconds'] = round(entry['finished_at'] - entry['started_at'], 3)
+            if status == STAGE_FAILED:
+                entry['error'] = str(value)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Progress report (without the result payload)"""
+        completed = sum(1 for entry in self.stages.values() if entry['status'] == STAGE_COMPLETED)
+        now = self.finished_at or time.time()
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'stages': self.stages,
+            'stages_completed': completed,
+            'stages_total': len(self.stages),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'queued_seconds': round((self.started_at or now) - self.created_at, 3),
+            'elapsed_seconds': round(now - self.started_at, 3) if self.started_at else None,
+            'error': self.error,
+            'trace_id': self.trace_id
+        }
+
+class WorkflowJobQueue:
+    """Bounded pool of background workers running submitted workflow jobs
+
+    At most max_workers jobs run at once and up to max_queue more wait
+    for a worker; beyond that submit() fails fast with JobQueueFull.
+    Finished jobs stay queryable for retention_seconds, and only the
+    newest max_finished of them are kept.
+    """
+
+    def __init__(self, name: str, run_job: Callable[[WorkflowJob], Awaitable[Any]], max_workers: int = 2,
+                 max_queue: int = 32, retention_seconds: float = 3600, max_finished: int = 500):
+        self.name = name
+        self.run_job = run_job
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self.jobs: "OrderedDict[str, WorkflowJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.queued = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def _ensure_workers(self):
+        """Create the queue and worker tasks on first use, inside the running loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.max_workers)]
+
+    def submit(self, request: Dict[str, Any], stages: Iterable[str], job_id: Optional[str] = None) -> WorkflowJob:
+        """Queue a workflow; returns its job immediately. Reusing a finished
+        job's ID (to resume it) replaces that job"""
+        self._ensure_workers()
+        self.prune()
+        existing = self.jobs.get(job_id) if job_id else None
+        if existing is not None and not existing.finished:
+            raise JobAlreadyActive(f"Job {job_id} is already {existing.status}")
+        # Jobs not yet picked up by an idle worker count against the wait queue
+        if self.queued >= self.max_queue + (self.max_workers - self.running):
+            self.rejected += 1
+            raise JobQueueFull(f"{self.name} job queue full ({self.running} running, {self.queued} queued)")
+
+        job = WorkflowJob(request, stages, job_id)
+        self._queue.put_nowait(job)
+        self.jobs.pop(job.id, None)
+        self.jobs[job.id] = job
+        self.queued += 1
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[WorkflowJob]:
+        return self.jobs.get(job_id)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self.queued -= 1
+            self.running += 1
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = await self.run_job(job)
+                job.status = JOB_COMPLETED
+                self.completed += 1
+            except asyncio.CancelledError:
+                job.status, job.error = JOB_CANCELLED, 'Cancelled by orchestrator shutdown'
+                self.cancelled += 1
+                raise
+            except Exception as e:
+                job.status, job.error = JOB_FAILED, str(e)
+                self.failed += 1
+            finally:
+                job.finished_at = time.time()
+                self.running -= 1
+                self._queue.task_done()
+
+    def prune(self):
+        """Forget finished jobs past their retention time or beyond max_finished"""
+        cutoff = time.time() - self.retention_seconds
+        finished = [job for job in self.jobs.values() if job.finished]
+        excess = len(finished) - self.max_finished
+        for job in finished:
+            if excess > 0 or job.finished_at < cutoff:
+                del self.jobs[job.id]
+                excess -= 1
+
+    async def stop(self):
+        """Cancel the workers (and any job they are running); jobs still queued are cancelled too"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for job in self.jobs.values():
+            if job.status == JOB_QUEUED:
+                job.status, job.error = JOB_CANCELLED, 'Cancelled by orchestrator shutdown'
+                job.finished_at = time.time()
+                self.cancelled += 1
+        self._workers = []
+        self._queue = None
+        self.queued = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker usage and job counters"""
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'running': self.running,
+            'queued': self.queued,
+            'tracked_jobs': len(self.jobs),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'rejected': self.rejected
+        }
@@ -3,6 +3,94 @@ import './App.css';
 import AgentFlow from './AgentFlow';
 import RevenueDashboard from './RevenueDashboard';
 
+// Longest a job is polled for: the orchestrator's default workflow SLO
+// (WORKFLOW_SLO_SECONDS=300) plus a margin for queueing
+const WORKFLOW_JOB_TIMEOUT_MS = (300 + 60) * 1000;
+
+// Submit a workflow as a background job and poll until it finishes, so no
+// request stays open for the whole multi-minute run. Resolves to the same
+// { success, data, message, error } shape as the old synchronous endpoint.
+const runWorkflowJob = async (apiUrl, body, pollIntervalMs = 3000, timeoutMs = WORKFLOW_JOB_TIMEOUT_MS) => {
+  const submitResponse = await fetch(`${apiUrl}/api/agents/workflow-jobs`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(body),
+  });
+  const job = await submitResponse.json();
+  if (!job.success) {
+    return job;
+  }
+
+  const giveUpAt = Date.now() + timeoutMs;
+  while (Date.now() < giveUpAt) {
+    await new Promise(resolve => setTimeout(resolve, pollIntervalMs));
+    const resultResponse = await fetch(`${apiUrl}/api/agents/workflow-jobs/${job.job_id}/result`);
+    if (resultResponse.status !== 202) {
+      return resultResponse.json();
+    }
+  }
+  return {
+    success: false,
+    message: 'Workflow execution failed',
+    error: `Workflow job ${job.job_id} did not finish within ${Math.round(timeoutMs / 1000)}s`,
+    workflow_id: job.job_id
+  };
+};
+
+// Run a workflow over the streaming endpoint, calling onEvent(event, payload)
+// for each 'workflow' and 'stage' event as it arrives. Resolves to the final
+// { success, data, message, error } result.
+const streamWorkflow = async (apiUrl, body, onEvent) => {
+  const response = await fetch(`${apiUrl}/api/agents/process-complete-workflow/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(body),
+  });
+  if (!response.ok) {
+    return response.json();
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result = { success: false, message: 'Workflow stream ended without a result' };
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const messages = buffer.split('\n\n');
+    buffer = messages.pop();
+    for (const message of messages) {
+      const event = message.match(/^event: (.*)$/m)?.[1];
+      const data = message.match(/^data: (.*)$/m)?.[1];
+      if (!event || data === undefined) continue;
+      const payload = JSON.parse(data);
+      if (event === 'result') {
+        result = payload;
+      } else if (event === 'error') {
+        result = { success: false, message: 'Workflow execution failed', error: payload.error };
+      } else {
+        onEvent(event, payload);
+      }
+    }
+  }
+  return result;
+};
+
+// Agent shown as working while each workflow stage runs
+const STAGE_AGENTS = {
+  research: 'Research Agent',
+  product: 'Product Agent',
+  marketing: 'CMO Agent',
+  technical: 'CTO Agent',
+  finance: 'Finance Agent',
+  bolt_prompt: 'Head of Engineering',
+};
+
 function App() {
   // Simple frontend state - no database IDs needed
   const [currentIdea, setCurrentIdea] = useState(null);
@@ -474,17 +562,10 @@ function App() {
     try {
       // Use the NEW Python uAgent system via orchestrator
       const apiUrl = 'http://localhost:5001';
-      const response = await fetch(`${apiUrl}/api/agents/process-complete-workflow`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ 
-          user_input: "User building AI agents for company workflow",
-          idea_count: 1 
-        }),
+      const data = await runWorkflowJob(apiUrl, {
+        user_input: "User building AI agents for company workflow",
+        idea_count: 1
       });
-      const data = await response.json();
       
       if (data.success && data.data) {
         const workflowData = data.data;
@@ -538,6 +619,37 @@ function App() {
     }
   };
 
+  // Show one completed workflow stage's output
+  const showWorkflowStage = (stage, stageData) => {
+    switch (stage) {
+      case 'research':
+        setResearch(stageData);
+        setAgentActivity(prev => [...prev, { agent: 'Research Agent', action: 'Market research completed', time: new Date().toLocaleTimeString() }]);
+        break;
+      case 'product':
+        setProduct(stageData);
+        setAgentActivity(prev => [...prev, { agent: 'Product Agent', action: `Product concept: ${stageData.product_name}`, time: new Date().toLocaleTimeString() }]);
+        break;
+      case 'marketing':
+        setMarketingStrategy(stageData);
+        setAgentActivity(prev => [...prev, { agent: 'CMO Agent', action: 'Marketing strategy completed', time: new Date().toLocaleTimeString() }]);
+        break;
+      case 'technical':
+        setTechnicalStrategy(stageData);
+        setAgentActivity(prev => [...prev, { agent: 'CTO Agent', action: 'Technical strategy completed', time: new Date().toLocaleTimeString() }]);
+        break;
+      case 'bolt_prompt':
+        setBoltPrompt(stageData);
+        setAgentActivity(prev => [...prev, { agent: 'Head of Engineering', action: 'Bolt prompt created', time: new Date().toLocaleTimeString() }]);
+        break;
+      case 'finance':
+        setAgentActivity(prev => [...prev, { agent: 'Finance Agent', action: `Revenue analysis: $${stageData.revenue_projection?.most_likely?.toLocaleString()}`, time: new Date().toLocaleTimeString() }]);
+        break;
+      default:
+        break;
+    }
+  };
+
   const runCompleteWorkflow = async () => {
     setLoading(true);
     setCurrentAgent('Complete Workflow');
@@ -555,60 +667,26 @@ function App() {
     
     try {
       const apiUrl = 'http://localhost:5001';
-      const response = await fetch(`${apiUrl}/api/agents/process-complete-workflow`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ 
-          user_input: "User building AI agents for company workflow",
-          idea_count: 1 
-        }),
+      // Render each stage's output as soon as the orchestrator streams it
+      const data = await streamWorkflow(apiUrl, {
+        user_input: "User building AI agents for company workflow",
+        idea_count: 1
+      }, (event, payload) => {
+        if (event === 'workflow' && payload.idea) {
+          setCurrentIdea(payload.idea);
+          setAgentActivity(prev => [...prev, { agent: 'CEO Agent', action: `Generated idea: ${payload.idea.title}`, time: new Date().toLocaleTimeString() }]);
+        } else if (event === 'stage' && payload.status === 'running') {
+          setCurrentAgent(STAGE_AGENTS[payload.stage] || 'Complete Workflow');
+        } else if (event === 'stage' && payload.status === 'completed') {
+          showWorkflowStage(payload.stage, payload.data);
+        }
       });
-      const data = await response.json();
       
       if (data.success && data.data) {
-        const workflowData = data.data;
-        
-        // Set all the workflow data
-        if (workflowData.idea) {
-          setCurrentIdea(workflowData.idea);
-          setAgentActivity(prev => [...prev, { agent: 'CEO Agent', action: `Generated idea: ${workflowData.idea.title}`, time: new Date().toLocaleTimeString() }]);
-        }
-        
-        if (workflowData.research) {
-          setResearch(workflowData.research);
-          setAgentActivity(prev => [...prev, { agent: 'Research Agent', action: 'Market research completed', time: new Date().toLocaleTimeString() }]);
-        }
-        
-        if (workflowData.product) {
-          setProduct(workflowData.product);
-          setAgentActivity(prev => [...prev, { agent: 'Product Agent', action: `Product concept: ${workflowData.product.product_name}`, time: new Date().toLocaleTimeString() }]);
-        }
-        
-        if (workflowData.marketing) {
-          setMarketingStrategy(workflowData.marketing);
-          setAgentActivity(prev => [...prev, { agent: 'CMO Agent', action: 'Marketing strategy completed', time: new Date().toLocaleTimeString() }]);
-        }
-        
-        if (workflowData.technical) {
-          setTechnicalStrategy(workflowData.technical);
-          setAgentActivity(prev => [...prev, { agent: 'CTO Agent', action: 'Technical strategy completed', time: new Date().toLocaleTimeString() }]);
-        }
-        
-        if (workflowData.bolt_prompt) {
-          setBoltPrompt(workflowData.bolt_prompt);
-          setAgentActivity(prev => [...prev, { agent: 'Head of Engineering', action: 'Bolt prompt created', time: new Date().toLocaleTimeString() }]);
-        }
-        
-        if (workflowData.finance) {
-          setAgentActivity(prev => [...prev, { agent: 'Finance Agent', action: `Revenue analysis: $${workflowData.finance.revenue_projection?.most_likely?.toLocaleString()}`, time: new Date().toLocaleTimeString() }]);
-        }
-        
         setAgentActivity(prev => [...prev, { agent: 'Complete Workflow', action: '🎉 Complete workflow executed successfully!', time: new Date().toLocaleTimeString() }]);
-        console.log('🎯 [FRONTEND] Complete workflow executed:', workflowData.workflow_summary);
+        console.log('🎯 [FRONTEND] Complete workflow executed:', data.data.workflow_summary);
       } else {
-        setAgentActivity(prev => [...prev, { agent: 'Complete Workflow', action: `Error: ${data.message || 'Workflow failed'}`, time: new Date().toLocaleTimeString() }]);
+        setAgentActivity(prev => [...prev, { agent: 'Complete Workflow', action: `Error: ${data.error || data.message || 'Workflow failed'}`, time: new Date().toLocaleTimeString() }]);
       }
     } catch (error) {
       console.error('Error running complete workflow:', error);
@@ -778,17 +856,10 @@ function App() {
       }]);
       
       // Use orchestrator for complete workflow instead of individual agent calls
-      const ctoResponse = await fetch(`${apiUrl}/api/agents/process-complete-workflow`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ 
-          user_input: ideaData.title || "AI-powered business solution",
-          idea_count: 1
-        }),
+      const ctoData = await runWorkflowJob(apiUrl, {
+        user_input: ideaData.title || "AI-powered business solution",
+        idea_count: 1
       });
-      const ctoData = await ctoResponse.json();
       
       if (ctoData.success && ctoData.data) {
         const workflowData = ctoData.data;
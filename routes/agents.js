@@ -242,6 +242,127 @@ router.post('/process-complete-workflow', async (req, res) => {
   }
 });
 
+// Orchestrator side HTTP server (streaming and background job endpoints)
+const ORCHESTRATOR_HTTP_URL = 'http://localhost:8108';
+
+// Streaming workflow endpoint - relays the orchestrator's Server-Sent Events so
+// the UI can render each stage's output as soon as it completes
+router.post('/process-complete-workflow/stream', async (req, res) => {
+  const { user_input, idea_count = 1, workflow_id } = req.body;
+  console.log('🎯 [ROUTE] Streaming workflow endpoint called for:', user_input);
+
+  if (!user_input) {
+    return res.status(400).json({ success: false, error: 'User input is required' });
+  }
+
+  try {
+    const upstream = await axios.post(`${ORCHESTRATOR_HTTP_URL}/process-business-idea/stream`, {
+      user_input,
+      idea_count,
+      workflow_id
+    }, {
+      responseType: 'stream',
+      validateStatus: () => true
+    });
+
+    // Refused before streaming (400 invalid request, 409 workflow ID in use or
+    // checkpointed for another request): pass the status and error through
+    if (upstream.status !== 200) {
+      let body = '';
+      for await (const chunk of upstream.data) {
+        body += chunk;
+      }
+      let error;
+      try {
+        error = JSON.parse(body).error;
+      } catch (parseError) {
+        error = body;
+      }
+      console.error(`❌ [ROUTE] Orchestrator refused workflow stream (${upstream.status}):`, error);
+      return res.status(upstream.status).json({
+        success: false,
+        error: error || `Orchestrator returned ${upstream.status}`,
+        message: 'Complete workflow failed'
+      });
+    }
+
+    res.set({
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'X-Accel-Buffering': 'no'
+    });
+    res.flushHeaders();
+    upstream.data.pipe(res);
+    // The orchestrator connection dropping mid-stream: finish with an SSE error event
+    upstream.data.on('error', (error) => {
+      console.error('❌ [ROUTE] Workflow stream interrupted:', error.message);
+      if (!res.writableEnded && !res.destroyed) {
+        res.write(`event: error\ndata: ${JSON.stringify({ error: error.message })}\n\n`);
+        res.end();
+      }
+    });
+    // Closing the upstream stream tells the orchestrator to stop the workflow
+    res.on('close', () => upstream.data.destroy());
+  } catch (error) {
+    console.error('❌ [ROUTE] Error in streaming workflow:', error.message);
+    res.status(500).json({
+      success: false,
+      error: error.message,
+      message: 'Complete workflow failed'
+    });
+  }
+});
+
+// Workflow job endpoints - the orchestrator runs the workflow in the background,
+// so these calls return quickly
+const ORCHESTRATOR_JOBS_URL = `${ORCHESTRATOR_HTTP_URL}/workflow-jobs`;
+
+// Pass the orchestrator's status code (202 while running, 404, 503 when busy) through
+const proxyWorkflowJob = async (res, request) => {
+  try {
+    const response = await request({ timeout: 10000, validateStatus: () => true });
+    if (response.headers['retry-after']) {
+      res.set('Retry-After', response.headers['retry-after']);
+    }
+    res.status(response.status).json(response.data);
+  } catch (error) {
+    console.error('❌ [ROUTE] Error reaching orchestrator job API:', error.message);
+    res.status(502).json({
+      success: false,
+      error: error.message,
+      message: 'Workflow orchestrator unavailable'
+    });
+  }
+};
+
+// Submit a complete workflow; returns a job_id to poll
+router.post('/workflow-jobs', async (req, res) => {
+  const { user_input, idea_count = 1 } = req.body;
+  console.log('🎯 [ROUTE] Workflow job submitted for:', user_input);
+
+  if (!user_input) {
+    return res.status(400).json({ success: false, error: 'User input is required' });
+  }
+
+  await proxyWorkflowJob(res, options => axios.post(ORCHESTRATOR_JOBS_URL, { user_input, idea_count }, options));
+});
+
+// Job status with stage-by-stage progress
+router.get('/workflow-jobs/:jobId', async (req, res) => {
+  await proxyWorkflowJob(res, options => axios.get(`${ORCHESTRATOR_JOBS_URL}/${encodeURIComponent(req.params.jobId)}`, options));
+});
+
+// Job result (same shape as /process-complete-workflow once finished, 202 until then)
+router.get('/workflow-jobs/:jobId/result', async (req, res) => {
+  await proxyWorkflowJob(res, options => axios.get(`${ORCHESTRATOR_JOBS_URL}/${encodeURIComponent(req.params.jobId)}/result`, options));
+});
+
+// Resume a failed job: stages it already completed are restored from checkpoints
+router.post('/workflow-jobs/:jobId/resume', async (req, res) => {
+  console.log('🔁 [ROUTE] Resuming workflow job:', req.params.jobId);
+  await proxyWorkflowJob(res, options => axios.post(`${ORCHESTRATOR_JOBS_URL}/${encodeURIComponent(req.params.jobId)}/resume`, {}, options));
+});
+
 // ===== UTILITY ROUTES =====
 
 // Test ASI:One API directly